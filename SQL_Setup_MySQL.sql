@@ -10,7 +10,9 @@ CREATE TABLE IF NOT EXISTS Recruiter(
    ContactPerson  VARCHAR(255) NOT NULL PRIMARY KEY,
    Contact        VARCHAR(100) NOT NULL,
    Company        VARCHAR(255) NOT NULL,
-   CompanyProfile TEXT
+   CompanyProfile TEXT,
+   INDEX idx_recruiter_company (Company),
+   FULLTEXT INDEX ft_recruiter_profile (CompanyProfile)
 );
 
 -- Table: Job
@@ -24,6 +26,17 @@ CREATE TABLE IF NOT EXISTS Job (
    Title VARCHAR(255),
    ContactPerson VARCHAR(255),
    SalaryRange VARCHAR(255),
+   SalaryMin INT UNSIGNED NULL,            -- Parsed from SalaryRange
+   SalaryMax INT UNSIGNED NULL,            -- Parsed from SalaryRange
+   MinExperienceYears SMALLINT UNSIGNED NULL, -- Parsed from Experience
+   PostedDate DATE NULL,                   -- Parsed from Date
+   INDEX idx_job_location (Location),
+   INDEX idx_job_salarymax (SalaryMax),
+   INDEX idx_job_minexperience (MinExperienceYears),
+   INDEX idx_job_posted (PostedDate),
+   INDEX idx_job_title (Title),
+   FULLTEXT INDEX ft_job_title_skills (Title, Skills),
+   FULLTEXT INDEX ft_job_lookup (Title, Location, ContactPerson) WITH PARSER ngram,
    FOREIGN KEY (ContactPerson) REFERENCES Recruiter(ContactPerson) ON DELETE CASCADE
 );
 
@@ -36,7 +49,10 @@ CREATE TABLE IF NOT EXISTS Candidate (
    YearsCoded INT,
    Country VARCHAR(255),
    PreviousSalary INT,
-   Skills TEXT
+   Skills TEXT,
+   INDEX idx_candidate_country (Country),
+   INDEX idx_candidate_edlevel_yearscoded (EdLevel, YearsCoded),
+   FULLTEXT INDEX ft_candidate_skills (Skills)
 );
 
 -- Table: Users
@@ -58,9 +74,137 @@ CREATE TABLE IF NOT EXISTS Job_Audit (
    OldSalaryRange VARCHAR(255),
    NewSalaryRange VARCHAR(255),
    ModifiedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   INDEX idx_job_audit_modified (ModifiedAt, AuditID),
+   INDEX idx_job_audit_job_modified (JobID, ModifiedAt, AuditID),
    FOREIGN KEY (JobID) REFERENCES Job(JobId) ON DELETE CASCADE
 );
 
+-- Table: Skill
+-- One row per normalized (case-folded) skill token
+CREATE TABLE IF NOT EXISTS Skill (
+   SkillId INT PRIMARY KEY AUTO_INCREMENT,
+   Name VARCHAR(255) COLLATE utf8mb4_bin NOT NULL UNIQUE
+);
+
+-- Table: CandidateSkill
+-- Links candidates to the skills parsed from Candidate.Skills
+CREATE TABLE IF NOT EXISTS CandidateSkill (
+   SkillId INT NOT NULL,
+   CandidateId INT NOT NULL,
+   PRIMARY KEY (SkillId, CandidateId),
+   INDEX idx_candidateskill_candidate (CandidateId),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE,
+   FOREIGN KEY (CandidateId) REFERENCES Candidate(CandidateId) ON DELETE CASCADE
+);
+
+-- Table: JobSkill
+-- Links jobs to the skills parsed from Job.Skills
+CREATE TABLE IF NOT EXISTS JobSkill (
+   SkillId INT NOT NULL,
+   JobId INT NOT NULL,
+   PRIMARY KEY (SkillId, JobId),
+   INDEX idx_jobskill_job (JobId),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE,
+   FOREIGN KEY (JobId) REFERENCES Job(JobId) ON DELETE CASCADE
+);
+
+-- Table: SkillDemand
+-- Number of jobs requiring each skill
+CREATE TABLE IF NOT EXISTS SkillDemand (
+   SkillId INT NOT NULL PRIMARY KEY,
+   JobCount INT NOT NULL DEFAULT 0,
+   INDEX idx_skilldemand_count (JobCount),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE
+);
+
+-- Table: SkillLocationDemand
+-- Number of jobs requiring each skill, per job location ('' when unknown)
+CREATE TABLE IF NOT EXISTS SkillLocationDemand (
+   Location VARCHAR(255) NOT NULL,
+   SkillId INT NOT NULL,
+   JobCount INT NOT NULL DEFAULT 0,
+   PRIMARY KEY (Location, SkillId),
+   INDEX idx_skilllocationdemand_count (Location, JobCount),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE
+);
+
+-- Table: SkillSalary
+-- Jobs with a parsed salary range and their salary totals per skill and
+-- SalaryMax bucket (SalaryMax DIV 5000), for the per-skill salary benchmark
+CREATE TABLE IF NOT EXISTS SkillSalary (
+   SkillId INT NOT NULL,
+   Bucket INT NOT NULL,
+   JobCount INT NOT NULL DEFAULT 0,
+   SalaryMinSum BIGINT NOT NULL DEFAULT 0,
+   SalaryMaxSum BIGINT NOT NULL DEFAULT 0,
+   PRIMARY KEY (SkillId, Bucket),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE
+);
+
+-- Table: RecruiterStats
+-- Jobs posted and salary totals per recruiter per day, week and month of
+-- PostedDate; one 'total' row (PeriodStart 1000-01-01) counts every job
+CREATE TABLE IF NOT EXISTS RecruiterStats (
+   ContactPerson VARCHAR(255) NOT NULL,
+   PeriodType ENUM('day', 'week', 'month', 'total') NOT NULL,
+   PeriodStart DATE NOT NULL,
+   JobCount INT NOT NULL DEFAULT 0,
+   SalaryCount INT NOT NULL DEFAULT 0,     -- Jobs with a parsed salary range
+   SalaryMinSum BIGINT NOT NULL DEFAULT 0,
+   SalaryMaxSum BIGINT NOT NULL DEFAULT 0,
+   PRIMARY KEY (ContactPerson, PeriodType, PeriodStart),
+   INDEX idx_recruiterstats_period (PeriodType, PeriodStart),
+   FOREIGN KEY (ContactPerson) REFERENCES Recruiter(ContactPerson) ON DELETE CASCADE
+);
+
+-- Table: ImportJob
+-- Progress of bulk CSV imports, keyed by the file's checksum
+CREATE TABLE IF NOT EXISTS ImportJob (
+   ImportId INT PRIMARY KEY AUTO_INCREMENT,
+   Entity VARCHAR(20) NOT NULL,
+   SourceName VARCHAR(255) NOT NULL,
+   SourceChecksum CHAR(64) NOT NULL,
+   Status ENUM('running', 'completed', 'failed') NOT NULL DEFAULT 'running',
+   RowsRead INT NOT NULL DEFAULT 0,
+   RowsInserted INT NOT NULL DEFAULT 0,
+   RowsRejected INT NOT NULL DEFAULT 0,
+   StartedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+   INDEX idx_importjob_checksum (Entity, SourceChecksum)
+);
+
+-- Table: CandidateDuplicate
+-- Candidate pairs proposed as near-duplicates (dedup.py), DuplicateOf the
+-- older one, and their review. No foreign keys: merged pairs outlive the
+-- candidate merged away, as a record of the merge.
+CREATE TABLE IF NOT EXISTS CandidateDuplicate (
+   CandidateId INT NOT NULL,
+   DuplicateOf INT NOT NULL,
+   Score DECIMAL(4,3) NOT NULL,
+   Status ENUM('pending', 'merged', 'dismissed') NOT NULL DEFAULT 'pending',
+   DetectedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   ReviewedAt TIMESTAMP NULL,
+   PRIMARY KEY (CandidateId, DuplicateOf),
+   INDEX idx_candidateduplicate_status_score (Status, Score)
+);
+
+-- Table: SchemaVersion
+-- Migrations (migrations/, see migrate.py) applied to this database. This
+-- script already includes migrations 001-011, so it records them without a
+-- checksum; python manage.py migrate applies the later ones.
+CREATE TABLE IF NOT EXISTS SchemaVersion (
+   Version INT PRIMARY KEY,
+   Name VARCHAR(255) NOT NULL,
+   Checksum CHAR(64) NOT NULL DEFAULT '',
+   AppliedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   DurationMs INT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO SchemaVersion (Version, Name) VALUES
+   (1, 'skill_index'), (2, 'skill_demand'), (3, 'job_numeric_fields'), (4, 'browse_indexes'),
+   (5, 'import_jobs'), (6, 'audit_indexes'), (7, 'fulltext_indexes'), (8, 'recruiter_stats'),
+   (9, 'skill_salary'), (10, 'job_lookup_indexes'), (11, 'candidate_duplicates');
+
 -- Trigger: Job Salary Update Audit
 -- Automatically logs changes to job salary ranges
 DELIMITER $$
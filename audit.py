@@ -0,0 +1,214 @@
+"""
+Audit Log
+Keyset-paginated reads of Job_Audit (newest first), an incremental
+"entries since AuditID N" read for refreshing a page already shown, and
+retention: old entries are moved into gzip-compressed monthly CSV archive
+files that can still be read back with the same filters.
+"""
+
+import csv
+import gzip
+import os
+import re
+from datetime import datetime
+
+import db
+
+
+AUDIT_COLUMNS = ['AuditID', 'JobID', 'ActionType', 'OldSalaryRange', 'NewSalaryRange', 'ModifiedAt']
+
+DEFAULT_AUDIT_CONFIG = {
+    'archive_dir': 'audit_archive',  # Where monthly archive files are written
+    'retention_days': 365,           # Entries older than this are archived
+}
+AUDIT_CONFIG = db.get_config('AUDIT_CONFIG', DEFAULT_AUDIT_CONFIG)
+
+ARCHIVE_NAME = re.compile(r"^job_audit_(\d{4}-\d{2})\.csv\.gz$")
+
+# Maximum rows returned by one incremental refresh
+MAX_NEW_ENTRIES = 500
+
+
+def _where_clause(filters):
+    """Build WHERE conditions for the filters.
+
+    Filters are 'job_id' and a half-open ModifiedAt range of datetimes,
+    'start' (inclusive) and 'end' (exclusive).
+    """
+    filters = filters or {}
+    conditions = []
+    params = []
+    if filters.get('job_id'):
+        conditions.append("JobID = %s")
+        params.append(filters['job_id'])
+    if filters.get('start'):
+        conditions.append("ModifiedAt >= %s")
+        params.append(filters['start'])
+    if filters.get('end'):
+        conditions.append("ModifiedAt < %s")
+        params.append(filters['end'])
+    return conditions, params
+
+
+def fetch_page(cursor, filters=None, after=None, page_size=50):
+    """Fetch one page of audit entries, newest first, after the keyset cursor `after`.
+
+    Returns (rows, next_after); a cursor is the (ModifiedAt, AuditID) of the
+    last row shown, so every page is a range read on the
+    (ModifiedAt, AuditID) or (JobID, ModifiedAt, AuditID) index. Expects a
+    DictCursor.
+    """
+    conditions, params = _where_clause(filters)
+    if after is not None:
+        modified_at, audit_id = after
+        conditions.append("(ModifiedAt < %s OR (ModifiedAt = %s AND AuditID < %s))")
+        params.extend([modified_at, modified_at, audit_id])
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    cursor.execute(f"""
+        SELECT {', '.join(AUDIT_COLUMNS)} FROM Job_Audit {where}
+        ORDER BY ModifiedAt DESC, AuditID DESC LIMIT %s
+    """, (*params, page_size))
+    rows = cursor.fetchall()
+    next_after = None
+    if len(rows) == page_size:
+        next_after = (rows[-1]['ModifiedAt'], rows[-1]['AuditID'])
+    return rows, next_after
+
+
+def fetch_since(cursor, last_seen, filters=None, limit=MAX_NEW_ENTRIES):
+    """Return the first `limit` entries with AuditID greater than `last_seen`, oldest first.
+
+    AuditID only grows, so this is a primary key range read however large
+    the table is. Reading oldest first lets the caller move `last_seen` to
+    the last row returned and read the rest with the next call, instead of
+    skipping entries when more than `limit` arrived. Expects a DictCursor.
+    """
+    conditions, params = _where_clause(filters)
+    conditions.append("AuditID > %s")
+    params.append(last_seen)
+    cursor.execute(f"""
+        SELECT {', '.join(AUDIT_COLUMNS)} FROM Job_Audit
+        WHERE {' AND '.join(conditions)}
+        ORDER BY AuditID LIMIT %s
+    """, (*params, limit))
+    return cursor.fetchall()
+
+
+def latest_audit_id(cursor):
+    """Return the highest AuditID, or 0 when the table is empty. Expects a DictCursor."""
+    cursor.execute("SELECT COALESCE(MAX(AuditID), 0) AS LastAuditID FROM Job_Audit")
+    return cursor.fetchone()['LastAuditID']
+
+
+def export_query(filters=None):
+    """Return (sql, params) reading every entry matching the filters, for streaming export."""
+    conditions, params = _where_clause(filters)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return (f"SELECT {', '.join(AUDIT_COLUMNS)} FROM Job_Audit {where} "
+            f"ORDER BY ModifiedAt DESC, AuditID DESC"), params
+
+
+def archive_path(archive_dir, month):
+    return os.path.join(archive_dir, f"job_audit_{month}.csv.gz")
+
+
+def list_archives(archive_dir=None):
+    """Return the archived months ('YYYY-MM'), newest first."""
+    archive_dir = archive_dir or AUDIT_CONFIG['archive_dir']
+    if not os.path.isdir(archive_dir):
+        return []
+    months = [match.group(1) for match in map(ARCHIVE_NAME.match, os.listdir(archive_dir)) if match]
+    return sorted(months, reverse=True)
+
+
+def retention_cutoff(retention_days=None, now=None):
+    """Return the start of the month holding the retention boundary.
+
+    Archiving whole months keeps each monthly file complete after one run.
+    """
+    retention_days = AUDIT_CONFIG['retention_days'] if retention_days is None else retention_days
+    now = now or datetime.now()
+    boundary = datetime.fromtimestamp(now.timestamp() - retention_days * 86400)
+    return boundary.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def archive(connection, before, archive_dir=None, batch_size=db.DEFAULT_BATCH_SIZE, progress=None):
+    """Move entries modified before `before` into monthly archive files.
+
+    Each batch is appended to its month's file (a new gzip member) and
+    flushed to disk before the rows are deleted and the delete committed.
+    If a run is interrupted between the two, the batch is archived again
+    next time; readers drop the duplicate AuditIDs. Returns the number of
+    rows archived.
+    """
+    archive_dir = archive_dir or AUDIT_CONFIG['archive_dir']
+    os.makedirs(archive_dir, exist_ok=True)
+    cursor = connection.cursor()
+    moved = 0
+    try:
+        while True:
+            cursor.execute(f"""
+                SELECT {', '.join(AUDIT_COLUMNS)} FROM Job_Audit
+                WHERE ModifiedAt < %s
+                ORDER BY ModifiedAt, AuditID LIMIT %s
+            """, (before, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            by_month = {}
+            for row in rows:
+                by_month.setdefault(row[5].strftime("%Y-%m"), []).append(row)
+            for month, month_rows in by_month.items():
+                _append_archive(archive_path(archive_dir, month), month_rows)
+            ids = [row[0] for row in rows]
+            cursor.execute(
+                f"DELETE FROM Job_Audit WHERE AuditID IN ({', '.join(['%s'] * len(ids))})", ids
+            )
+            connection.commit()
+            moved += len(rows)
+            if progress:
+                progress(moved)
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return moved
+
+
+def _append_archive(path, rows):
+    is_new = not os.path.exists(path)
+    with gzip.open(path, 'at', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        if is_new:
+            writer.writerow(AUDIT_COLUMNS)
+        writer.writerows(
+            (*row[:5], row[5].isoformat(sep=' ') if row[5] is not None else "") for row in rows
+        )
+    with open(path, 'rb+') as handle:
+        os.fsync(handle.fileno())
+
+
+def read_archive(month, filters=None, archive_dir=None):
+    """Return one archived month's entries matching the filters, newest first."""
+    archive_dir = archive_dir or AUDIT_CONFIG['archive_dir']
+    filters = filters or {}
+    start, end = filters.get('start'), filters.get('end')
+    rows = {}
+    with gzip.open(archive_path(archive_dir, month), 'rt', newline='', encoding='utf-8') as handle:
+        for record in csv.reader(handle):
+            if record == AUDIT_COLUMNS:
+                continue  # Header
+            row = dict(zip(AUDIT_COLUMNS, record))
+            row['AuditID'] = int(row['AuditID'])
+            row['JobID'] = int(row['JobID'])
+            row['ModifiedAt'] = datetime.fromisoformat(row['ModifiedAt']) if row['ModifiedAt'] else None
+            if filters.get('job_id') and row['JobID'] != filters['job_id']:
+                continue
+            if start and (row['ModifiedAt'] is None or row['ModifiedAt'] < start):
+                continue
+            if end and (row['ModifiedAt'] is None or row['ModifiedAt'] >= end):
+                continue
+            rows[row['AuditID']] = row
+    return sorted(rows.values(), key=lambda row: (row['ModifiedAt'] or datetime.min, row['AuditID']),
+                  reverse=True)
@@ -0,0 +1,227 @@
+"""
+Query Benchmarks
+Runs every query behind the Recruiter Analysis, Candidate Analysis,
+Candidate Facets, Search, Complex Queries, Audit Log and salary update pages against generated data at
+several scales, reports p50/p95/p99 latency and rows/s per query, and
+compares the results with a stored baseline so regressions fail loudly.
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+import weakref
+from datetime import timedelta
+
+import pymysql
+
+import audit
+import datagen
+import facets
+import frames
+import job_lookup
+import queries
+import recruiter_stats
+import salary_analytics
+import search
+import skill_salary
+import storage
+
+
+DEFAULT_SCALES = [10_000, 100_000]
+DEFAULT_REPEAT = 20
+
+# A query regresses when its p95 exceeds the baseline by this factor...
+DEFAULT_TOLERANCE = 1.5
+# ...and by at least this many milliseconds (ignores noise on very fast queries)
+MIN_REGRESSION_MS = 2.0
+
+_CITIES = [city for _, _, _, cities in datagen.COUNTRIES for city in cities]
+_COMMON_SKILLS = datagen.SKILLS[:20]
+_ED_LEVELS = [level for level, _ in datagen.ED_LEVELS]
+# Last day of the generated job postings, so rolling windows are not empty
+_GENERATED_TODAY = datagen.START_DATE.date() + timedelta(days=729)
+
+
+def _run(cursor, built):
+    query, params = built
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+
+def _candidate_search(rng):
+    return queries.candidate_search(", ".join(rng.sample(_COMMON_SKILLS, rng.randint(1, 3))),
+                                    rng.choice(_ED_LEVELS), rng.randint(0, 10), rng.choice(["any", "all"]))
+
+
+def _audit_deep_page(cursor, rng):
+    # A cursor somewhere in the middle of the two generated years
+    modified = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00"
+    return audit.fetch_page(cursor, after=(modified, 2 ** 31), page_size=50)[0]
+
+
+def _audit_new_entries(cursor, rng):
+    return audit.fetch_since(cursor, max(audit.latest_audit_id(cursor) - 10, 0))
+
+
+# Facet index per benchmarked database, built by the warm-up run so only queries are timed
+_facet_indexes = weakref.WeakKeyDictionary()
+
+
+def _facet_query(cursor, rng):
+    index = _facet_indexes.get(cursor.connection)
+    if index is None:
+        index = _facet_indexes[cursor.connection] = facets.FacetIndex()
+        index.refresh(cursor.connection)
+    selected = {'Country': rng.sample(index.values('Country')[:5], 2),
+                'Skill': rng.sample(index.values('Skill')[:20], 2)}
+    return index.query(selected)[0]
+
+
+def _job_lookup(cursor, rng):
+    # The lookup statement itself: a typed title or city prefix, or a few JobId digits
+    term = rng.choice([rng.choice(datagen.TITLES), rng.choice(_CITIES), str(rng.randint(1, 999))])
+    dialect = getattr(cursor.connection, 'dialect', 'mysql')
+    return _run(cursor, job_lookup.lookup_query(term[:rng.randint(2, 6)], 20, dialect))
+
+
+# name -> (dashboard page, callable(cursor, rng) returning the fetched rows)
+CASES = {
+    'recruiter_job_counts': ("Recruiter Analysis", lambda cursor, rng: _run(
+        cursor, queries.recruiter_job_counts())),
+    'recruiter_activity': ("Recruiter Analysis", lambda cursor, rng: _run(
+        cursor, queries.recruiter_activity(rng.choice(recruiter_stats.WINDOWS), _GENERATED_TODAY))),
+    'candidate_search': ("Candidate Analysis", lambda cursor, rng: _run(cursor, _candidate_search(rng))),
+    # Candidate searches streamed into the compact frame the page renders
+    'candidate_search_frame': ("Candidate Analysis", lambda cursor, rng: frames.fetch_frame(
+        cursor.connection, *_candidate_search(rng))),
+    'fulltext_search': ("Search", lambda cursor, rng: search.search(
+        cursor, 'candidate', " ".join(rng.sample(_COMMON_SKILLS, rng.randint(1, 3))),
+        rng.choice(search.MODES[:2]), {'ed_level': rng.choice([None, *_ED_LEVELS])}, page_size=25)[0]),
+    'top_skills': ("Complex Queries", lambda cursor, rng: _run(
+        cursor, queries.top_skills(3, rng.choice([None, *_CITIES])))),
+    'recruiters_by_location': ("Complex Queries", lambda cursor, rng: _run(
+        cursor, queries.recruiters_by_location(rng.choice(_CITIES)))),
+    'top_paying_jobs_for_skill': ("Complex Queries", lambda cursor, rng: _run(
+        cursor, queries.top_paying_jobs_for_skill(rng.choice(_COMMON_SKILLS)))),
+    'jobs_by_min_experience': ("Complex Queries", lambda cursor, rng: _run(
+        cursor, queries.jobs_by_min_experience(rng.randint(0, 10)))),
+    'mean_salary_by_education': ("Complex Queries", lambda cursor, rng: _run(
+        cursor, queries.mean_salary_by_education(rng.choice(_ED_LEVELS)))),
+    'mean_salary_by_skill': ("Complex Queries", lambda cursor, rng: _run(
+        cursor, queries.mean_salary_by_skill(rng.choice(_COMMON_SKILLS)))),
+    'salary_analytics': ("Complex Queries", lambda cursor, rng: salary_analytics.compute(
+        cursor.connection).summary(rng.choice(list(salary_analytics.DIMENSIONS)))),
+    'candidate_facets': ("Candidate Facets", _facet_query),
+    'skill_salary_benchmark': ("Complex Queries", lambda cursor, rng: skill_salary.benchmark(_run(
+        cursor, queries.skill_salary_buckets()))),
+    'job_lookup': ("Get Latest Job Salary Range Updates", _job_lookup),
+    'audit_log_first_page': ("Audit Log Dashboard", lambda cursor, rng: audit.fetch_page(
+        cursor, page_size=50)[0]),
+    'audit_log_deep_page': ("Audit Log Dashboard", _audit_deep_page),
+    'audit_log_by_job': ("Audit Log Dashboard", lambda cursor, rng: audit.fetch_page(
+        cursor, {'job_id': rng.randint(1, 1000)}, page_size=50)[0]),
+    'audit_log_new_entries': ("Audit Log Dashboard", _audit_new_entries),
+}
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_case(connection, name, repeat=DEFAULT_REPEAT, seed=datagen.DEFAULT_SEED):
+    """Time one case `repeat` times (after one warm-up run) and summarize it."""
+    page, case = CASES[name]
+    rng = random.Random(f"{seed}:{name}")
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    try:
+        case(cursor, rng)  # Warm caches so the first timed run is representative
+        timings, rows = [], 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows += len(case(cursor, rng))
+            timings.append(time.perf_counter() - start)
+    finally:
+        cursor.close()
+    return summarize(page, timings, rows)
+
+
+def summarize(page, timings, rows=0):
+    """Summarize run times in seconds (and rows fetched over all runs) as percentiles in ms."""
+    ordered = sorted(timings)
+    total = sum(timings)
+    return {
+        'page': page,
+        'p50_ms': _percentile(ordered, 0.50) * 1000,
+        'p95_ms': _percentile(ordered, 0.95) * 1000,
+        'p99_ms': _percentile(ordered, 0.99) * 1000,
+        'rows': rows // len(timings),
+        'rows_per_s': rows / total if total else 0.0,
+    }
+
+
+def run_scale(connection, repeat=DEFAULT_REPEAT, seed=datagen.DEFAULT_SEED, names=None):
+    """Benchmark every case (or the named ones) on already-generated data."""
+    return {name: run_case(connection, name, repeat, seed) for name in (names or CASES)}
+
+
+def run_suite(backend='sqlite', scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT,
+              seed=datagen.DEFAULT_SEED, connect=None, progress=None):
+    """Generate each scale and benchmark it; returns {"backend/scale/name": summary}.
+
+    With the 'sqlite' backend each scale gets a fresh temporary database.
+    Otherwise `connect()` must return a connection to a database the suite
+    may wipe: the generated tables are reset before every scale.
+    """
+    results = {}
+    for scale in scales:
+        if backend == 'sqlite':
+            work_dir = tempfile.mkdtemp(prefix="talent_bench_")
+            connection = storage.connect_embedded('sqlite', os.path.join(work_dir, "bench.db"))
+        else:
+            connection = connect()
+            datagen.reset(connection)
+        try:
+            started = time.perf_counter()
+            datagen.generate(connection, scale, seed)
+            if progress:
+                progress(f"Generated {scale:,} candidates in {time.perf_counter() - started:.1f}s")
+            for name, summary in run_scale(connection, repeat, seed).items():
+                results[f"{backend}/{scale}/{name}"] = summary
+                if progress:
+                    progress(format_result(f"{backend}/{scale}/{name}", summary))
+        finally:
+            connection.close()
+            if backend == 'sqlite':
+                os.remove(os.path.join(work_dir, "bench.db"))
+                os.rmdir(work_dir)
+    return results
+
+
+def format_result(key, summary):
+    return (f"{key:<55} p50 {summary['p50_ms']:>9.2f} ms  p95 {summary['p95_ms']:>9.2f} ms  "
+            f"p99 {summary['p99_ms']:>9.2f} ms  {summary['rows_per_s']:>12,.0f} rows/s")
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save_baseline(path, results):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta_ms=MIN_REGRESSION_MS):
+    """Return (key, baseline p95, current p95) for every query slower than the baseline allows."""
+    regressions = []
+    for key, summary in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        allowed = max(previous['p95_ms'] * tolerance, previous['p95_ms'] + min_delta_ms)
+        if summary['p95_ms'] > allowed:
+            regressions.append((key, previous['p95_ms'], summary['p95_ms']))
+    return regressions
@@ -0,0 +1,161 @@
+"""
+Table Browser
+Keyset-paginated reads of Recruiter, Job and Candidate for the "View Data"
+page: one page per query, sorted and filtered on indexed columns, with
+approximate row counts taken from table statistics.
+"""
+
+import skills as skill_index
+
+
+# Per-table browsing rules. Only whitelisted names are ever interpolated
+# into SQL; filter kinds are 'equals', 'range' and 'skills'.
+BROWSABLE_TABLES = {
+    'Recruiter': {
+        'key': 'ContactPerson',
+        'columns': ['ContactPerson', 'Contact', 'Company', 'CompanyProfile'],
+        'sort_columns': ['ContactPerson'],
+        'filters': {'Company': 'equals'},
+    },
+    'Job': {
+        'key': 'JobId',
+        'columns': ['JobId', 'Title', 'Location', 'Date', 'Experience', 'Skills',
+                    'ContactPerson', 'SalaryRange', 'SalaryMin', 'SalaryMax', 'MinExperienceYears',
+                    'PostedDate'],
+        'sort_columns': ['JobId', 'PostedDate', 'SalaryMax', 'MinExperienceYears'],
+        'filters': {'Location': 'equals', 'ContactPerson': 'equals', 'SalaryMax': 'range',
+                    'MinExperienceYears': 'range', 'Skills': 'skills'},
+        'skill_entity': 'job',
+    },
+    'Candidate': {
+        'key': 'CandidateId',
+        'columns': ['CandidateId', 'EdLevel', 'Gender', 'YearsCoded', 'Country',
+                    'PreviousSalary', 'Skills'],
+        'sort_columns': ['CandidateId'],
+        'filters': {'EdLevel': 'equals', 'Country': 'equals', 'YearsCoded': 'range',
+                    'Skills': 'skills'},
+        'skill_entity': 'candidate',
+    },
+}
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def _where_clause(table, filters):
+    """Build the WHERE conditions and parameters for validated filters."""
+    spec = BROWSABLE_TABLES[table]
+    conditions = []
+    params = []
+    for column, value in (filters or {}).items():
+        kind = spec['filters'].get(column)
+        if kind is None:
+            raise ValueError(f"Cannot filter {table} on {column}.")
+        if kind == 'equals' and value not in (None, ""):
+            conditions.append(f"{column} = %s")
+            params.append(value)
+        elif kind == 'range':
+            low, high = value
+            if low is not None:
+                conditions.append(f"{column} >= %s")
+                params.append(low)
+            if high is not None:
+                conditions.append(f"{column} <= %s")
+                params.append(high)
+        elif kind == 'skills' and value:
+            clause, clause_params = skill_index.skill_match_clause(spec['skill_entity'], value, "all")
+            conditions.append(clause)
+            params.extend(clause_params)
+    return conditions, params
+
+
+def _select(table, columns, filters, sort, descending, after=None, with_keys=True):
+    """Build (sql, params) for an ordered, filtered read.
+
+    With `with_keys` the sort and key columns are selected as well, since
+    the keyset cursor is taken from them.
+    """
+    spec = BROWSABLE_TABLES[table]
+    key = spec['key']
+    if sort not in spec['sort_columns']:
+        raise ValueError(f"Cannot sort {table} on {sort}.")
+    selected = list(dict.fromkeys([key, sort, *columns])) if with_keys else columns
+
+    conditions, params = _where_clause(table, filters)
+    if sort != key:
+        conditions.append(f"{sort} IS NOT NULL")
+    op = "<" if descending else ">"
+    if after is not None:
+        after_sort, after_key = after
+        if sort == key:
+            conditions.append(f"{key} {op} %s")
+            params.append(after_key)
+        else:
+            conditions.append(f"({sort} {op} %s OR ({sort} = %s AND {key} {op} %s))")
+            params.extend([after_sort, after_sort, after_key])
+    direction = "DESC" if descending else "ASC"
+    order = f"{key} {direction}" if sort == key else f"{sort} {direction}, {key} {direction}"
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT {', '.join(selected)} FROM {table} {where} ORDER BY {order}", params
+
+
+def _columns(table, columns):
+    spec = BROWSABLE_TABLES[table]
+    return [column for column in (columns or spec['columns']) if column in spec['columns']]
+
+
+def fetch_page(cursor, table, columns=None, filters=None, sort=None, descending=False,
+               after=None, page_size=50):
+    """Fetch one page of rows after the keyset cursor `after`.
+
+    Returns (rows, next_after); next_after is None on the last page. A
+    cursor is the (sort value, key value) pair of the last row shown, so
+    each page is an index range read no matter how deep the user pages.
+    Rows with a NULL sort value are skipped when sorting on a non-key column.
+    """
+    key = BROWSABLE_TABLES[table]['key']
+    sort = sort or key
+    columns = _columns(table, columns)
+    query, params = _select(table, columns, filters, sort, descending, after)
+    cursor.execute(f"{query} LIMIT %s", (*params, page_size))
+    rows = cursor.fetchall()
+    next_after = None
+    if len(rows) == page_size:
+        last = rows[-1]
+        next_after = (last[sort], last[key])
+    shown = [{column: row[column] for column in columns} for row in rows]
+    return shown, next_after
+
+
+def export_query(table, columns=None, filters=None, sort=None, descending=False):
+    """Return (sql, params) reading every row of the current view, for streaming export."""
+    sort = sort or BROWSABLE_TABLES[table]['key']
+    columns = _columns(table, columns)
+    return _select(table, columns, filters, sort, descending, with_keys=False)
+
+
+def estimate_count(cursor, table, filters=None):
+    """Approximate the matching row count without running COUNT(*).
+
+    Unfiltered tables use InnoDB's table statistics; filtered reads use the
+    optimizer's row estimate from EXPLAIN. Embedded databases have neither,
+    so they count exactly. Expects a DictCursor.
+    """
+    conditions, params = _where_clause(table, filters)
+    if getattr(cursor.connection, 'dialect', 'mysql') != 'mysql':
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor.execute(f"SELECT COUNT(*) AS EstimatedRows FROM {table} {where}", params)
+        return int(cursor.fetchone()['EstimatedRows'])
+    if not conditions:
+        cursor.execute("""
+            SELECT TABLE_ROWS AS EstimatedRows
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        row = cursor.fetchone()
+        return int(row['EstimatedRows'] or 0) if row else 0
+    key = BROWSABLE_TABLES[table]['key']
+    cursor.execute(f"EXPLAIN SELECT {key} FROM {table} WHERE {' AND '.join(conditions)}", params)
+    plan = cursor.fetchone()
+    if not plan or plan.get('rows') is None:
+        return 0
+    return int(plan['rows'] * float(plan.get('filtered') or 100) / 100)
@@ -0,0 +1,314 @@
+"""
+Bulk Import
+Chunked, resumable CSV import of candidates and jobs. Rows are validated
+and normalized in Python, written with multi-row INSERTs in batched
+transactions together with their skill links, and rejected rows are
+reported with their line number and reason. Progress is recorded in the
+ImportJob table inside each batch's transaction, so re-running an
+interrupted import of the same file continues after the last committed
+batch.
+"""
+
+import csv
+import hashlib
+import re
+
+import job_fields
+import recruiter_stats
+import skill_demand
+import skill_salary
+import skills as skill_index
+
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Rows per multi-row INSERT statement when writing a batch (keys are taken from each statement)
+INSERT_ROWS = 1000
+
+# Rejects kept in the report for display; the rejects file has all of them
+MAX_REPORTED_REJECTS = 100
+
+# Canonical education levels and the spellings accepted for them
+EDUCATION_LEVELS = {
+    'undergraduate': 'Undergraduate', 'undergrad': 'Undergraduate', 'bachelor': 'Undergraduate',
+    "bachelor's": 'Undergraduate', 'bachelors': 'Undergraduate', 'bsc': 'Undergraduate',
+    'ba': 'Undergraduate', 'bs': 'Undergraduate',
+    'master': 'Master', "master's": 'Master', 'masters': 'Master', 'msc': 'Master',
+    'ma': 'Master', 'ms': 'Master', 'mba': 'Master',
+    'phd': 'PhD', 'ph.d': 'PhD', 'ph.d.': 'PhD', 'doctorate': 'PhD',
+    'nohighered': 'NoHigherEd', 'no higher education': 'NoHigherEd', 'none': 'NoHigherEd',
+    'other': 'Other',
+}
+
+# Per-entity column layout: target columns, accepted header aliases and required fields
+ENTITIES = {
+    'candidate': {
+        'table': 'Candidate',
+        'key': 'CandidateId',
+        'columns': ['EdLevel', 'Gender', 'YearsCoded', 'Country', 'PreviousSalary', 'Skills'],
+        'aliases': {'yearscode': 'YearsCoded', 'haveworkedwith': 'Skills',
+                    'previoussalary': 'PreviousSalary', 'salary': 'PreviousSalary'},
+        'required': ['EdLevel', 'Country'],
+    },
+    'job': {
+        'table': 'Job',
+        'key': 'JobId',
+        'columns': ['Location', 'Date', 'Experience', 'Skills', 'Title', 'ContactPerson',
+                    'SalaryRange', 'SalaryMin', 'SalaryMax', 'MinExperienceYears', 'PostedDate'],
+        'aliases': {'job title': 'Title', 'contact person': 'ContactPerson',
+                    'salary range': 'SalaryRange', 'job posting date': 'Date', 'skills': 'Skills'},
+        'required': ['Location', 'Title', 'ContactPerson'],
+    },
+}
+
+_NUMBER = re.compile(r"[\s,$€£]")
+
+
+class RowError(ValueError):
+    """A CSV row that fails validation."""
+
+
+def file_checksum(path):
+    """Return the SHA-256 of a file, identifying it across resumed runs."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _clean(value):
+    value = (value or "").strip()
+    return value or None
+
+
+def _non_negative_int(value, column):
+    if value is None:
+        return None
+    try:
+        number = int(float(_NUMBER.sub("", value)))
+    except ValueError:
+        raise RowError(f"{column} is not a number: {value!r}")
+    if number < 0:
+        raise RowError(f"{column} must not be negative: {value!r}")
+    return number
+
+
+def normalize_ed_level(value):
+    """Map an education level spelling onto its canonical value."""
+    level = EDUCATION_LEVELS.get(" ".join(value.split()).casefold())
+    if level is None:
+        raise RowError(f"Unknown EdLevel: {value!r}")
+    return level
+
+
+def normalize_skills_text(value):
+    """Rewrite a Skills string with one separator and no duplicates or blanks."""
+    seen = set()
+    skills = []
+    for skill in skill_index.SKILL_SEPARATORS.split(value or ""):
+        skill = " ".join(skill.split())
+        if skill and skill.casefold() not in seen:
+            seen.add(skill.casefold())
+            skills.append(skill)
+    return ", ".join(skills) or None
+
+
+def map_header(entity, header):
+    """Return {csv column index: target column} for a CSV header row."""
+    spec = ENTITIES[entity]
+    names = {column.casefold(): column for column in spec['columns']}
+    names.update(spec['aliases'])
+    mapping = {}
+    for index, name in enumerate(header):
+        column = names.get(name.strip().casefold())
+        if column and column not in mapping.values():
+            mapping[index] = column
+    missing = [column for column in spec['required'] if column not in mapping.values()]
+    if missing:
+        raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+    return mapping
+
+
+def normalize_row(entity, raw, recruiters=None):
+    """Validate one mapped row, returning the tuple of values to insert."""
+    spec = ENTITIES[entity]
+    row = {column: _clean(raw.get(column)) for column in spec['columns']}
+    for column in spec['required']:
+        if row[column] is None:
+            raise RowError(f"{column} is required")
+    row['Skills'] = normalize_skills_text(row['Skills'])
+
+    if entity == 'candidate':
+        row['EdLevel'] = normalize_ed_level(row['EdLevel'])
+        row['YearsCoded'] = _non_negative_int(row['YearsCoded'], 'YearsCoded')
+        row['PreviousSalary'] = _non_negative_int(row['PreviousSalary'], 'PreviousSalary')
+    else:
+        if recruiters is not None and row['ContactPerson'].casefold() not in recruiters:
+            raise RowError(f"Unknown recruiter: {row['ContactPerson']!r}")
+        salary_min, salary_max, min_years = job_fields.parsed_job_fields(
+            row['SalaryRange'], row['Experience']
+        )
+        if row['SalaryRange'] and salary_min is None:
+            raise RowError(f"Unparseable SalaryRange: {row['SalaryRange']!r}")
+        row['SalaryMin'], row['SalaryMax'], row['MinExperienceYears'] = salary_min, salary_max, min_years
+        posted = job_fields.parse_date(row['Date'])
+        row['PostedDate'] = posted and posted.isoformat()
+    return tuple(row[column] for column in spec['columns'])
+
+
+def _start_or_resume(cursor, entity, source_name, checksum):
+    """Return (ImportId, rows already consumed) for this file, creating a job if new."""
+    cursor.execute("""
+        SELECT ImportId, RowsRead FROM ImportJob
+        WHERE Entity = %s AND SourceChecksum = %s AND Status <> 'completed'
+        ORDER BY ImportId DESC LIMIT 1
+    """, (entity, checksum))
+    row = cursor.fetchone()
+    if row:
+        cursor.execute("UPDATE ImportJob SET Status = 'running' WHERE ImportId = %s", (row[0],))
+        return row[0], row[1]
+    cursor.execute("""
+        INSERT INTO ImportJob (Entity, SourceName, SourceChecksum, Status)
+        VALUES (%s, %s, %s, 'running')
+    """, (entity, source_name, checksum))
+    return cursor.lastrowid, 0
+
+
+def _insert_batch(cursor, table, columns, values):
+    """Insert rows with multi-row INSERTs and return the (first, last) AUTO_INCREMENT keys of each.
+
+    The keys come from each statement itself rather than from the table's
+    maximum key, so rows other sessions insert meanwhile (the write queue,
+    another import) are never taken for ours, whatever the isolation level.
+    An INSERT ... VALUES knows its row count up front, so InnoDB reserves
+    its keys in one step and they run consecutively from the statement's
+    lastrowid (with the default auto_increment_increment of 1); SQLite
+    reports the last key instead of the first.
+    """
+    last_key = getattr(cursor.connection, 'dialect', 'mysql') == 'sqlite'
+    row = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    ranges = []
+    for start in range(0, len(values), INSERT_ROWS):
+        chunk = values[start:start + INSERT_ROWS]
+        cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row] * len(chunk))}",
+                       [value for chunk_row in chunk for value in chunk_row])
+        first = cursor.lastrowid - len(chunk) + 1 if last_key else cursor.lastrowid
+        ranges.append((first, first + len(chunk) - 1))
+    return ranges
+
+
+def write_batch(cursor, entity, values, skill_cache):
+    """Insert one batch of rows and link their skills; caller commits."""
+    spec = ENTITIES[entity]
+    table, key, columns = spec['table'], spec['key'], spec['columns']
+    extra = ", Location, ContactPerson, PostedDate, SalaryMin, SalaryMax" if entity == 'job' else ""
+    inserted = []
+    for first, last in _insert_batch(cursor, table, columns, values):
+        cursor.execute(
+            f"SELECT {key}, Skills{extra} FROM {table} WHERE {key} BETWEEN %s AND %s ORDER BY {key}", (first, last)
+        )
+        inserted.extend(cursor.fetchall())
+    linked = skill_index.add_skill_links(
+        cursor, entity, [(row[0], row[1]) for row in inserted], skill_cache
+    )
+    if entity == 'job':
+        skill_demand.record_job_changes(
+            cursor, [(None, (row[2], linked[row[0]])) for row in inserted]
+        )
+        skill_salary.record_job_changes(
+            cursor, [(None, (linked[row[0]], row[5], row[6])) for row in inserted]
+        )
+        recruiter_stats.record_job_changes(cursor, [(None, tuple(row[3:7])) for row in inserted])
+
+
+def import_csv(connection, entity, path, source_name=None, batch_size=DEFAULT_BATCH_SIZE,
+               rejects_path=None, progress=None):
+    """Import a candidate or job CSV file, resuming a previous partial run.
+
+    Rejected rows are appended to `rejects_path` (when given) with their
+    line number and reason. `progress(report)` is called after every
+    committed batch. Returns the report dict.
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f"Unknown import entity: {entity}")
+    checksum = file_checksum(path)
+    cursor = connection.cursor()
+    rejects_file = None
+    import_id = None
+    try:
+        import_id, skip = _start_or_resume(cursor, entity, source_name or path, checksum)
+        connection.commit()
+        recruiters = None
+        if entity == 'job':
+            cursor.execute("SELECT ContactPerson FROM Recruiter")
+            recruiters = {row[0].casefold() for row in cursor.fetchall()}
+
+        report = {'import_id': import_id, 'resumed_at': skip, 'rows_read': skip,
+                  'inserted': 0, 'rejected': 0, 'rejects': []}
+        if rejects_path:
+            rejects_file = open(rejects_path, 'a' if skip else 'w', newline='', encoding='utf-8')
+            rejects_writer = csv.writer(rejects_file)
+            if not skip:
+                rejects_writer.writerow(["Line", "Error", "Row"])
+
+        skill_cache = {}
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            reader = csv.reader(handle)
+            mapping = map_header(entity, next(reader, []))
+            batch, batch_rejects, batch_read = [], [], 0
+            for row_number, fields in enumerate(reader, start=1):
+                if row_number <= skip:
+                    continue
+                batch_read += 1
+                raw = {column: fields[index] for index, column in mapping.items() if index < len(fields)}
+                try:
+                    batch.append(normalize_row(entity, raw, recruiters))
+                except RowError as e:
+                    batch_rejects.append((reader.line_num, str(e), fields))
+                if batch_read >= batch_size:
+                    _commit_batch(connection, cursor, entity, import_id, batch, batch_rejects,
+                                  batch_read, skill_cache, report, rejects_file)
+                    batch, batch_rejects, batch_read = [], [], 0
+                    if progress:
+                        progress(report)
+            if batch_read:
+                _commit_batch(connection, cursor, entity, import_id, batch, batch_rejects,
+                              batch_read, skill_cache, report, rejects_file)
+        cursor.execute("UPDATE ImportJob SET Status = 'completed' WHERE ImportId = %s", (import_id,))
+        connection.commit()
+        if progress:
+            progress(report)
+        return report
+    except Exception:
+        connection.rollback()
+        if import_id is not None:
+            cursor.execute("UPDATE ImportJob SET Status = 'failed' WHERE ImportId = %s", (import_id,))
+            connection.commit()
+        raise
+    finally:
+        if rejects_file:
+            rejects_file.close()
+        cursor.close()
+
+
+def _commit_batch(connection, cursor, entity, import_id, batch, batch_rejects, batch_read,
+                  skill_cache, report, rejects_file):
+    """Write one batch and advance the ImportJob checkpoint in the same transaction."""
+    if batch:
+        write_batch(cursor, entity, batch, skill_cache)
+    cursor.execute("""
+        UPDATE ImportJob
+        SET RowsRead = RowsRead + %s, RowsInserted = RowsInserted + %s, RowsRejected = RowsRejected + %s
+        WHERE ImportId = %s
+    """, (batch_read, len(batch), len(batch_rejects), import_id))
+    connection.commit()
+    report['rows_read'] += batch_read
+    report['inserted'] += len(batch)
+    report['rejected'] += len(batch_rejects)
+    room = MAX_REPORTED_REJECTS - len(report['rejects'])
+    report['rejects'].extend((line, error) for line, error, _ in batch_rejects[:max(room, 0)])
+    if rejects_file:
+        writer = csv.writer(rejects_file)
+        writer.writerows((line, error, "|".join(fields)) for line, error, fields in batch_rejects)
+        rejects_file.flush()
@@ -12,6 +12,109 @@ DB_CONFIG = {
     'database': 'final_project'  # Database name
 }
 
+# Optional: Connection Pool Settings
+POOL_CONFIG = {
+    'max_size': 10,           # Maximum open connections shared by all sessions
+    'idle_timeout': 300,      # Seconds before an idle connection is closed
+    'checkout_timeout': 10    # Seconds to wait for a free connection
+}
+
+# Optional: Query Result Cache Settings
+CACHE_CONFIG = {
+    'max_entries': 256,       # Cached results kept (least recently used evicted)
+    'ttl': 300                # Seconds a result is reused if no write invalidates it
+}
+
+# Optional: Query Metrics Settings
+METRICS_CONFIG = {
+    'slow_query_ms': 500,     # Queries slower than this are logged with their EXPLAIN plan
+    'window': 1000,           # Recent runs per query kept for latency percentiles
+    'dump_path': None,        # e.g. 'metrics/dashboard.prom' (Prometheus text) or '.json'
+    'dump_interval': 60       # Seconds between metric dumps
+}
+
+# Optional: Audit Log Retention
+AUDIT_CONFIG = {
+    'archive_dir': 'audit_archive',  # Directory for monthly compressed audit archives
+    'retention_days': 365            # Audit entries older than this are archived
+}
+
+# Optional: Storage Backends
+STORAGE_CONFIG = {
+    'primary': 'mysql',               # 'mysql', or 'sqlite' to run without a MySQL server
+    'sqlite_path': 'talent.db',       # Database file of the 'sqlite' primary
+    'analytics': None,                # Analytics pages read: None (the primary), 'sqlite' or 'duckdb' copy
+    'analytics_path': 'analytics.db', # Database file of the analytics copy
+    'sync_interval': 300              # Seconds between refreshes of the copy (0: manual only)
+}
+
+# Optional: Salary Analytics
+SALARY_ANALYTICS_CONFIG = {
+    'ttl': 600,            # Seconds salary statistics are reused without any candidate write
+    'histogram_bins': 20   # Salary bins per histogram
+}
+
+# Optional: Candidate Facets
+FACET_CONFIG = {
+    'max_values': 500,  # Values indexed per facet (most common first); bounds the index's memory
+    'ttl': 60           # Seconds between checks for candidates added by other processes
+}
+
+# Optional: Result Tables
+FRAME_CONFIG = {
+    'page_rows': 1000,    # Rows of a result sent to the browser at a time
+    'batch_size': 10000   # Rows fetched and converted per batch when streaming a result
+}
+
+# Optional: Job Lookup (salary update page)
+LOOKUP_CONFIG = {
+    'max_results': 20,     # Jobs offered per lookup
+    'min_chars': 2,        # Shorter terms (other than a JobId) are not looked up
+    'infix_min_chars': 3,  # Terms this long also match inside Title, Location and ContactPerson
+    'max_entries': 512,    # Recent lookups kept in memory
+    'ttl': 60              # Seconds a lookup is reused without any job write
+}
+
+# Optional: Duplicate Candidate Detection
+DEDUP_CONFIG = {
+    'num_perm': 64,     # MinHash permutations per signature
+    'bands': 16,        # LSH bands; more bands find less similar pairs (and compare more)
+    'threshold': 0.85,  # Pair score from which candidates are proposed as duplicates
+    'max_bucket': 20,   # Larger buckets are too generic to compare and are skipped
+    'ttl': 60           # Seconds between checks for candidates added by other processes
+}
+
+# Optional: Background Write Queue
+WRITE_QUEUE_CONFIG = {
+    'max_batch': 200,                 # Form submissions committed together at most
+    'max_wait_ms': 50,                # How long the writer gathers submissions before committing
+    'max_retries': 3,                 # Retries of deadlocks / lost connections before spilling to disk
+    'retry_backoff': 0.2,             # Seconds before the first retry, doubling after each
+    'retry_interval': 10,             # Seconds between replays of spilled writes
+    'spill_path': 'write_spill.jsonl' # Writes kept here while the database is unavailable
+}
+
+# Optional: Read Replicas (read-only pages; writes always go to DB_CONFIG)
+REPLICA_CONFIG = {
+    'replicas': [],               # e.g. [{'host': '127.0.0.1', 'port': 3307}]; other settings from DB_CONFIG
+    'selection': 'round_robin',   # or 'least_latency'
+    'sticky_seconds': 10,         # Reads stay on the primary this long after a session writes
+    'health_interval': 10,        # Seconds between replica health checks
+    'max_lag_seconds': 30         # Replicas further behind are skipped
+}
+
+# Optional: Dashboard Exports
+EXPORT_CONFIG = {
+    'max_download_mb': 200  # Larger exports are refused; use `python manage.py export` for whole tables
+}
+
+# Optional: Schema Migrations (python manage.py migrate)
+MIGRATION_CONFIG = {
+    'lock_wait_timeout': 5,  # Seconds a DDL statement waits for its table's metadata lock
+    'retries': 3,            # Further attempts of a statement that timed out on the lock
+    'retry_delay': 10        # Seconds between those attempts
+}
+
 # Optional: Application Settings
 APP_CONFIG = {
     'debug_mode': False,
@@ -0,0 +1,140 @@
+"""
+Dashboard Benchmarks
+Times the Streamlit dashboard itself rather than its queries, using
+Streamlit's AppTest against a generated SQLite database:
+
+- cold start: a fresh Python process running the script once, logged in
+  as an admin on the first page (imports, sidebar and page included;
+  importing Streamlit itself is not counted), and
+- rerun: each page's later reruns in a warm process, i.e. what every
+  widget interaction costs. AppTest compiles the script on every run,
+  while a Streamlit server compiles it once and reuses the bytecode, so
+  the reruns here share one compiled script like a server's would.
+
+Results use the same summaries and baseline comparison as the query
+benchmarks, so a run before a change can be saved as the baseline and a
+run after it compared against it.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import benchmark
+import datagen
+import storage
+
+
+DEFAULT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard.py")
+DEFAULT_SCALE = 10_000
+DEFAULT_COLD_STARTS = 5
+DEFAULT_RERUNS = 10
+
+# Seconds a single script run may take before AppTest gives up
+RUN_TIMEOUT = 120
+
+# Run in a fresh interpreter: argv[1] is the script, argv[2] the SQLite database
+_COLD_START = """
+import json, os, sys, time
+sys.path.insert(0, os.path.dirname(sys.argv[1]))
+import storage
+storage.STORAGE_CONFIG.update(primary='sqlite', sqlite_path=sys.argv[2], analytics=None)
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=%d)
+app.session_state['logged_in'] = True
+app.session_state['role'] = 'admin'
+app.run()
+print(json.dumps({'seconds': time.perf_counter() - start, 'errors': len(app.exception)}))
+""" % RUN_TIMEOUT
+
+
+def page_labels():
+    """Return the dashboard's menu entries."""
+    import views
+
+    return list(views.PAGES)
+
+
+def cold_start(script, database, repeat=DEFAULT_COLD_STARTS):
+    """Time `repeat` first runs of the script, each in a new process; returns (seconds, errors)."""
+    timings, errors = [], 0
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _COLD_START, script, database],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(script)).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        errors += result['errors']
+    return timings, errors
+
+
+def reruns(script, database, labels, repeat=DEFAULT_RERUNS):
+    """Time `repeat` reruns of every page in this process: {label: (seconds, errors)}.
+
+    Each page is selected and run once before timing, so its module is
+    already imported and only the rerun itself is measured.
+    """
+    from streamlit.testing.v1 import AppTest, local_script_runner
+
+    # One script cache for all runs, as in a server (AppTest creates one per run)
+    shared_cache = local_script_runner.ScriptCache()
+    create_cache = local_script_runner.ScriptCache
+    local_script_runner.ScriptCache = lambda: shared_cache
+    storage.STORAGE_CONFIG.update(primary='sqlite', sqlite_path=database, analytics=None)
+    results = {}
+    try:
+        app = AppTest.from_file(script, default_timeout=RUN_TIMEOUT)
+        app.session_state['logged_in'] = True
+        app.session_state['role'] = 'admin'
+        app.run()
+        for label in labels:
+            menu = next(box for box in app.sidebar.selectbox if box.label == "Menu")
+            menu.set_value(label).run()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                app.run()
+                timings.append(time.perf_counter() - start)
+            results[label] = (timings, len(app.exception))
+    finally:
+        local_script_runner.ScriptCache = create_cache
+    return results
+
+
+def run_suite(script=DEFAULT_SCRIPT, scale=DEFAULT_SCALE, cold_starts=DEFAULT_COLD_STARTS,
+              repeat=DEFAULT_RERUNS, seed=datagen.DEFAULT_SEED, progress=None):
+    """Generate a SQLite database of `scale` candidates and time the dashboard on it.
+
+    Returns {"dashboard/cold_start": summary, "dashboard/rerun/<page>": summary}.
+    """
+    script = os.path.abspath(script)
+    work_dir = tempfile.mkdtemp(prefix="talent_dashboard_bench_")
+    database = os.path.join(work_dir, "bench.db")
+    connection = storage.connect_embedded('sqlite', database)
+    try:
+        datagen.generate(connection, scale, seed)
+    finally:
+        connection.close()
+
+    def report(key, summary, errors):
+        if progress:
+            progress(benchmark.format_result(key, summary) + (f"  {errors} errors" if errors else ""))
+
+    results = {}
+    try:
+        timings, errors = cold_start(script, database, cold_starts)
+        results["dashboard/cold_start"] = benchmark.summarize("Startup", timings)
+        report("dashboard/cold_start", results["dashboard/cold_start"], errors)
+        for label, (timings, errors) in reruns(script, database, page_labels(), repeat).items():
+            key = f"dashboard/rerun/{label}"
+            results[key] = benchmark.summarize(label, timings)
+            report(key, results[key], errors)
+    finally:
+        for name in os.listdir(work_dir):
+            os.remove(os.path.join(work_dir, name))
+        os.rmdir(work_dir)
+    return results
@@ -0,0 +1,235 @@
+"""
+Synthetic Data Generator
+Seeded, reproducible recruiters, jobs, candidates and audit entries with
+realistic shapes: Zipf-like skill popularity, weighted countries and
+education levels, experience-dependent salaries and a long-tailed number
+of jobs per recruiter. Loads the MySQL database from config.py or an
+embedded SQLite file standing in for it (for CI), through the same skill
+index and demand counter code the application uses.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+
+import recruiter_stats
+import skill_demand
+import skill_salary
+import skills as skill_index
+import job_fields
+
+
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 5000
+
+# Generated jobs are posted over the two years from this date
+START_DATE = datetime(2023, 1, 1)
+
+# Rows generated per candidate at a given scale
+SCALE_RATIOS = {'recruiters': 0.005, 'jobs': 0.1, 'audit': 0.05}
+
+# Skills in rough order of popularity; popularity falls off as 1 / rank^0.9
+SKILLS = [
+    "JavaScript", "SQL", "Python", "HTML/CSS", "TypeScript", "Java", "Bash/Shell", "C#", "Git",
+    "Docker", "C++", "PHP", "React", "Node.js", "AWS", "PostgreSQL", "MySQL", "Linux", "C",
+    "Go", "Kubernetes", "Azure", "MongoDB", "Redis", "Kotlin", "Rust", "Ruby", "Django",
+    "Flask", "Pandas", "Swift", "R", "Spark", "TensorFlow", "PyTorch", "Scala", "Dart",
+    "Terraform", "Hadoop", "MATLAB", "Perl", "Elixir", "Haskell", "Clojure", "Fortran",
+]
+SKILL_WEIGHTS = [1 / (rank + 1) ** 0.9 for rank in range(len(SKILLS))]
+
+# (country, share of candidates, salary multiplier, cities used as job locations)
+COUNTRIES = [
+    ("United States of America", 0.22, 1.6, ["New York", "San Francisco", "Austin", "Seattle"]),
+    ("India", 0.14, 0.35, ["Bangalore", "Hyderabad", "Pune"]),
+    ("Germany", 0.08, 1.1, ["Berlin", "Munich", "Hamburg"]),
+    ("United Kingdom of Great Britain and Northern Ireland", 0.07, 1.15, ["London", "Manchester"]),
+    ("Canada", 0.05, 1.2, ["Toronto", "Vancouver"]),
+    ("France", 0.04, 0.95, ["Paris", "Lyon"]),
+    ("Brazil", 0.04, 0.4, ["Sao Paulo"]),
+    ("Poland", 0.04, 0.6, ["Warsaw", "Krakow"]),
+    ("Netherlands", 0.03, 1.05, ["Amsterdam", "Rotterdam"]),
+    ("Australia", 0.03, 1.25, ["Sydney", "Melbourne"]),
+    ("Spain", 0.03, 0.75, ["Madrid", "Barcelona"]),
+    ("Sweden", 0.02, 1.0, ["Stockholm"]),
+    ("Italy", 0.02, 0.7, ["Milan"]),
+    ("Ukraine", 0.02, 0.5, ["Kyiv"]),
+    ("Other", 0.17, 0.6, ["Remote"]),
+]
+ED_LEVELS = [("Undergraduate", 0.45), ("Master", 0.28), ("PhD", 0.05),
+             ("NoHigherEd", 0.13), ("Other", 0.09)]
+GENDERS = [("Male", 0.75), ("Female", 0.22), ("Other", 0.03)]
+TITLES = ["Software Engineer", "Data Scientist", "Data Engineer", "Backend Developer",
+          "Frontend Developer", "Full Stack Developer", "DevOps Engineer", "Machine Learning Engineer",
+          "Database Administrator", "Mobile Developer", "QA Engineer", "Site Reliability Engineer"]
+COMPANY_WORDS = ["Tech", "Data", "Cloud", "Soft", "Net", "Logic", "Quantum", "Blue", "Bright", "Apex"]
+
+# Tables the generator writes, children first (for resetting)
+GENERATED_TABLES = ['CandidateDuplicate', 'Job_Audit', 'RecruiterStats', 'SkillSalary', 'SkillLocationDemand',
+                    'SkillDemand', 'JobSkill', 'CandidateSkill', 'Skill', 'Job', 'Candidate', 'Recruiter']
+
+
+def _pick(rng, weighted):
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+
+def _skills(rng, low, high):
+    """Sample between low and high distinct skills by popularity."""
+    count = rng.randint(low, high)
+    chosen = []
+    while len(chosen) < count:
+        skill = rng.choices(SKILLS, SKILL_WEIGHTS)[0]
+        if skill not in chosen:
+            chosen.append(skill)
+    return ", ".join(chosen)
+
+
+def generate_recruiters(rng, count):
+    """Yield Recruiter rows."""
+    for number in range(1, count + 1):
+        company = f"{rng.choice(COMPANY_WORDS)}{rng.choice(COMPANY_WORDS).lower()} {number % 97 + 1}"
+        yield (f"Recruiter {number:07d}", f"recruiter{number}@example.com", company,
+               f"{company} hires engineers across {rng.randint(1, 12)} offices.")
+
+
+def generate_candidates(rng, count):
+    """Yield Candidate rows (without keys)."""
+    countries = [(country, share) for country, share, _, _ in COUNTRIES]
+    multipliers = {country: multiplier for country, _, multiplier, _ in COUNTRIES}
+    for _ in range(count):
+        country = _pick(rng, countries)
+        years = min(int(rng.expovariate(1 / 9)), 50)
+        salary = int(rng.lognormvariate(math.log(38000 + 4500 * min(years, 20)), 0.35)
+                     * multipliers[country])
+        yield (_pick(rng, ED_LEVELS), _pick(rng, GENDERS), years, country,
+               salary if rng.random() > 0.03 else None, _skills(rng, 2, 9))
+
+
+def generate_jobs(rng, count, recruiters, start_date):
+    """Yield Job rows (without keys); recruiters post jobs with a long-tailed fan-out."""
+    recruiter_weights = [1 / (rank + 1) for rank in range(len(recruiters))]
+    locations = [(city, share / len(cities)) for _, share, _, cities in COUNTRIES for city in cities]
+    for _ in range(count):
+        min_years = rng.choice([0, 1, 2, 3, 4, 5, 5, 7, 8, 10])
+        experience = f"{min_years} to {min_years + rng.choice([2, 3, 5, 10])} Years"
+        low = int(rng.lognormvariate(math.log(45 + 6 * min_years), 0.3))
+        salary_range = f"${low}K-${low + rng.randint(10, 60)}K"
+        posted = (start_date + timedelta(days=rng.randint(0, 729))).strftime("%Y-%m-%d")
+        skills = _skills(rng, 2, 7)
+        yield (_pick(rng, locations), posted, experience, skills,
+               rng.choice(TITLES), rng.choices(recruiters, recruiter_weights)[0], salary_range,
+               *job_fields.parsed_job_fields(salary_range, experience), posted)
+
+
+def generate_audit(rng, count, job_count, start_date):
+    """Yield Job_Audit rows (without keys) spread over two years."""
+    for _ in range(count):
+        low = rng.randint(40, 150)
+        modified = start_date + timedelta(seconds=rng.randint(0, 730 * 86400))
+        yield (rng.randint(1, job_count), 'UPDATE', f"${low}K-${low + 30}K",
+               f"${low + 5}K-${low + 40}K", modified.strftime("%Y-%m-%d %H:%M:%S"))
+
+
+def scale_counts(scale):
+    """Return the row counts generated for `scale` candidates."""
+    counts = {name: max(1, int(scale * ratio)) for name, ratio in SCALE_RATIOS.items()}
+    counts['candidates'] = scale
+    return counts
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def reset(connection):
+    """Delete every row from the generated tables."""
+    cursor = connection.cursor()
+    try:
+        for table in GENERATED_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def _insert_with_skills(connection, cursor, entity, table, key, columns, rows, batch_size, skill_cache):
+    """Insert rows in batches and link their Skills, like the bulk importer."""
+    placeholders = ", ".join(["%s"] * len(columns))
+    for batch in _batches(rows, batch_size):
+        cursor.execute(f"SELECT COALESCE(MAX({key}), 0) FROM {table}")
+        high_water = cursor.fetchone()[0]
+        cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", batch)
+        cursor.execute(f"SELECT {key}, Skills FROM {table} WHERE {key} > %s ORDER BY {key}", (high_water,))
+        skill_index.add_skill_links(cursor, entity, cursor.fetchall(), skill_cache)
+        connection.commit()
+
+
+def generate(connection, scale, seed=DEFAULT_SEED, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Load a reproducible data set of `scale` candidates into empty tables.
+
+    Returns the row counts written. The same seed and scale always produce
+    the same rows.
+    """
+    rng = random.Random(seed)
+    counts = scale_counts(scale)
+    start_date = START_DATE
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT COUNT(*) FROM Candidate")
+        if cursor.fetchone()[0]:
+            raise ValueError("Candidate already has rows; generate into an empty database (or reset it).")
+
+        recruiters = list(generate_recruiters(rng, counts['recruiters']))
+        for batch in _batches(recruiters, batch_size):
+            cursor.executemany("""
+                INSERT INTO Recruiter (ContactPerson, Contact, Company, CompanyProfile)
+                VALUES (%s, %s, %s, %s)
+            """, batch)
+        connection.commit()
+        if progress:
+            progress('recruiters', counts['recruiters'])
+
+        skill_cache = {}
+        _insert_with_skills(
+            connection, cursor, 'candidate', 'Candidate', 'CandidateId',
+            ['EdLevel', 'Gender', 'YearsCoded', 'Country', 'PreviousSalary', 'Skills'],
+            generate_candidates(rng, counts['candidates']), batch_size, skill_cache,
+        )
+        if progress:
+            progress('candidates', counts['candidates'])
+
+        _insert_with_skills(
+            connection, cursor, 'job', 'Job', 'JobId',
+            ['Location', 'Date', 'Experience', 'Skills', 'Title', 'ContactPerson', 'SalaryRange',
+             'SalaryMin', 'SalaryMax', 'MinExperienceYears', 'PostedDate'],
+            generate_jobs(rng, counts['jobs'], [row[0] for row in recruiters], start_date),
+            batch_size, skill_cache,
+        )
+        skill_demand.rebuild(connection)
+        skill_salary.rebuild(connection, batch_size)
+        recruiter_stats.rebuild(connection, batch_size)
+        if progress:
+            progress('jobs', counts['jobs'])
+
+        for batch in _batches(generate_audit(rng, counts['audit'], counts['jobs'], start_date), batch_size):
+            cursor.executemany("""
+                INSERT INTO Job_Audit (JobID, ActionType, OldSalaryRange, NewSalaryRange, ModifiedAt)
+                VALUES (%s, %s, %s, %s, %s)
+            """, batch)
+            connection.commit()
+        if progress:
+            progress('audit', counts['audit'])
+        return counts
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
@@ -0,0 +1,295 @@
+"""
+Database Connection Pool
+Process-wide, thread-safe pool of PyMySQL connections shared by every
+Streamlit session. Connection settings come from DB_CONFIG in config.py
+(falling back to config_template.py), overridden by TALENT_DB_* environment
+variables, and pool settings from POOL_CONFIG.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pymysql
+
+try:
+    import config as _config
+except ImportError:
+    import config_template as _config
+
+
+# Environment variables overriding DB_CONFIG keys (e.g. for containers and CI)
+ENV_OVERRIDES = {
+    'TALENT_DB_HOST': 'host',
+    'TALENT_DB_PORT': 'port',
+    'TALENT_DB_USER': 'user',
+    'TALENT_DB_PASSWORD': 'password',
+    'TALENT_DB_NAME': 'database',
+}
+
+
+def config_from_env(config, environ=os.environ):
+    """Return `config` with any TALENT_DB_* environment overrides applied."""
+    config = dict(config)
+    for variable, key in ENV_OVERRIDES.items():
+        if environ.get(variable):
+            config[key] = int(environ[variable]) if key == 'port' else environ[variable]
+    return config
+
+
+DB_CONFIG = config_from_env(_config.DB_CONFIG)
+
+# Defaults used when the config file has no POOL_CONFIG (or leaves keys out)
+DEFAULT_POOL_CONFIG = {
+    'max_size': 10,           # Maximum open connections
+    'idle_timeout': 300,      # Seconds before an idle connection is closed
+    'checkout_timeout': 10,   # Seconds to wait for a free connection
+}
+
+
+def get_config(name, defaults):
+    """Return the named settings dict from the config file merged over defaults."""
+    return {**defaults, **getattr(_config, name, {})}
+
+
+POOL_CONFIG = get_config('POOL_CONFIG', DEFAULT_POOL_CONFIG)
+
+# MySQL client errors meaning the server connection has been lost
+# (2006: server has gone away, 2013: lost connection during query)
+CONNECTION_LOST_ERRORS = {2006, 2013}
+
+# Rows fetched per round trip when streaming large results
+DEFAULT_BATCH_SIZE = 5000
+
+# Seconds within which any insert transaction commits or rolls back; AUTO_INCREMENT
+# keys older than this are taken to be settled (see KeyWatermark)
+COMMIT_SETTLE_SECONDS = 300
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes free within checkout_timeout."""
+
+
+class ConnectionPool:
+    """Bounded pool of reusable PyMySQL connections."""
+
+    def __init__(self, db_config, max_size=10, idle_timeout=300, checkout_timeout=10):
+        self.db_config = dict(db_config)
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._idle = deque()  # (connection, released_at) pairs, most recent last
+        self._size = 0        # Open connections, idle or checked out
+        self._cond = threading.Condition()
+        self._metrics = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'reconnects': 0,
+        }
+
+    def _connect(self):
+        connection = pymysql.connect(**self.db_config)
+        with self._cond:
+            self._metrics['created'] += 1
+        return connection
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass  # Already closed or the socket is dead
+        with self._cond:
+            self._size -= 1
+            self._metrics['closed'] += 1
+            self._cond.notify()
+
+    def _take_expired(self):
+        """Remove connections idle past idle_timeout; caller holds the lock."""
+        expired = []
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < cutoff:
+            expired.append(self._idle.popleft()[0])
+        return expired
+
+    def acquire(self):
+        """Check out a healthy connection, opening one if the pool has room."""
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        waited = False
+        connection = None
+        with self._cond:
+            while True:
+                expired = self._take_expired()
+                if expired:
+                    self._cond.release()
+                    try:
+                        for stale in expired:
+                            self._close(stale)
+                    finally:
+                        self._cond.acquire()
+                    continue
+                if self._idle:
+                    connection = self._idle.pop()[0]
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.checkout_timeout}s"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            waited_for = time.monotonic() - start
+            self._metrics['checkouts'] += 1
+            if waited:
+                self._metrics['waits'] += 1
+                self._metrics['wait_time'] += waited_for
+                self._metrics['max_wait_time'] = max(self._metrics['max_wait_time'], waited_for)
+
+        if connection is None:
+            try:
+                return self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+        return self._check_health(connection)
+
+    def _check_health(self, connection):
+        """Ping a pooled connection, reconnecting if the server dropped it."""
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except Exception:
+            pass
+        try:
+            connection.ping(reconnect=True)
+            with self._cond:
+                self._metrics['reconnects'] += 1
+            return connection
+        except Exception:
+            self._close(connection)
+            raise
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool, ending any open transaction."""
+        if not discard and connection.open:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+        else:
+            discard = True
+        if discard:
+            self._close(connection)
+            return
+        with self._cond:
+            self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and always returns it."""
+        connection = self.acquire()
+        discard = False
+        try:
+            yield connection
+        except pymysql.err.OperationalError as e:
+            discard = bool(e.args) and e.args[0] in CONNECTION_LOST_ERRORS
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    def stats(self):
+        """Return a snapshot of the pool metrics."""
+        with self._cond:
+            stats = dict(self._metrics)
+            stats['open'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+            stats['max_size'] = self.max_size
+        stats['avg_wait_time'] = stats['wait_time'] / stats['waits'] if stats['waits'] else 0.0
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+    return _pool
+
+
+def connection():
+    """Check out a connection from the process-wide pool (context manager)."""
+    return get_pool().connection()
+
+
+def iter_batches(connection, query, params=(), batch_size=DEFAULT_BATCH_SIZE):
+    """Yield (column_descriptions, rows) batches from an unbuffered server-side cursor.
+
+    An empty result still yields one empty batch so callers see the columns.
+    """
+    cursor = connection.cursor(pymysql.cursors.SSCursor)
+    try:
+        cursor.execute(query, params)
+        first = True
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows and not first:
+                break
+            first = False
+            yield cursor.description, rows
+    finally:
+        cursor.close()  # Drains any unread rows so the connection can be reused
+
+
+class KeyWatermark:
+    """Where an incremental reader of an AUTO_INCREMENT key resumes.
+
+    InnoDB hands out keys when a row is inserted, not when it commits, so a
+    long transaction (a bulk import batch) can commit keys below ones other
+    sessions committed earlier, and reading `key > max(loaded key)` would
+    skip those rows for good. Every key below the largest one loaded was
+    allocated before that read ended, so once `settle` seconds have passed
+    it has been committed (or rolled back) and any read begun since sees
+    it. `floor` therefore only moves up to the largest key loaded by a read
+    that ended at least `settle` seconds before the latest one began; the
+    keys above it are listed again by every refresh, which then reads the
+    rows of the ones it does not have yet (frames.unloaded_keys).
+    """
+
+    def __init__(self, settle=COMMIT_SETTLE_SECONDS):
+        self.settle = settle
+        self.floor = 0      # Every key up to here has been loaded
+        self._reads = []    # (monotonic end, largest key loaded) of the reads since
+
+    def begin(self):
+        """Return (floor, started): read the keys above `floor`, then pass `started` to loaded()."""
+        return self.floor, time.monotonic()
+
+    def loaded(self, started, largest):
+        """Record the end of a read begun at `started`, after which `largest` is the largest key loaded."""
+        settled = [key for at, key in self._reads if at <= started - self.settle]
+        if settled:
+            self.floor = max(self.floor, settled[-1])
+            self._reads = self._reads[len(settled):]
+        self._reads.append((time.monotonic(), largest))
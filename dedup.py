@@ -0,0 +1,594 @@
+"""
+Candidate Deduplication
+Candidate has no natural key, so the same person inserted twice (a
+resubmitted form, an overlapping vendor dump) is stored twice. Comparing
+every pair is quadratic; instead each candidate gets a MinHash signature
+of its skill set plus banded attributes (Country, EdLevel, YearsCoded in
+2-year bands, PreviousSalary in 10% bands), and the signature is cut into
+bands that are hashed into buckets (locality-sensitive hashing). Only
+candidates sharing a bucket in at least one band are compared, which
+finds pairs whose token sets are roughly half similar or more in
+near-linear time.
+
+Bucket-mates are then scored exactly: half skill Jaccard similarity,
+half the share of agreeing attributes among Country, EdLevel, Gender,
+YearsCoded (within a year) and PreviousSalary (within 10%). Pairs scoring at least
+`threshold` are recorded in CandidateDuplicate for an admin to merge or
+dismiss on the Duplicate Candidates page; dismissed pairs are never
+proposed again.
+
+The index lives in memory like the facet index: loaded once, extended by
+CandidateId watermark (new candidates are checked against everything
+before them); merged-away candidates are skipped until the next full
+reload. A candidate about to be
+added can be checked against it without touching the database.
+Candidates without skills are not indexed.
+"""
+
+import functools
+import threading
+import time
+import zlib
+
+import numpy as np
+
+import bulk_import
+import db
+import frames
+import query_cache
+import skills as skill_index
+
+
+DEFAULT_DEDUP_CONFIG = {
+    'num_perm': 64,     # MinHash permutations per signature
+    'bands': 16,        # LSH bands (num_perm / bands rows each); more bands find less similar pairs
+    'threshold': 0.85,  # Pair score from which candidates are proposed as duplicates
+    'max_bucket': 20,   # Buckets with more candidates are too generic to compare and are skipped
+    'ttl': 60,          # Seconds between checks for candidates added by other processes
+}
+DEDUP_CONFIG = db.get_config('DEDUP_CONFIG', DEFAULT_DEDUP_CONFIG)
+
+# Share of the pair score given to skill similarity; the rest is attribute agreement
+SKILL_WEIGHT = 0.5
+
+# Attribute tolerances when scoring a pair
+YEARS_TOLERANCE = 1
+SALARY_TOLERANCE = 0.1
+
+# Width of the YearsCoded bands and ratio between PreviousSalary bands in signatures
+YEARS_BAND = 2
+SALARY_BAND_RATIO = 1.1
+
+# Review states of a recorded pair
+PENDING = 'pending'
+MERGED = 'merged'
+DISMISSED = 'dismissed'
+
+# Candidate columns merged into the kept candidate when it has no value
+MERGED_COLUMNS = ['EdLevel', 'Gender', 'YearsCoded', 'Country', 'PreviousSalary']
+
+# MinHash permutations are (a * token + b) mod a Mersenne prime; tokens are reduced below it
+_PRIME = np.uint64((1 << 31) - 1)
+# Attribute tokens of one candidate at most (see attribute_tokens)
+_ATTRIBUTE_TOKENS = 4
+# Stand-in SkillIds of skills not in Skill yet, above any real one and below attribute tokens
+_UNKNOWN_SKILL = 1 << 29
+_SEED = 20240501
+
+
+def _text(value):
+    return " ".join(str(value).split()).casefold() if value not in (None, "") else None
+
+
+def _number(value):
+    return np.nan if value is None or value == "" else float(value)
+
+
+@functools.lru_cache(maxsize=65536)
+def _token(text):
+    # Offset past any SkillId so attribute tokens and skills cannot collide
+    return (1 << 30) | (zlib.crc32(text.encode()) & ((1 << 30) - 1))
+
+
+def attribute_tokens(country, ed_level, years_coded, previous_salary):
+    """Return the signature tokens of a candidate's attributes (ints below the hash prime)."""
+    tokens = []
+    for name, value in (('country', _text(country)), ('edlevel', _text(ed_level))):
+        if value is not None:
+            tokens.append(_token(f"{name}={value}"))
+    years = _number(years_coded)
+    if not np.isnan(years):
+        tokens.append(_token(f"years={int(years) // YEARS_BAND}"))
+    salary = _number(previous_salary)
+    if not np.isnan(salary) and salary > 0:
+        tokens.append(_token(f"salary={int(np.log(salary) / np.log(SALARY_BAND_RATIO))}"))
+    return tokens
+
+
+class Signatures:
+    """MinHash signatures and LSH band keys for a fixed number of permutations and bands."""
+
+    def __init__(self, num_perm=64, bands=16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        rng = np.random.default_rng(_SEED)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+        # Odd multipliers combining a band's rows into one 64-bit key (wrapping)
+        self._mix = rng.integers(1, 1 << 63, size=num_perm // bands, dtype=np.uint64) | np.uint64(1)
+
+    def band_keys(self, indptr, tokens):
+        """Return the (rows x bands) uint64 band keys of CSR token sets (every row non-empty)."""
+        starts = indptr[:-1]
+        tokens = tokens.astype(np.uint64) % _PRIME
+        signature = np.empty((len(starts), self.num_perm), dtype=np.uint64)
+        for i in range(self.num_perm):
+            signature[:, i] = np.minimum.reduceat((self._a[i] * tokens + self._b[i]) % _PRIME, starts)
+        rows = signature.reshape(len(starts), self.bands, -1)
+        return (rows * self._mix).sum(axis=2, dtype=np.uint64)
+
+
+def _within(left, right, tolerance, relative=False):
+    both_missing = np.isnan(left) & np.isnan(right)
+    limit = tolerance * np.fmax(np.abs(left), np.abs(right)) if relative else tolerance
+    with np.errstate(invalid='ignore'):
+        return both_missing | (np.abs(left - right) <= limit)
+
+
+class _State:
+    """One immutable snapshot of the index; refreshes build a new one."""
+
+    def __init__(self, ids, country, ed_level, gender, years, salary, indptr, skills, keys):
+        self.ids = ids                  # CandidateIds in load order (ascending unless some committed late)
+        self.country = country          # Codes of the case-folded text, -1 when unknown
+        self.ed_level = ed_level
+        self.gender = gender
+        self.years = years              # Floats, NaN when unknown
+        self.salary = salary
+        self.indptr = indptr            # CSR skill sets, SkillIds sorted within each row
+        self.skills = skills
+        self.keys = keys                # (bands x rows) band keys
+        self.order = np.argsort(keys, axis=1, kind='stable')
+        self.sorted_keys = np.take_along_axis(keys, self.order, axis=1)
+        self.link_keys = np.sort(np.repeat(np.arange(len(ids), dtype=np.int64), np.diff(indptr))
+                                 * (1 << 32) + skills)
+
+    @classmethod
+    def empty(cls, bands):
+        codes = np.zeros(0, dtype=np.int32)
+        return cls(np.zeros(0, dtype=np.int64), codes, codes, codes, np.zeros(0), np.zeros(0),
+                   np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros((bands, 0), dtype=np.uint64))
+
+    def appended(self, other):
+        if not len(other.ids):
+            return self
+        return _State(np.concatenate([self.ids, other.ids]), np.concatenate([self.country, other.country]),
+                      np.concatenate([self.ed_level, other.ed_level]), np.concatenate([self.gender, other.gender]),
+                      np.concatenate([self.years, other.years]), np.concatenate([self.salary, other.salary]),
+                      np.concatenate([self.indptr, other.indptr[1:] + self.indptr[-1]]),
+                      np.concatenate([self.skills, other.skills]), np.concatenate([self.keys, other.keys], axis=1))
+
+    def nbytes(self):
+        arrays = [self.ids, self.country, self.ed_level, self.gender, self.years, self.salary, self.indptr,
+                  self.skills, self.keys, self.order, self.sorted_keys, self.link_keys]
+        return sum(array.nbytes for array in arrays)
+
+    def bucket_pairs(self, max_bucket, since=0):
+        """Return (left, right) positions, left < right, sharing a bucket of at most `max_bucket` rows.
+
+        Only pairs whose right position is at least `since` are returned.
+        """
+        lefts, rights = [], []
+        for band, keys in enumerate(self.sorted_keys):
+            n = len(keys)
+            if n < 2:
+                continue
+            # Size of the bucket around every sorted row
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            sizes = np.diff(np.r_[starts, n])
+            size_of = np.repeat(sizes, sizes)
+            order = self.order[band]
+            for distance in range(1, max_bucket):
+                same = (keys[distance:] == keys[:-distance]) & (size_of[distance:] <= max_bucket)
+                if not same.any():
+                    break
+                first, second = order[:-distance][same], order[distance:][same]
+                low, high = np.minimum(first, second), np.maximum(first, second)
+                keep = high >= since
+                lefts.append(low[keep])
+                rights.append(high[keep])
+        if not lefts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        pairs = np.unique(np.concatenate(lefts) * (1 << 32) + np.concatenate(rights))
+        return pairs >> 32, pairs & ((1 << 32) - 1)
+
+    def scores(self, left, right, other=None):
+        """Return the score of every pair of positions `left` here and `right` in `other` (default: here)."""
+        other = self if other is None else other
+        if not len(left):
+            return np.zeros(0)
+        # Look every skill of the left row up among the right row's links
+        counts = np.diff(self.indptr)[left]
+        pair_of_link = np.repeat(np.arange(len(left)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        left_skills = self.skills[self.indptr[left][pair_of_link] + offsets]
+        wanted = right[pair_of_link] * (1 << 32) + left_skills
+        links = other.link_keys
+        found = np.searchsorted(links, wanted)
+        found = (found < len(links)) & (links[np.minimum(found, len(links) - 1)] == wanted)
+        shared = np.bincount(pair_of_link[found], minlength=len(left))
+        union = counts + np.diff(other.indptr)[right] - shared
+        skill_score = np.divide(shared, union, out=np.zeros(len(left)), where=union > 0)
+        agreement = ((self.country[left] == other.country[right]).astype(float)
+                     + (self.ed_level[left] == other.ed_level[right])
+                     + (self.gender[left] == other.gender[right])
+                     + _within(self.years[left], other.years[right], YEARS_TOLERANCE)
+                     + _within(self.salary[left], other.salary[right], SALARY_TOLERANCE, relative=True)) / 5
+        return SKILL_WEIGHT * skill_score + (1 - SKILL_WEIGHT) * agreement
+
+
+def _fetch(connection, query, params, convert, wanted=None):
+    """Stream a query into row-aligned column arrays, converting it a batch at a time.
+
+    `convert` turns a batch of rows into its list of arrays; with `wanted`,
+    only rows whose first column is in it are kept.
+    """
+    chunks = []
+    for _, batch in db.iter_batches(connection, query, params):
+        if not batch:
+            continue
+        columns = convert(batch)
+        if wanted is not None:
+            keep = np.isin(columns[0], wanted)
+            columns = [column[keep] for column in columns]
+        chunks.append(columns)
+    if not chunks:
+        return convert([])
+    return [np.concatenate(parts) for parts in zip(*chunks)]
+
+
+def _link_columns(rows):
+    return [np.array([row[0] for row in rows], dtype=np.int64), np.array([row[1] for row in rows], dtype=np.int64)]
+
+
+class DedupIndex:
+    """MinHash/LSH index over candidates with exact pair scoring."""
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.85, max_bucket=20, ttl=60):
+        self.signatures = Signatures(num_perm, bands)
+        self.threshold = threshold
+        self.max_bucket = max_bucket
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state = _State.empty(bands)
+        self._skill_ids = {}  # Normalized skill name -> SkillId, for checking unsaved candidates
+        self._text_codes = {}  # Case-folded Country / EdLevel / Gender -> code
+        self._removed = set()  # Merged-away CandidateIds still in the state, until a full refresh
+        self._watermark = db.KeyWatermark()
+        self._skill_watermark = db.KeyWatermark()
+        self._versions = None
+        self._checked_at = 0.0
+        self.loaded = False
+        self._loader = None
+
+    def _codes(self, values, add=True):
+        """Return int32 codes of case-folded texts (-1 for none); unseen texts get new codes
+        unless `add` is false, when they get -2 and match nothing."""
+        codes = []
+        for value in values:
+            text = _text(value)
+            if text is None:
+                codes.append(-1)
+            elif text in self._text_codes:
+                codes.append(self._text_codes[text])
+            elif add:
+                codes.append(self._text_codes.setdefault(text, len(self._text_codes)))
+            else:
+                codes.append(-2)
+        return np.array(codes, dtype=np.int32)
+
+    def _columns(self, candidates, add=True):
+        """Convert (CandidateId, Country, EdLevel, Gender, YearsCoded, PreviousSalary) rows to arrays:
+        ids, the three text codes, YearsCoded, PreviousSalary and a (rows x 4) matrix of attribute
+        tokens padded with -1."""
+        tokens = np.full((len(candidates), _ATTRIBUTE_TOKENS), -1, dtype=np.int64)
+        for position, row in enumerate(candidates):
+            found = attribute_tokens(row[1], row[2], row[4], row[5])
+            tokens[position, :len(found)] = found
+        return [
+            np.array([row[0] for row in candidates], dtype=np.int64),
+            self._codes([row[1] for row in candidates], add), self._codes([row[2] for row in candidates], add),
+            self._codes([row[3] for row in candidates], add),
+            np.array([_number(row[4]) for row in candidates], dtype=np.float64),
+            np.array([_number(row[5]) for row in candidates], dtype=np.float64),
+            tokens,
+        ]
+
+    def _build(self, columns, link_ids, link_skills):
+        """Build a state from _columns() arrays (ascending CandidateIds) and (CandidateId, SkillId)
+        link arrays, keeping the candidates with skills."""
+        ids = columns[0]
+        positions = np.searchsorted(ids, link_ids)
+        found = (positions < len(ids)) & (ids[np.minimum(positions, max(len(ids) - 1, 0))] == link_ids)
+        has_skills = np.zeros(len(ids), dtype=bool)
+        has_skills[positions[found]] = True
+        if not has_skills.any():
+            return _State.empty(self.signatures.bands)
+        ids, country, ed_level, gender, years, salary, attributes = [column[has_skills] for column in columns]
+        # Skill sets (CSR, sorted and unique per row) over the kept candidates
+        renumber = np.cumsum(has_skills) - 1
+        pairs = np.unique(renumber[positions[found]] * (1 << 32) + link_skills[found])
+        rows, skills = pairs >> 32, pairs & ((1 << 32) - 1)
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(ids)), out=indptr[1:])
+        # Signature tokens: the skills plus the banded attributes, grouped by row
+        attribute_rows, slots = np.nonzero(attributes >= 0)
+        token_rows = np.concatenate([rows, attribute_rows])
+        tokens = np.concatenate([skills, attributes[attribute_rows, slots]])
+        order = np.argsort(token_rows, kind='stable')
+        token_indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(token_rows, minlength=len(ids)), out=token_indptr[1:])
+        keys = self.signatures.band_keys(token_indptr, tokens[order])
+        return _State(ids, country, ed_level, gender, years, salary, indptr, skills, keys.T.copy())
+
+    def _with_new_skills(self, connection, skill_ids):
+        """Return a copy of a name -> SkillId lookup with the Skill rows it does not have added."""
+        skill_ids = dict(skill_ids)
+        floor, started = self._skill_watermark.begin()
+        for _, batch in db.iter_batches(connection, "SELECT SkillId, Name FROM Skill WHERE SkillId > %s", (floor,)):
+            for skill_id, name in batch:
+                skill_ids[name] = skill_id
+        self._skill_watermark.loaded(started, max(skill_ids.values(), default=0))
+        return skill_ids
+
+    def refresh(self, connection, full=False):
+        """Load everything on first use (or when `full`), then only candidates added since.
+
+        Returns the likely duplicate pairs involving the newly loaded
+        candidates: [(CandidateId, DuplicateOf, score)], DuplicateOf the older.
+        """
+        with self._lock:
+            versions = query_cache.get_cache().versions(('Candidate',))
+            state, skill_ids = self._state, self._skill_ids
+            if full or not self.loaded:
+                state, skill_ids = _State.empty(self.signatures.bands), {}
+                self._removed = set()
+                self._watermark = db.KeyWatermark()
+                self._skill_watermark = db.KeyWatermark()
+            floor, started = self._watermark.begin()
+            wanted = None
+            if len(state.ids):
+                # Candidates without skills are not indexed, so only those with skill links are listed
+                wanted = frames.unloaded_keys(
+                    connection, "SELECT DISTINCT CandidateId FROM CandidateSkill WHERE CandidateId > %s",
+                    floor, state.ids[state.ids > floor])
+            since = len(state.ids)
+            if wanted is None or len(wanted):
+                # Missing candidates are usually the newest, so read from the lowest of them
+                after = int(wanted[0]) - 1 if wanted is not None else floor
+                candidates = _fetch(connection, """
+                    SELECT CandidateId, Country, EdLevel, Gender, YearsCoded, PreviousSalary
+                    FROM Candidate WHERE CandidateId > %s ORDER BY CandidateId
+                """, (after,), self._columns, wanted)
+                links = _fetch(connection, """
+                    SELECT CandidateId, SkillId FROM CandidateSkill
+                    WHERE CandidateId > %s ORDER BY CandidateId
+                """, (after,), _link_columns, wanted)
+                state = state.appended(self._build(candidates, *links))
+            self._watermark.loaded(started, int(state.ids.max()) if len(state.ids) else 0)
+            self._skill_ids = self._with_new_skills(connection, skill_ids)
+            left, right = state.bucket_pairs(self.max_bucket, since)
+            scores = state.scores(left, right)
+            likely = scores >= self.threshold
+            self._state = state
+            self._versions = versions
+            self._checked_at = time.monotonic()
+            self.loaded = True
+            # Late-committed candidates sit after newer ones, so order each pair by CandidateId
+            pairs = [(max(first, second), min(first, second), round(float(score), 3)) for first, second, score
+                     in zip(state.ids[right[likely]].tolist(), state.ids[left[likely]].tolist(), scores[likely])]
+            return [pair for pair in pairs if pair[1] not in self._removed]
+
+    def forget(self, candidate_id):
+        """Stop proposing a deleted candidate (it leaves the state on the next full refresh)."""
+        with self._lock:
+            self._removed.add(candidate_id)
+
+    def refresh_if_stale(self, connection):
+        """Refresh when a Candidate write was recorded or the TTL has passed since the last check."""
+        if (not self.loaded or time.monotonic() - self._checked_at >= self.ttl
+                or query_cache.get_cache().versions(('Candidate',)) != self._versions):
+            return self.refresh(connection)
+        return []
+
+    def find_similar(self, country, ed_level, gender, years_coded, previous_salary, skills, limit=5):
+        """Return [(CandidateId, score)] of indexed candidates likely to be this (unsaved) one, best first."""
+        state = self._state
+        names = skill_index.normalize_skills(skills)
+        if not names or not len(state.ids):
+            return []
+        # Skills not in Skill yet match nobody but still count towards the union
+        skill_ids = [self._skill_ids.get(name, _UNKNOWN_SKILL + position) for position, name in enumerate(names)]
+        probe = self._build(self._columns([(0, country, ed_level, gender, years_coded, previous_salary)], add=False),
+                            np.zeros(len(skill_ids), dtype=np.int64), np.array(skill_ids, dtype=np.int64))
+        matches = set()
+        for band in range(self.signatures.bands):
+            keys = state.sorted_keys[band]
+            low, high = np.searchsorted(keys, probe.keys[band, 0]), np.searchsorted(keys, probe.keys[band, 0], 'right')
+            if 0 < high - low <= self.max_bucket:
+                matches.update(state.order[band][low:high].tolist())
+        if not matches:
+            return []
+        left = np.array(sorted(matches), dtype=np.int64)
+        scores = state.scores(left, np.zeros(len(left), dtype=np.int64), probe)
+        ranked = sorted(zip(scores.tolist(), state.ids[left].tolist()), reverse=True)
+        return [(candidate_id, round(score, 3)) for score, candidate_id in ranked
+                if score >= self.threshold and candidate_id not in self._removed][:limit]
+
+    def stats(self):
+        """Return indexed candidates, bucket sizes and memory use."""
+        state = self._state
+        largest = 0
+        for keys in state.sorted_keys:
+            if len(keys):
+                starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+                largest = max(largest, int(np.diff(np.r_[starts, len(keys)]).max()))
+        return {
+            'candidates': len(state.ids) - len(self._removed),
+            'bands': self.signatures.bands,
+            'rows_per_band': self.signatures.num_perm // self.signatures.bands,
+            'largest_bucket': largest,
+            'memory_mb': round(state.nbytes() / 1e6, 2),
+        }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Return the process-wide dedup index, creating it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DedupIndex(**DEDUP_CONFIG)
+    return _index
+
+
+def load_in_background(backend):
+    """Start loading the dedup index from `backend` on a daemon thread, once per process."""
+    index = get_index()
+    with _index_lock:
+        if index.loaded or index._loader is not None:
+            return
+
+        def load():
+            with backend.connection() as connection:
+                record_pairs(connection, index.refresh(connection))
+        index._loader = threading.Thread(target=load, name="dedup-index-load", daemon=True)
+        index._loader.start()
+
+
+def record_pairs(connection, pairs):
+    """Store newly found pairs for review and commit; pairs already recorded keep their state."""
+    if not pairs:
+        return 0
+    cursor = connection.cursor()
+    try:
+        cursor.executemany(
+            "INSERT IGNORE INTO CandidateDuplicate (CandidateId, DuplicateOf, Score) VALUES (%s, %s, %s)", pairs
+        )
+        connection.commit()
+    finally:
+        cursor.close()
+    return len(pairs)
+
+
+def scan(connection, full=False):
+    """Refresh the index and record the likely duplicates it found; returns their number."""
+    return record_pairs(connection, get_index().refresh(connection, full=full))
+
+
+PAIR_COLUMNS = ['CandidateId', 'DuplicateOf', 'Score', 'DetectedAt']
+CANDIDATE_COLUMNS = ['CandidateId', 'EdLevel', 'Gender', 'YearsCoded', 'Country', 'PreviousSalary', 'Skills']
+
+
+def pending_pairs(cursor, limit=20):
+    """Return up to `limit` pairs awaiting review, highest score first, as dicts.
+
+    Each pair carries the two candidates' rows under 'candidate' and 'duplicate_of'.
+    """
+    cursor.execute(f"""
+        SELECT {', '.join(PAIR_COLUMNS)} FROM CandidateDuplicate
+        WHERE Status = %s ORDER BY Score DESC, CandidateId, DuplicateOf LIMIT %s
+    """, (PENDING, limit))
+    pairs = [dict(zip(PAIR_COLUMNS, row)) for row in cursor.fetchall()]
+    ids = sorted({pair[key] for pair in pairs for key in ('CandidateId', 'DuplicateOf')})
+    candidates = {}
+    if ids:
+        cursor.execute(f"SELECT {', '.join(CANDIDATE_COLUMNS)} FROM Candidate "
+                       f"WHERE CandidateId IN ({', '.join(['%s'] * len(ids))})", ids)
+        candidates = {row[0]: dict(zip(CANDIDATE_COLUMNS, row)) for row in cursor.fetchall()}
+    for pair in pairs:
+        pair['candidate'] = candidates.get(pair['CandidateId'])
+        pair['duplicate_of'] = candidates.get(pair['DuplicateOf'])
+    return pairs
+
+
+def count_pending(cursor):
+    """Return the number of pairs awaiting review."""
+    cursor.execute("SELECT COUNT(*) FROM CandidateDuplicate WHERE Status = %s", (PENDING,))
+    return cursor.fetchone()[0]
+
+
+def _review(cursor, candidate_id, duplicate_of, status):
+    cursor.execute("""
+        UPDATE CandidateDuplicate SET Status = %s, ReviewedAt = CURRENT_TIMESTAMP
+        WHERE CandidateId = %s AND DuplicateOf = %s
+    """, (status, candidate_id, duplicate_of))
+
+
+def dismiss(connection, candidate_id, duplicate_of):
+    """Mark a pair as not duplicates, so it is not proposed again, and commit."""
+    cursor = connection.cursor()
+    try:
+        _review(cursor, candidate_id, duplicate_of, DISMISSED)
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def merge(connection, candidate_id, duplicate_of):
+    """Fold `candidate_id` into the older `duplicate_of` and delete it, in one transaction.
+
+    The kept candidate gets the other's attributes where it has none and
+    the union of both skill sets. Pending pairs of the deleted candidate
+    are moved to the kept one. The dedup index stops proposing the deleted
+    candidate; other in-memory candidate indexes drop it on a full reload.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT {', '.join(CANDIDATE_COLUMNS)} FROM Candidate WHERE CandidateId IN (%s, %s)",
+                       (candidate_id, duplicate_of))
+        rows = {row[0]: row for row in cursor.fetchall()}
+        if candidate_id not in rows or duplicate_of not in rows:
+            raise ValueError(f"Candidate {candidate_id if candidate_id not in rows else duplicate_of} "
+                             "no longer exists.")
+        keep, drop = rows[duplicate_of], rows[candidate_id]
+        values = [kept if kept not in (None, "") else dropped for kept, dropped in zip(keep[1:6], drop[1:6])]
+        merged_skills = bulk_import.normalize_skills_text(", ".join(filter(None, [keep[6], drop[6]])))
+        cursor.execute(f"""
+            UPDATE Candidate SET {', '.join(f'{column} = %s' for column in MERGED_COLUMNS)}, Skills = %s
+            WHERE CandidateId = %s
+        """, (*values, merged_skills, duplicate_of))
+        skill_index.sync_skills(cursor, 'candidate', duplicate_of, merged_skills)
+        cursor.execute("DELETE FROM CandidateSkill WHERE CandidateId = %s", (candidate_id,))
+        cursor.execute("DELETE FROM Candidate WHERE CandidateId = %s", (candidate_id,))
+        _review(cursor, candidate_id, duplicate_of, MERGED)
+
+        # Other pairs of the deleted candidate now concern the kept one
+        cursor.execute("""
+            SELECT CandidateId, DuplicateOf, Score FROM CandidateDuplicate
+            WHERE Status = %s AND (CandidateId = %s OR DuplicateOf = %s)
+        """, (PENDING, candidate_id, candidate_id))
+        moved = []
+        for first, second, score in cursor.fetchall():
+            other = second if first == candidate_id else first
+            if other != duplicate_of:
+                moved.append((max(other, duplicate_of), min(other, duplicate_of), score))
+        cursor.execute("DELETE FROM CandidateDuplicate WHERE Status = %s AND (CandidateId = %s OR DuplicateOf = %s)",
+                       (PENDING, candidate_id, candidate_id))
+        if moved:
+            cursor.executemany("INSERT IGNORE INTO CandidateDuplicate (CandidateId, DuplicateOf, Score) "
+                               "VALUES (%s, %s, %s)", moved)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    get_index().forget(candidate_id)
+    query_cache.invalidate('Candidate')
@@ -0,0 +1,167 @@
+"""
+Streaming Export
+Writes query results to CSV (or Parquet when pyarrow is installed) batch
+by batch from an unbuffered server-side cursor, so memory use stays
+constant no matter how many rows the query returns. A browser download
+holds the whole file in the Streamlit server's memory, so dashboard
+exports stop once the file passes EXPORT_CONFIG['max_download_mb'].
+"""
+
+import csv
+import datetime
+import decimal
+import os
+import tempfile
+
+from pymysql.constants import FIELD_TYPE
+
+import db
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+DEFAULT_BATCH_SIZE = db.DEFAULT_BATCH_SIZE
+
+DEFAULT_EXPORT_CONFIG = {
+    'max_download_mb': 200,  # Largest export offered as a browser download
+}
+EXPORT_CONFIG = db.get_config('EXPORT_CONFIG', DEFAULT_EXPORT_CONFIG)
+
+# MIME type and file extension per export format
+FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+}
+
+# Whole-table exports, ordered by primary key
+TABLE_EXPORTS = {
+    'Candidate': """
+        SELECT CandidateId, EdLevel, Gender, YearsCoded, Country, PreviousSalary, Skills
+        FROM Candidate ORDER BY CandidateId
+    """,
+    'Job': """
+        SELECT JobId, Title, Location, Date, Experience, Skills, ContactPerson,
+               SalaryRange, SalaryMin, SalaryMax, MinExperienceYears, PostedDate
+        FROM Job ORDER BY JobId
+    """,
+    'Job_Audit': """
+        SELECT AuditID, JobID, ActionType, OldSalaryRange, NewSalaryRange, ModifiedAt
+        FROM Job_Audit ORDER BY AuditID
+    """,
+}
+
+_INTEGER_TYPES = {FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG,
+                  FIELD_TYPE.LONGLONG, FIELD_TYPE.INT24, FIELD_TYPE.YEAR}
+_FLOAT_TYPES = {FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE, FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+_TIMESTAMP_TYPES = {FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP}
+
+
+class ExportTooLargeError(Exception):
+    """Raised when an export's file grows past its `max_bytes`."""
+
+
+def available_formats():
+    """Return the export formats usable in this environment."""
+    return ['csv', 'parquet'] if pa is not None else ['csv']
+
+
+def _arrow_type(type_code):
+    if type_code in _INTEGER_TYPES:
+        return pa.int64()
+    if type_code in _FLOAT_TYPES:
+        return pa.float64()
+    if type_code in _TIMESTAMP_TYPES:
+        return pa.timestamp('us')
+    if type_code == FIELD_TYPE.DATE:
+        return pa.date32()
+    return pa.string()
+
+
+def _arrow_value(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', errors='replace')
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    return value
+
+
+def _write_csv(batches, path, progress):
+    written = 0
+    header = False
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        for description, rows in batches:
+            if not header:
+                writer.writerow([column[0] for column in description])
+                header = True
+            writer.writerows(rows)
+            written += len(rows)
+            if progress:
+                progress(written)
+    return written
+
+
+def _write_parquet(batches, path, progress):
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow).")
+    written = 0
+    writer = None
+    try:
+        for description, rows in batches:
+            if writer is None:
+                schema = pa.schema([(column[0], _arrow_type(column[1])) for column in description])
+                writer = pq.ParquetWriter(path, schema)
+            columns = list(zip(*rows)) or [()] * len(schema)
+            arrays = [
+                pa.array([_arrow_value(value) for value in values], type=field.type)
+                for values, field in zip(columns, schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            written += len(rows)
+            if progress:
+                progress(written)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def export_query(connection, query, params=(), path=None, fmt='csv',
+                 batch_size=DEFAULT_BATCH_SIZE, progress=None, max_bytes=None):
+    """Stream a query's result into a CSV or Parquet file.
+
+    Writes to `path`, or to a new temporary file when it is None, calls
+    `progress(rows_written)` after every batch and returns (path, rows).
+    With `max_bytes`, stops and removes the file with ExportTooLargeError
+    once it grows past that size.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if path is None:
+        handle, path = tempfile.mkstemp(prefix="talent_export_", suffix=FORMATS[fmt][1])
+        os.close(handle)
+
+    def written(rows):
+        if max_bytes is not None and os.path.getsize(path) > max_bytes:
+            raise ExportTooLargeError(f"The export grew past {max_bytes:,} bytes after {rows:,} rows.")
+        if progress:
+            progress(rows)
+
+    batches = db.iter_batches(connection, query, params, batch_size)
+    try:
+        if fmt == 'parquet':
+            rows = _write_parquet(batches, path, written)
+        else:
+            rows = _write_csv(batches, path, written)
+    except Exception:
+        batches.close()
+        os.remove(path)
+        raise
+    return path, rows
@@ -0,0 +1,380 @@
+"""
+Candidate Facets
+In-process facet index over Candidate: one compressed bitmap of row
+positions per value of Country, EdLevel, Gender, YearsCoded bucket,
+PreviousSalary band and skill. Bitmaps are roaring-style: rows are split
+into chunks of 65536 and each chunk holds either a sorted uint16 offset
+array (sparse values) or an 8 KB packed bit array (dense values), so any
+combination of selected values, and the count next to every facet value,
+is a handful of NumPy ANDs and popcounts.
+
+Values selected within a facet are OR-ed and facets are AND-ed; skills can
+instead require every selected skill. A facet's counts ignore its own
+selection (except for skills matched with 'all'), so they show what
+choosing another value would return. The index is loaded once, extended
+by CandidateId watermark as candidates are added, and keeps at most
+max_values values per facet so its memory stays bounded; edits to existing
+candidates need a full reload.
+"""
+
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import db
+import frames
+import query_cache
+import salary_analytics
+
+
+DEFAULT_FACET_CONFIG = {
+    'max_values': 500,  # Values indexed per facet, most frequent first
+    'ttl': 60,          # Seconds between checks for candidates added by other processes
+}
+FACET_CONFIG = db.get_config('FACET_CONFIG', DEFAULT_FACET_CONFIG)
+
+# facet -> label shown on the dashboard
+FACETS = {
+    'Country': "Country",
+    'EdLevel': "Education Level",
+    'Gender': "Gender",
+    'Experience': "Years Coded",
+    'Salary': "Previous Salary",
+    'Skill': "Skills",
+}
+
+# Lower bounds of the PreviousSalary bands; the last band is open-ended
+SALARY_BANDS = (0, 25_000, 50_000, 75_000, 100_000, 150_000, 200_000)
+
+# Value of rows with no EdLevel, Country, YearsCoded, ... recorded
+UNKNOWN = "Unknown"
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+# Chunks with more members than this store a packed bit array instead of offsets
+ARRAY_LIMIT = 4096
+
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def salary_band_labels():
+    """Return the label of every PreviousSalary band, e.g. "$25K-$50K" and "$200K+"."""
+    bounds = SALARY_BANDS
+    return ([f"${low // 1000}K-${high // 1000}K" for low, high in zip(bounds, bounds[1:])]
+            + [f"${bounds[-1] // 1000}K+"])
+
+
+def _container(offsets):
+    """Store one chunk's sorted uint16 offsets as an array, or as packed bits when dense."""
+    if len(offsets) <= ARRAY_LIMIT:
+        return offsets
+    bits = np.zeros(CHUNK_SIZE, dtype=bool)
+    bits[offsets] = True
+    return np.packbits(bits)
+
+
+def _offsets(container):
+    if container.dtype == np.uint8:
+        return np.flatnonzero(np.unpackbits(container)).astype(np.uint16)
+    return container
+
+
+class Selection:
+    """A row mask with its packed per-chunk form, for counting bitmaps against it."""
+
+    def __init__(self, mask):
+        self.mask = mask
+        padded = np.zeros(-(-len(mask) // CHUNK_SIZE) * CHUNK_SIZE, dtype=bool)
+        padded[:len(mask)] = mask
+        self.packed = np.packbits(padded).reshape(-1, CHUNK_SIZE // 8)
+
+
+class Bitmap:
+    """Immutable compressed set of row positions: chunk number -> container."""
+
+    __slots__ = ('containers',)
+
+    def __init__(self, containers=None):
+        self.containers = containers or {}
+
+    @classmethod
+    def from_positions(cls, positions):
+        """Build from sorted row positions."""
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return cls()
+        chunks = positions >> CHUNK_BITS
+        parts = np.split(positions, np.flatnonzero(np.diff(chunks)) + 1)
+        return cls({int(part[0] >> CHUNK_BITS): _container((part & (CHUNK_SIZE - 1)).astype(np.uint16))
+                    for part in parts})
+
+    def union(self, other):
+        """Return a bitmap with the positions of both; chunks only in one are shared, not copied."""
+        containers = dict(self.containers)
+        for chunk, container in other.containers.items():
+            if chunk in containers:
+                container = _container(np.union1d(_offsets(containers[chunk]), _offsets(container)))
+            containers[chunk] = container
+        return Bitmap(containers)
+
+    def __len__(self):
+        return int(sum(_POPCOUNT[container].sum() if container.dtype == np.uint8 else len(container)
+                       for container in self.containers.values()))
+
+    def to_mask(self, size):
+        """Return a bool array of `size` rows, True at the bitmap's positions."""
+        mask = np.zeros(-(-size // CHUNK_SIZE) * CHUNK_SIZE, dtype=bool)
+        for chunk, container in self.containers.items():
+            start = chunk << CHUNK_BITS
+            if container.dtype == np.uint8:
+                mask[start:start + CHUNK_SIZE] = np.unpackbits(container).astype(bool)
+            else:
+                mask[start + container.astype(np.int64)] = True
+        return mask[:size]
+
+    def count_in(self, selection):
+        """Count the positions that are also in a Selection."""
+        total = 0
+        for chunk, container in self.containers.items():
+            if container.dtype == np.uint8:
+                total += int(_POPCOUNT[container & selection.packed[chunk]].sum())
+            else:
+                total += int(np.count_nonzero(selection.mask[(chunk << CHUNK_BITS) + container.astype(np.int64)]))
+        return total
+
+    @property
+    def nbytes(self):
+        return sum(container.nbytes for container in self.containers.values())
+
+
+_CANDIDATE_COLUMNS = ['CandidateId', 'Country', 'EdLevel', 'Gender', 'YearsCoded', 'PreviousSalary']
+
+
+def _load(connection, query, params, columns, batch_size):
+    frames = [pd.DataFrame.from_records(rows, columns=columns)
+              for _, rows in db.iter_batches(connection, query, params, batch_size=batch_size) if rows]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def _group_positions(values, positions):
+    """Return [(value, sorted positions)] for parallel value/position arrays, most frequent first."""
+    if not len(values):
+        return []
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    groups = [(uniques[i], np.sort(positions[order[bounds[i]:bounds[i + 1]]])) for i in range(len(uniques))]
+    return sorted(groups, key=lambda group: -len(group[1]))
+
+
+def facet_values(candidates, links, offset):
+    """Return {facet: [(value, positions)]} for newly loaded candidate and skill link rows.
+
+    Positions start at `offset`, in the order of `candidates` (ascending CandidateId).
+    """
+    positions = offset + np.arange(len(candidates), dtype=np.int64)
+    experience = pd.cut(pd.to_numeric(candidates['YearsCoded']), [*salary_analytics.EXPERIENCE_BUCKETS, np.inf],
+                        right=False, labels=salary_analytics.experience_labels())
+    salary = pd.cut(pd.to_numeric(candidates['PreviousSalary']), [*SALARY_BANDS, np.inf],
+                    right=False, labels=salary_band_labels())
+    link_rows = pd.Index(candidates['CandidateId']).get_indexer(links['CandidateId'])
+    linked = link_rows >= 0
+    return {
+        'Country': _group_positions(candidates['Country'].fillna(UNKNOWN).to_numpy(), positions),
+        'EdLevel': _group_positions(candidates['EdLevel'].fillna(UNKNOWN).to_numpy(), positions),
+        'Gender': _group_positions(candidates['Gender'].fillna(UNKNOWN).to_numpy(), positions),
+        'Experience': _group_positions(experience.astype(object).fillna(UNKNOWN).to_numpy(), positions),
+        'Salary': _group_positions(salary.astype(object).fillna(UNKNOWN).to_numpy(), positions),
+        'Skill': _group_positions(links['Name'].to_numpy()[linked], positions[link_rows[linked]]),
+    }
+
+
+class FacetIndex:
+    """Bitmaps per facet value over all candidates, with combined filtering and counts."""
+
+    def __init__(self, max_values=500, ttl=60):
+        self.max_values = max_values
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Replaced as a whole on refresh so readers always see a consistent snapshot
+        # (CandidateIds by row position, {facet: {value: Bitmap}}, whether the ids are ascending)
+        self._state = (np.zeros(0, dtype=np.int64), {name: {} for name in FACETS}, True)
+        self._watermark = db.KeyWatermark()
+        self._dropped = Counter()
+        self._versions = None
+        self._checked_at = 0.0
+        self.loaded = False
+        self._loader = None
+
+    @property
+    def ids(self):
+        """CandidateIds in row position order (ascending unless some committed late)."""
+        return self._state[0]
+
+    def refresh(self, connection, full=False, batch_size=db.DEFAULT_BATCH_SIZE):
+        """Load everything on first use (or when `full`), then only candidates added since.
+
+        Candidates whose import committed after later CandidateIds were
+        loaded are picked up too (see db.KeyWatermark); they are appended, so
+        row positions are then no longer in CandidateId order.
+        """
+        with self._lock:
+            versions = query_cache.get_cache().versions(('Candidate',))
+            ids, facets, ordered = self._state
+            if full or not self.loaded:
+                ids, facets, ordered = np.zeros(0, dtype=np.int64), {name: {} for name in FACETS}, True
+                self._dropped = Counter()
+                self._watermark = db.KeyWatermark()
+            floor, started = self._watermark.begin()
+            wanted = None
+            if len(ids):
+                wanted = frames.unloaded_keys(connection, "SELECT CandidateId FROM Candidate WHERE CandidateId > %s",
+                                              floor, ids[ids > floor])
+            candidates, links = self._load_new(connection, floor, wanted, batch_size)
+            if len(candidates):
+                facets = {name: dict(values) for name, values in facets.items()}
+                for name, groups in facet_values(candidates, links, len(ids)).items():
+                    bitmaps = facets[name]
+                    for value, positions in groups:
+                        if value in bitmaps:
+                            bitmaps[value] = bitmaps[value].union(Bitmap.from_positions(positions))
+                        elif len(bitmaps) < self.max_values:
+                            bitmaps[value] = Bitmap.from_positions(positions)
+                        else:
+                            self._dropped[name] += 1
+                new_ids = candidates['CandidateId'].to_numpy(dtype=np.int64)
+                ordered = ordered and (not len(ids) or new_ids[0] > ids[-1])
+                ids = np.concatenate([ids, new_ids])
+            self._watermark.loaded(started, int(ids.max()) if len(ids) else 0)
+            self._state = (ids, facets, ordered)
+            self._versions = versions
+            self._checked_at = time.monotonic()
+            self.loaded = True
+            return len(candidates)
+
+    @staticmethod
+    def _load_new(connection, floor, wanted, batch_size):
+        """Return the candidate and skill link rows above `floor`, or only those of the `wanted` CandidateIds."""
+        if wanted is not None and not len(wanted):
+            return pd.DataFrame(columns=_CANDIDATE_COLUMNS), pd.DataFrame(columns=['CandidateId', 'Name'])
+        # Missing candidates are usually the newest, so read from the lowest of them
+        after = int(wanted[0]) - 1 if wanted is not None else floor
+        candidates = _load(connection, """
+            SELECT CandidateId, Country, EdLevel, Gender, YearsCoded, PreviousSalary
+            FROM Candidate WHERE CandidateId > %s ORDER BY CandidateId
+        """, (after,), _CANDIDATE_COLUMNS, batch_size)
+        links = _load(connection, """
+            SELECT cs.CandidateId, s.Name
+            FROM CandidateSkill cs
+            JOIN Skill s ON s.SkillId = cs.SkillId
+            WHERE cs.CandidateId > %s
+        """, (after,), ['CandidateId', 'Name'], batch_size)
+        if wanted is not None:
+            candidates = candidates[candidates['CandidateId'].isin(wanted)].reset_index(drop=True)
+            links = links[links['CandidateId'].isin(wanted)].reset_index(drop=True)
+        return candidates, links
+
+    def refresh_if_stale(self, connection):
+        """Refresh when a Candidate write was recorded or the TTL has passed since the last check."""
+        if (not self.loaded or time.monotonic() - self._checked_at >= self.ttl
+                or query_cache.get_cache().versions(('Candidate',)) != self._versions):
+            return self.refresh(connection)
+        return 0
+
+    def values(self, facet):
+        """Return a facet's indexed values, most candidates first."""
+        bitmaps = self._state[1][facet]
+        return sorted(bitmaps, key=lambda value: (-len(bitmaps[value]), str(value)))
+
+    def query(self, selected, skill_match='all'):
+        """Return (matching CandidateIds ascending, {facet: {value: count}}) for selected facet values.
+
+        `selected` maps facet names to lists of values; facets left out or
+        empty do not filter.
+        """
+        if skill_match not in ('any', 'all'):
+            raise ValueError(f"Unknown skill match mode: {skill_match}")
+        ids, facets, ordered = self._state
+        size = len(ids)
+        conjunctive = {'Skill'} if skill_match == 'all' else set()
+        masks = {}
+        for name, values in selected.items():
+            if not values:
+                continue
+            bitmaps = facets[name]
+            if name in conjunctive:
+                mask = np.ones(size, dtype=bool)
+                for value in values:
+                    # A required value that is not indexed matches nobody
+                    mask &= bitmaps[value].to_mask(size) if value in bitmaps else False
+            else:
+                mask = np.zeros(size, dtype=bool)
+                for value in values:
+                    if value in bitmaps:
+                        mask |= bitmaps[value].to_mask(size)
+            masks[name] = mask
+
+        everything = np.ones(size, dtype=bool)
+        for mask in masks.values():
+            everything &= mask
+        counts = {}
+        for name, bitmaps in facets.items():
+            if name in masks and name not in conjunctive:
+                base = np.ones(size, dtype=bool)
+                for other, mask in masks.items():
+                    if other != name:
+                        base &= mask
+            else:
+                base = everything
+            selection = Selection(base)
+            counts[name] = {value: bitmap.count_in(selection) for value, bitmap in bitmaps.items()}
+        matched = ids[everything]
+        return (matched if ordered else np.sort(matched)), counts
+
+    def stats(self):
+        """Return indexed rows, values per facet and memory use."""
+        ids, facets, _ = self._state
+        memory = ids.nbytes + sum(bitmap.nbytes for bitmaps in facets.values() for bitmap in bitmaps.values())
+        containers = Counter()
+        for bitmaps in facets.values():
+            for bitmap in bitmaps.values():
+                for container in bitmap.containers.values():
+                    containers['bitmap' if container.dtype == np.uint8 else 'array'] += 1
+        return {
+            'candidates': len(ids),
+            'values': {name: len(bitmaps) for name, bitmaps in facets.items()},
+            'values_not_indexed': dict(self._dropped),
+            'containers': dict(containers),
+            'memory_mb': round(memory / 1e6, 2),
+        }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Return the process-wide candidate facet index, creating it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = FacetIndex(**FACET_CONFIG)
+    return _index
+
+
+def load_in_background(backend):
+    """Start loading the facet index from `backend` on a daemon thread, once per process."""
+    index = get_index()
+    with _index_lock:
+        if index.loaded or index._loader is not None:
+            return
+
+        def load():
+            with backend.connection() as connection:
+                index.refresh(connection)
+        index._loader = threading.Thread(target=load, name="facet-index-load", daemon=True)
+        index._loader.start()
@@ -0,0 +1,184 @@
+"""
+Result Frames
+Builds pandas DataFrames of query results with compact dtypes instead of
+one Python object per value:
+
+- low-cardinality text (EdLevel, Gender, Country, ...) as category,
+- counts and years (YearsCoded, ids) as int32, nullable Int32 when NULL,
+- salaries as nullable Int32 / Int64,
+- other text as Arrow-backed strings (pyarrow ships with Streamlit),
+- DECIMAL aggregates (averages) as float64.
+
+fetch_frame streams a query through a server-side cursor and converts it
+batch by batch, so the full result never exists as a list of tuples;
+to_frame converts rows that are already in memory (e.g. from the query
+cache). Pages render the frames a page at a time (views/tables.py).
+fetch_array streams a single numeric column (e.g. keys) into a NumPy array.
+"""
+
+import decimal
+import importlib.util
+import time
+
+import numpy as np
+import pandas as pd
+
+import db
+import query_metrics
+
+# Arrow-backed strings need pyarrow; without it text stays in object columns
+STRING_DTYPE = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') else object
+
+
+DEFAULT_FRAME_CONFIG = {
+    'page_rows': 1000,     # Rows of a result sent to the browser at a time
+    'batch_size': 10_000,  # Rows fetched and converted per batch when streaming a result
+}
+FRAME_CONFIG = db.get_config('FRAME_CONFIG', DEFAULT_FRAME_CONFIG)
+
+# Column kinds by result column name (case-insensitive); other columns are inferred
+CATEGORY, INT32, NULLABLE_INT32, NULLABLE_INT64 = 'category', 'int32', 'Int32', 'Int64'
+COLUMN_KINDS = {
+    'edlevel': CATEGORY, 'gender': CATEGORY, 'country': CATEGORY, 'location': CATEGORY,
+    'contactperson': CATEGORY, 'company': CATEGORY, 'actiontype': CATEGORY,
+    'candidateid': INT32, 'jobid': INT32, 'auditid': INT32, 'skillid': INT32,
+    'yearscoded': INT32, 'minexperienceyears': INT32, 'jobcount': INT32,
+    'previoussalary': NULLABLE_INT32, 'salarymin': NULLABLE_INT32, 'salarymax': NULLABLE_INT32,
+    'salaryminsum': NULLABLE_INT64, 'salarymaxsum': NULLABLE_INT64,
+}
+
+
+def _kind(name, values):
+    kind = COLUMN_KINDS.get(name.casefold())
+    if kind:
+        return kind
+    sample = next((value for value in values if value is not None), None)
+    if isinstance(sample, str):
+        return 'string'
+    if isinstance(sample, decimal.Decimal):
+        return 'float'
+    return None
+
+
+class _Column:
+    """Converted batches of one result column."""
+
+    def __init__(self, name):
+        self.name = name
+        self.kind = None
+        self.chunks = []
+        self.categories = {}  # category value -> code
+
+    def add(self, values):
+        if self.kind is None:
+            self.kind = _kind(self.name, values)
+        if self.kind == CATEGORY:
+            # Factorize the batch, then map its few distinct values to the column's codes
+            codes, uniques = pd.factorize(np.array(values, dtype=object))
+            remap = np.array([self.categories.setdefault(value, len(self.categories)) for value in uniques]
+                             + [-1], dtype=np.int32)
+            self.chunks.append(remap[codes])
+        elif self.kind in (INT32, NULLABLE_INT32, NULLABLE_INT64):
+            self.chunks.append(pd.array(values, dtype=NULLABLE_INT64 if self.kind == NULLABLE_INT64 else 'Int32'))
+        elif self.kind == 'string':
+            self.chunks.append(pd.array(values, dtype=STRING_DTYPE))
+        elif self.kind == 'float':
+            self.chunks.append(np.array([np.nan if value is None else float(value) for value in values]))
+        else:
+            self.chunks.append(pd.Series(values).array)
+
+    def series(self):
+        if self.kind == CATEGORY:
+            codes = np.concatenate(self.chunks) if self.chunks else np.zeros(0, dtype=np.int32)
+            return pd.Series(pd.Categorical.from_codes(codes, categories=list(self.categories)), name=self.name)
+        if not self.chunks:
+            return pd.Series([], name=self.name, dtype=object)
+        series = pd.Series(self.chunks[0] if len(self.chunks) == 1 else pd.concat(
+            [pd.Series(chunk) for chunk in self.chunks], ignore_index=True
+        ), name=self.name)
+        if self.kind == INT32 and not series.hasnans:
+            series = series.astype(np.int32)
+        return series
+
+
+def _columns_of(rows, names):
+    if rows and isinstance(rows[0], dict):
+        return [[row[name] for row in rows] for name in names]
+    return [list(values) for values in zip(*rows)] if rows else [[] for _ in names]
+
+
+def _frame(columns, labels):
+    # Keyed by position, as joined results may repeat a column name
+    frame = pd.DataFrame({position: column.series() for position, column in enumerate(columns)})
+    frame.columns = list(labels or [column.name for column in columns])
+    return frame
+
+
+def to_frame(rows, columns=None, labels=None):
+    """Return a compact DataFrame of fetched rows (tuples in `columns` order, or dicts).
+
+    `columns` are the result's column names, which pick the dtypes
+    (default: the dict keys); `labels` optionally renames them for display.
+    """
+    names = list(columns or (rows[0].keys() if rows else []))
+    converted = [_Column(name) for name in names]
+    for column, values in zip(converted, _columns_of(rows, names)):
+        column.add(values)
+    return _frame(converted, labels)
+
+
+def fetch_frame(connection, query, params=(), labels=None, name=None, batch_size=None):
+    """Stream a query into a compact DataFrame, converting it one batch at a time.
+
+    Records the fetch and dataframe phases and the row count under the
+    current (or given) query name.
+    """
+    metrics = query_metrics.get_metrics()
+    name = name or query_metrics.current_name()
+    converted, rows, fetching, converting = None, 0, 0.0, 0.0
+    start = time.perf_counter()
+    try:
+        for description, batch in db.iter_batches(connection, query, params,
+                                                   batch_size or FRAME_CONFIG['batch_size']):
+            fetched = time.perf_counter()
+            fetching += fetched - start
+            if converted is None:
+                converted = [_Column(column[0]) for column in description]
+            if batch:
+                for column, values in zip(converted, _columns_of(batch, [c.name for c in converted])):
+                    column.add(values)
+                rows += len(batch)
+            start = time.perf_counter()
+            converting += start - fetched
+    except Exception:
+        metrics.count(name, errors=1)
+        raise
+    started = time.perf_counter()
+    frame = _frame(converted or [], labels)
+    metrics.record(name, 'fetch', fetching)
+    metrics.record(name, 'dataframe', converting + time.perf_counter() - started)
+    metrics.count(name, rows=rows)
+    return frame
+
+
+def fetch_array(connection, query, params=(), dtype=np.int64, batch_size=None):
+    """Stream the first column of a query into a NumPy array, one batch at a time."""
+    chunks = [np.array([row[0] for row in batch], dtype=dtype)
+              for _, batch in db.iter_batches(connection, query, params, batch_size or FRAME_CONFIG['batch_size'])
+              if batch]
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+
+
+def unloaded_keys(connection, query, floor, loaded):
+    """Return the sorted keys above `floor` (see db.KeyWatermark) that are not in `loaded`.
+
+    `query` selects the keys with the floor as its one parameter; `loaded`
+    holds the keys already read (those above the floor are enough).
+    """
+    keys = np.unique(fetch_array(connection, query, (floor,)))
+    return keys[~np.isin(keys, loaded)]
+
+
+def memory_bytes(frame):
+    """Return the memory a frame's index and columns use, strings included."""
+    return int(frame.memory_usage(index=True, deep=True).sum())
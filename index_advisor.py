@@ -0,0 +1,420 @@
+"""
+Index Advisor
+Replays the dashboard's named queries (the benchmark cases) against a
+database, records every statement they run and reads its plan with
+EXPLAIN. Statements that scan a whole table or sort their result
+(filesort / temporary B-tree) get a proposed composite index: the
+columns compared with `=` first, then the ORDER BY columns (or the first
+range column), then, when the index stays small, the other columns the
+statement reads so the index covers it.
+
+Each proposal is measured: the statements it is meant for are timed,
+the index is created, the plan is read again to check the index is used,
+the statements are timed again and the index is dropped. Proposals that
+make their statements clearly faster are recommended and can be written
+as the next migration (see migrate.py).
+"""
+
+import os
+import random
+import re
+import statistics
+import time
+
+import pymysql
+
+import benchmark
+import datagen
+import migrate
+import query_metrics
+
+
+# A proposal is recommended when its statements run at least this much faster together
+MIN_SPEEDUP = 1.2
+# Widest proposed index; covering columns are added only while it stays this narrow
+MAX_INDEX_COLUMNS = 5
+# Columns declared TEXT in MySQL, which B-tree indexes only by prefix (in SQLite every string is TEXT)
+TEXT_COLUMNS = {('candidate', 'skills'), ('job', 'skills'), ('recruiter', 'companyprofile')}
+
+_KEYWORDS = {'where', 'join', 'left', 'right', 'inner', 'cross', 'on', 'group', 'order', 'limit',
+             'using', 'union', 'having', 'natural', 'straight_join'}
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_COLUMN = r"(?:(\w+)\.)?(\w+)"
+_VALUE = r"(?:%s|'[^']*'|-?\d+(?:\.\d+)?)"
+_EQUALITY = re.compile(rf"{_COLUMN}\s*(?:=\s*{_VALUE}|IN\s*\()", re.IGNORECASE)
+_JOIN = re.compile(rf"{_COLUMN}\s*=\s*{_COLUMN}\b(?!\s*\()", re.IGNORECASE)
+_RANGE = re.compile(rf"{_COLUMN}\s*(?:(?:<=|>=|<(?!>)|>)\s*{_VALUE}|BETWEEN\b|IS\s+NOT\s+NULL\b)", re.IGNORECASE)
+_REFERENCE = re.compile(rf"\b{_COLUMN}\b", re.IGNORECASE)
+_SORT_LIST = re.compile(r"\b(ORDER|GROUP)\s+BY\s+([\w\s.,]+?)(?=\s+(?:LIMIT|HAVING|ORDER)\b|\s*\)|\s*$)",
+                        re.IGNORECASE)
+_SORT_ITEM = re.compile(rf"^{_COLUMN}(?:\s+(ASC|DESC))?$", re.IGNORECASE)
+
+
+def _normalize(query):
+    return " ".join(query.split())
+
+
+class _RecordingCursor:
+    """Cursor that logs the statements it runs and delegates everything to a real cursor."""
+
+    def __init__(self, cursor, connection):
+        self._cursor = cursor
+        self.connection = connection
+
+    def execute(self, query, params=()):
+        self.connection.statements.append((query, params))
+        return self._cursor.execute(query, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _RecordingConnection:
+    """Connection whose cursors log their statements, so queries run via cursor.connection are seen too."""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self.statements = []
+
+    def cursor(self, cursor_class=None):
+        return _RecordingCursor(self._connection.cursor(cursor_class), self)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def capture(connection, seed=datagen.DEFAULT_SEED, names=None, progress=None):
+    """Run each benchmark case once and return the distinct SELECT statements it ran.
+
+    Returns dicts with the query, the parameters it first ran with and the
+    cases that ran it, in the order first seen.
+    """
+    recording = _RecordingConnection(connection)
+    found = {}
+    for name in names or benchmark.CASES:
+        _, case = benchmark.CASES[name]
+        start = len(recording.statements)
+        cursor = recording.cursor(pymysql.cursors.DictCursor)
+        try:
+            case(cursor, random.Random(f"{seed}:{name}"))
+        except Exception as e:
+            if progress:
+                progress(f"{name}: failed ({e}); its statements so far are still advised on")
+        finally:
+            cursor.close()
+        for query, params in recording.statements[start:]:
+            if not query.lstrip().upper().startswith("SELECT"):
+                continue
+            statement = found.setdefault(_normalize(query), {'query': query, 'params': params, 'cases': []})
+            if name not in statement['cases']:
+                statement['cases'].append(name)
+    return list(found.values())
+
+
+def schema(connection):
+    """Return {table (casefolded): {'name', 'columns': {casefolded: name}, 'primary': [...], 'indexes': {...}}}."""
+    cursor = connection.cursor()
+    tables = {}
+    try:
+        if getattr(connection, 'dialect', 'mysql') == 'sqlite':
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+            for (table,) in cursor.fetchall():
+                cursor.execute(f"PRAGMA table_info({table})")
+                info = cursor.fetchall()
+                entry = tables[table.casefold()] = {
+                    'name': table, 'columns': {row[1].casefold(): row[1] for row in info},
+                    'primary': [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5]],
+                    'indexes': {},
+                }
+                cursor.execute(f"PRAGMA index_list({table})")
+                for index in [row[1] for row in cursor.fetchall()]:
+                    cursor.execute(f"PRAGMA index_info({index})")
+                    entry['indexes'][index] = [row[2] for row in cursor.fetchall()]
+        else:
+            cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, ORDINAL_POSITION
+            """)
+            for table, column in cursor.fetchall():
+                entry = tables.setdefault(table.casefold(), {'name': table, 'columns': {}, 'primary': [],
+                                                             'indexes': {}})
+                entry['columns'][column.casefold()] = column
+            cursor.execute("""
+                SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE() AND INDEX_TYPE = 'BTREE'
+                ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+            """)
+            for table, index, column in cursor.fetchall():
+                entry = tables[table.casefold()]
+                if index == 'PRIMARY':
+                    entry['primary'].append(column)
+                else:
+                    entry['indexes'].setdefault(index, []).append(column)
+    finally:
+        cursor.close()
+    return tables
+
+
+def flags(plan, dialect):
+    """Return ([tables or aliases scanned in full], [sorts]) of an EXPLAIN result.
+
+    A full scan of an index (all of its entries, e.g. to read rows in
+    its order) counts as a full scan too.
+    """
+    full_scans, sorts, subqueries = [], [], {'CONSTANT'}
+    for row in plan if isinstance(plan, list) else []:
+        if dialect == 'sqlite':
+            detail = row.get('detail', '')
+            # Subquery results SQLite reads row by row, not tables
+            subqueries.update(re.findall(r"^(?:CO-ROUTINE|MATERIALIZE) (\w+)", detail))
+            match = re.match(r"SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?$", detail)
+            if match and match.group(1) not in subqueries:
+                full_scans.append(match.group(1))
+            elif detail.startswith("USE TEMP B-TREE FOR"):
+                sorts.append(detail[len("USE TEMP B-TREE FOR "):])
+        else:
+            table = row.get('table', '')
+            if row.get('type') in ('ALL', 'index') and not table.startswith('<'):
+                full_scans.append(table)
+            extra = row.get('Extra', '')
+            sorts.extend(note for note in ("Using filesort", "Using temporary") if note in extra)
+    return full_scans, sorts
+
+
+class _Statement:
+    """The tables, predicates and sort columns of one statement, resolved against the schema."""
+
+    def __init__(self, query, tables):
+        self.tables = tables
+        self.aliases = {}
+        for table, alias in _TABLE_REF.findall(query):
+            if table.casefold() in tables:
+                self.aliases[table.casefold()] = table.casefold()
+                if alias and alias.casefold() not in _KEYWORDS:
+                    self.aliases[alias.casefold()] = table.casefold()
+        self.equality, self.range, self.read = {}, {}, {}
+        for pattern, found in ((_EQUALITY, self.equality), (_RANGE, self.range), (_REFERENCE, self.read)):
+            for qualifier, column in pattern.findall(query):
+                self._add(found, qualifier, column)
+        for left_alias, left, right_alias, right in _JOIN.findall(query):
+            self._add(self.equality, left_alias, left)
+            self._add(self.equality, right_alias, right)
+        self.order, self.group = None, None
+        for clause, items in _SORT_LIST.findall(query):
+            columns = self._sort_columns(items)
+            if clause.upper() == 'ORDER':
+                self.order = columns
+            else:
+                self.group = columns
+
+    def _resolve(self, qualifier, column):
+        """Return (table, column name) of a column reference, or None when it is not a known column."""
+        if qualifier:
+            table = self.aliases.get(qualifier.casefold())
+            candidates = [table] if table else []
+        else:
+            candidates = [table for table in set(self.aliases.values())
+                          if column.casefold() in self.tables[table]['columns']]
+        if len(candidates) != 1 or column.casefold() not in self.tables[candidates[0]]['columns']:
+            return None
+        return candidates[0], self.tables[candidates[0]]['columns'][column.casefold()]
+
+    def _add(self, found, qualifier, column):
+        resolved = self._resolve(qualifier, column)
+        if resolved and resolved[1] not in found.setdefault(resolved[0], []):
+            found[resolved[0]].append(resolved[1])
+
+    def _sort_columns(self, items):
+        """Return (table, [columns]) when every item is a plain column of one table in one direction."""
+        resolved, directions = [], set()
+        for item in items.split(","):
+            match = _SORT_ITEM.match(item.strip())
+            column = match and self._resolve(match.group(1), match.group(2))
+            if not column:
+                return None
+            resolved.append(column)
+            directions.add((match.group(3) or 'ASC').upper())
+        if len({table for table, _ in resolved}) != 1 or len(directions) != 1:
+            return None
+        return resolved[0][0], [column for _, column in resolved]
+
+    def propose(self, table):
+        """Return (key columns, index columns) serving this statement's access to `table`, or None.
+
+        The key holds the compared and sorted columns; the index adds the
+        columns read, when that covers the statement. None when nothing is
+        compared or sorted on (a whole-table read or a substring LIKE), as
+        an index would then be read in full as well.
+        """
+        read = self.read.get(table, [])
+        usable = [column for column in read if (table, column.casefold()) not in TEXT_COLUMNS]
+        key = [column for column in self.equality.get(table, []) if column in usable]
+        sort = self.order or self.group
+        if sort and sort[0] == table:
+            key += [column for column in sort[1] if column not in key]
+        key += [column for column in self.range.get(table, []) if column in usable and column not in key][:1]
+        key = key[:MAX_INDEX_COLUMNS]
+        if not key:
+            return None
+        # Secondary indexes already carry a single-column primary key (InnoDB's clustered key, SQLite's rowid)
+        primary = self.tables[table]['primary']
+        implicit = set(primary) if len(primary) == 1 else set()
+        covering = key + [column for column in usable if column not in key and column not in implicit]
+        if len(usable) == len(read) and len(covering) <= MAX_INDEX_COLUMNS:
+            return key, covering
+        return key, key
+
+
+def _served_by(columns, entry):
+    """Return the name of an existing index (or the primary key) whose leading columns are `columns`."""
+    wanted = [column.casefold() for column in columns]
+    existing = dict(entry['indexes'], PRIMARY=entry['primary'])
+    for name, indexed in existing.items():
+        if [column.casefold() for column in indexed[:len(wanted)]] == wanted:
+            return name
+    return None
+
+
+def index_name(table, columns):
+    # MySQL limits identifiers to 64 characters
+    return f"idx_{table}_{'_'.join(columns)}".lower()[:64]
+
+
+def timed_ms(connection, query, params, repeat):
+    """Return the median milliseconds of running a query and fetching its rows (after one warm-up run)."""
+    cursor = connection.cursor()
+    try:
+        timings = []
+        for run in range(repeat + 1):
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            cursor.fetchall()
+            if run:
+                timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+    finally:
+        cursor.close()
+
+
+def _ddl(connection, proposal, create):
+    dialect = getattr(connection, 'dialect', 'mysql')
+    if dialect == 'sqlite':
+        statement = (f"CREATE INDEX {proposal['name']} ON {proposal['table']} ({', '.join(proposal['columns'])})"
+                     if create else f"DROP INDEX {proposal['name']}")
+    else:
+        change = (f"ADD INDEX {proposal['name']} ({', '.join(proposal['columns'])})"
+                  if create else f"DROP INDEX {proposal['name']}")
+        statement = f"ALTER TABLE {proposal['table']} {change}, ALGORITHM=INPLACE, LOCK=NONE"
+    cursor = connection.cursor()
+    try:
+        cursor.execute(statement)
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def measure(connection, proposal, statements, repeat, keep=False):
+    """Time a proposal's statements without and with its index; sets before/after ms, used and speedup.
+
+    The index is dropped again unless `keep`.
+    """
+    affected = [statements[number] for number in proposal['statements']]
+    proposal['before_ms'] = sum(timed_ms(connection, s['query'], s['params'], repeat) for s in affected)
+    _ddl(connection, proposal, create=True)
+    try:
+        cursor = connection.cursor()
+        try:
+            plans = [query_metrics.explain(cursor, s['query'], s['params']) for s in affected]
+        finally:
+            cursor.close()
+        proposal['used'] = any(proposal['name'] in str(plan) for plan in plans)
+        proposal['after_ms'] = sum(timed_ms(connection, s['query'], s['params'], repeat) for s in affected)
+    finally:
+        if not keep:
+            _ddl(connection, proposal, create=False)
+    proposal['speedup'] = proposal['before_ms'] / proposal['after_ms'] if proposal['after_ms'] else 0.0
+    proposal['recommended'] = proposal['used'] and proposal['speedup'] >= MIN_SPEEDUP
+    return proposal
+
+
+def advise(connection, measure_indexes=True, repeat=5, seed=datagen.DEFAULT_SEED, names=None, progress=None):
+    """Replay the named queries, flag full scans and sorts, and propose (and measure) indexes.
+
+    Returns {'statements': [...], 'proposals': [...]}. Every statement has
+    its plan, flags, median ms and `advice` notes; proposals name the
+    statements (by position) they are for.
+    """
+    dialect = getattr(connection, 'dialect', 'mysql')
+    if dialect not in ('mysql', 'sqlite'):
+        raise RuntimeError(f"The index advisor reads MySQL and SQLite plans, not {dialect}'s.")
+    tables = schema(connection)
+    statements = capture(connection, seed, names, progress)
+    proposals = {}
+    cursor = connection.cursor()
+    try:
+        for number, statement in enumerate(statements):
+            statement['plan'] = query_metrics.explain(cursor, statement['query'], statement['params'])
+            statement['full_scans'], statement['sorts'] = flags(statement['plan'], dialect)
+            statement['ms'] = timed_ms(connection, statement['query'], statement['params'], repeat)
+            statement['advice'] = []
+            if not (statement['full_scans'] or statement['sorts']):
+                continue
+            parsed = _Statement(statement['query'], tables)
+            targets = [parsed.aliases.get(scanned.casefold()) for scanned in statement['full_scans']]
+            sort = parsed.order or parsed.group
+            if statement['sorts'] and sort:
+                targets.append(sort[0])
+            elif statement['sorts']:
+                statement['advice'].append("sorts on an expression or across tables; no index orders it")
+            for table in dict.fromkeys(target for target in targets if target):
+                proposed = parsed.propose(table)
+                table_name = tables[table]['name']
+                if not proposed:
+                    statement['advice'].append(f"{table_name}: nothing compared or sorted on that an index "
+                                               "could serve (a whole-table read or substring LIKE)")
+                    continue
+                key, columns = proposed
+                existing = _served_by(key, tables[table])
+                if existing:
+                    statement['advice'].append(f"{table_name} ({', '.join(key)}) is already indexed by {existing}")
+                    continue
+                name = index_name(table_name, columns)
+                proposal = proposals.setdefault(name, {'name': name, 'table': table_name, 'columns': columns,
+                                                       'statements': []})
+                proposal['statements'].append(number)
+                statement['advice'].append(f"proposed {name} ON {table_name} ({', '.join(columns)})")
+    finally:
+        cursor.close()
+    for proposal in proposals.values():
+        if measure_indexes:
+            if progress:
+                progress(f"Measuring {proposal['name']}...")
+            measure(connection, proposal, statements, repeat)
+        else:
+            proposal.update(before_ms=None, after_ms=None, used=None, speedup=None, recommended=None)
+    return {'statements': statements, 'proposals': list(proposals.values())}
+
+
+def write_migration(proposals, directory=migrate.MIGRATIONS_DIR):
+    """Write the proposals as the next migration (and its down script); returns the two paths."""
+    migrations = migrate.discover(directory)
+    version = migrations[-1]['version'] + 1 if migrations else 1
+    up_path = os.path.join(directory, f"{version:03d}_advised_indexes.sql")
+    down_path = os.path.join(directory, f"{version:03d}_advised_indexes.down.sql")
+    header = f"-- Migration {version:03d}: Advised indexes\n"
+    with open(up_path, 'w', encoding='utf-8') as handle:
+        handle.write(header)
+        handle.write("-- Proposed and measured by: python manage.py advise-indexes\n\nUSE Final_Project;\n")
+        for proposal in proposals:
+            handle.write(f"\n-- {proposal['before_ms']:.2f} ms -> {proposal['after_ms']:.2f} ms\n"
+                         f"ALTER TABLE {proposal['table']}\n"
+                         f"   ADD INDEX {proposal['name']} ({', '.join(proposal['columns'])}),\n"
+                         f"   ALGORITHM=INPLACE, LOCK=NONE;\n")
+    with open(down_path, 'w', encoding='utf-8') as handle:
+        handle.write(header.replace(":", " (down):", 1))
+        handle.write("\nUSE Final_Project;\n")
+        for proposal in proposals:
+            handle.write(f"\nALTER TABLE {proposal['table']}\n"
+                         f"   DROP INDEX {proposal['name']},\n"
+                         f"   ALGORITHM=INPLACE, LOCK=NONE;\n")
+    return up_path, down_path
@@ -0,0 +1,117 @@
+"""
+Parsed Job Fields
+Numeric SalaryMin / SalaryMax / MinExperienceYears columns and the DATE
+column PostedDate derived from the free-text Job.SalaryRange,
+Job.Experience and Job.Date values, so salary, experience and date filters
+can use indexes instead of parsing strings per row.
+"""
+
+import re
+from datetime import date, datetime
+
+
+# One amount such as "120000", "$59K", "1.2m" or "85,000"
+_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kKmM])?")
+_MULTIPLIERS = {'k': 1_000, 'm': 1_000_000}
+_YEARS = re.compile(r"\d+")
+
+# Accepted Job.Date formats, tried in order: ISO first, then US month-first
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y", "%d-%m-%Y", "%d %b %Y", "%d %B %Y",
+                "%b %d, %Y", "%B %d, %Y", "%Y-%m-%d %H:%M:%S")
+
+
+def parse_salary_range(salary_range):
+    """Parse "$59K-$99K" / "120000-150000" / "80k" into (min, max), or None."""
+    if not salary_range:
+        return None
+    amounts = []
+    for number, suffix in _AMOUNT.findall(salary_range):
+        value = float(number.replace(",", ""))
+        if suffix:
+            value *= _MULTIPLIERS[suffix.lower()]
+        amounts.append(int(value))
+    if not amounts or len(amounts) > 2:
+        return None
+    low, high = amounts[0], amounts[-1]
+    # "$59-99K": the suffix on the upper bound applies to both
+    if low < 1_000 <= high and low * _MULTIPLIERS['k'] <= high:
+        low *= _MULTIPLIERS['k']
+    if low > high:
+        return None
+    return low, high
+
+
+def parse_experience(experience):
+    """Parse "5 to 15 Years" / "3 years" / "0-2 yrs" into the minimum years, or None."""
+    if not experience:
+        return None
+    match = _YEARS.search(experience)
+    return int(match.group()) if match else None
+
+
+def parse_date(value):
+    """Parse "2023-04-24" / "04/24/2023" / "24 Apr 2023" into a date, or None."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value or not value.strip():
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parsed_job_fields(salary_range, experience):
+    """Return (SalaryMin, SalaryMax, MinExperienceYears) for a job's text fields."""
+    salary = parse_salary_range(salary_range) or (None, None)
+    return salary[0], salary[1], parse_experience(experience)
+
+
+def backfill_job_fields(connection, batch_size=5000, progress=None):
+    """Parse SalaryRange, Experience and Date for every job, committing per batch.
+
+    Returns a report dict with the number of rows processed and the
+    distinct non-empty values that could not be parsed, with their counts.
+    """
+    report = {'processed': 0, 'unparsed_salary': {}, 'unparsed_experience': {}, 'unparsed_date': {}}
+    last_id = 0
+    cursor = connection.cursor()
+    try:
+        while True:
+            cursor.execute("""
+                SELECT JobId, SalaryRange, Experience, Date FROM Job
+                WHERE JobId > %s ORDER BY JobId LIMIT %s
+            """, (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            updates = []
+            for job_id, salary_range, experience, date_text in rows:
+                salary_min, salary_max, min_years = parsed_job_fields(salary_range, experience)
+                if salary_range and salary_range.strip() and salary_min is None:
+                    unparsed = report['unparsed_salary']
+                    unparsed[salary_range] = unparsed.get(salary_range, 0) + 1
+                if experience and experience.strip() and min_years is None:
+                    unparsed = report['unparsed_experience']
+                    unparsed[experience] = unparsed.get(experience, 0) + 1
+                posted = parse_date(date_text)
+                if date_text and date_text.strip() and posted is None:
+                    unparsed = report['unparsed_date']
+                    unparsed[date_text] = unparsed.get(date_text, 0) + 1
+                updates.append((salary_min, salary_max, min_years, posted and posted.isoformat(), job_id))
+            cursor.executemany("""
+                UPDATE Job SET SalaryMin = %s, SalaryMax = %s, MinExperienceYears = %s, PostedDate = %s
+                WHERE JobId = %s
+            """, updates)
+            connection.commit()
+            last_id = rows[-1][0]
+            report['processed'] += len(rows)
+            if progress:
+                progress(report['processed'])
+    finally:
+        cursor.close()
+    return report
@@ -0,0 +1,206 @@
+"""
+Job Lookup
+Search-as-you-type job picker for the salary update page. A term is
+matched against JobId, Title, Location and ContactPerson in one statement
+of LIMIT-bounded branches, each served by an index:
+
+- digits: the JobId itself and the ids starting with them (primary key ranges),
+- prefix: Title, Location or ContactPerson starting with the term (B-tree ranges),
+- infix: for terms of at least `infix_min_chars` characters, any of the
+  three columns containing the term, via the ngram FULLTEXT index
+  ft_job_lookup (a phrase of the term's n-grams).
+
+At most `max_results` jobs come back per lookup, best branch first. Recent
+lookups are kept in a small process-wide LRU shared by every session and
+dropped when a write bumps the Job table's query cache version, so
+retyping or backspacing over a term does not query again.
+
+On SQLite the prefix branches use case-insensitive (NOCASE) indexes, as
+LIKE is case-insensitive there, and the infix branch is a bounded LIKE
+scan: embedded databases have no FULLTEXT indexes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import db
+import query_cache
+import query_metrics
+
+
+DEFAULT_LOOKUP_CONFIG = {
+    'max_results': 20,     # Jobs offered per lookup
+    'min_chars': 2,        # Shorter terms (other than a JobId) are not looked up
+    'infix_min_chars': 3,  # Terms this long also match inside Title, Location and ContactPerson
+    'max_entries': 512,    # Recent lookups kept before least recently used are evicted
+    'ttl': 60,             # Seconds a lookup is reused without any job write
+}
+LOOKUP_CONFIG = db.get_config('LOOKUP_CONFIG', DEFAULT_LOOKUP_CONFIG)
+
+COLUMNS = ['JobId', 'Title', 'Location', 'ContactPerson', 'SalaryRange']
+
+# Columns matched by prefix, in the order their matches are offered
+PREFIX_COLUMNS = ['Title', 'Location', 'ContactPerson']
+
+# Digits in the largest JobId (INT); bounds the id prefix ranges
+MAX_ID_DIGITS = 10
+
+_LIKE_ESCAPE = "!"
+
+
+def normalize(text):
+    """Return the lookup term of some picker input: trimmed, inner whitespace collapsed."""
+    return " ".join((text or "").split())
+
+
+def _like_prefix(term):
+    escaped = term.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2)
+    for wildcard in ("%", "_"):
+        escaped = escaped.replace(wildcard, _LIKE_ESCAPE + wildcard)
+    return escaped + "%"
+
+
+def id_ranges(digits):
+    """Return the [low, high) JobId ranges of the ids written with `digits` as prefix."""
+    if not digits.isdigit() or digits.startswith("0") or len(digits) > MAX_ID_DIGITS:
+        return []
+    value = int(digits)
+    return [(value * 10 ** width, (value + 1) * 10 ** width)
+            for width in range(MAX_ID_DIGITS - len(digits) + 1)]
+
+
+def lookup_query(term, limit=20, dialect='mysql', infix_min_chars=3):
+    """Return (sql, params) of the jobs matching a term, each row tagged with its branch (MatchRank)."""
+    columns = ", ".join(COLUMNS)
+    collate = " COLLATE NOCASE" if dialect == 'sqlite' else ""
+    branches, params = [], []
+
+    def branch(rank, condition, condition_params, order):
+        branches.append(f"SELECT * FROM (SELECT {columns}, {rank} AS MatchRank FROM Job "
+                        f"WHERE {condition} ORDER BY {order} LIMIT %s) AS branch_{rank}")
+        params.extend([*condition_params, limit])
+
+    ranges = id_ranges(term)
+    if ranges:
+        branch(0, " OR ".join("(JobId >= %s AND JobId < %s)" for _ in ranges),
+               [bound for pair in ranges for bound in pair], "JobId")
+    for rank, column in enumerate(PREFIX_COLUMNS, start=1):
+        branch(rank, f"{column} LIKE %s ESCAPE '{_LIKE_ESCAPE}'", [_like_prefix(term)],
+               f"{column}{collate}, JobId")
+    if len(term) >= infix_min_chars:
+        rank = len(PREFIX_COLUMNS) + 1
+        if dialect == 'mysql':
+            # A quoted phrase matches the term's consecutive n-grams, i.e. the term anywhere
+            phrase = '"' + term.replace('"', ' ') + '"'
+            branch(rank, f"MATCH({', '.join(PREFIX_COLUMNS)}) AGAINST (%s IN BOOLEAN MODE)", [phrase], "JobId")
+        else:
+            pattern = "%" + _like_prefix(term)
+            branch(rank, " OR ".join(f"{column} LIKE %s ESCAPE '{_LIKE_ESCAPE}'" for column in PREFIX_COLUMNS),
+                   [pattern] * len(PREFIX_COLUMNS), "JobId")
+    return " UNION ALL ".join(branches), tuple(params)
+
+
+def job_version():
+    """Return the Job table's version in the query cache, bumped by every committed job write."""
+    return query_cache.get_cache().versions(('Job',))['Job']
+
+
+class LookupCache:
+    """Thread-safe LRU of recent lookups, valid while the Job table's version is unchanged."""
+
+    def __init__(self, max_entries=512, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (jobs, expires_at, Job version)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached jobs of a lookup, or None."""
+        version = job_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            jobs, expires_at, entry_version = entry
+            if expires_at <= time.monotonic() or entry_version != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return jobs
+
+    def put(self, key, jobs, version):
+        """Store the jobs of a lookup made against Job table version `version`."""
+        if version != job_version():
+            return  # A job write committed while the lookup ran
+        with self._lock:
+            self._entries[key] = (jobs, time.monotonic() + self.ttl, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached lookup."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide lookup cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LookupCache(LOOKUP_CONFIG['max_entries'], LOOKUP_CONFIG['ttl'])
+    return _cache
+
+
+def _match_order(row):
+    # Branch first, then the matched column (prefix branches) or JobId
+    rank = row[-1]
+    if 1 <= rank <= len(PREFIX_COLUMNS):
+        return rank, (row[COLUMNS.index(PREFIX_COLUMNS[rank - 1])] or "").casefold(), row[0]
+    return rank, "", row[0]
+
+
+def lookup(cursor, text, limit=None):
+    """Return up to `limit` jobs matching picker input, best first, as tuples in COLUMNS order.
+
+    Terms too short to narrow the search return [] without a query.
+    """
+    term = normalize(text)
+    limit = limit or LOOKUP_CONFIG['max_results']
+    if len(term) < LOOKUP_CONFIG['min_chars'] and not id_ranges(term):
+        return []
+    dialect = getattr(cursor.connection, 'dialect', 'mysql')
+    key = (dialect, term.casefold(), limit)
+    cache = get_cache()
+    jobs = cache.get(key)
+    if jobs is not None:
+        query_metrics.get_metrics().count("job_lookup", cache_hits=1)
+        return jobs
+    version = job_version()
+    query, params = lookup_query(term, limit, dialect, LOOKUP_CONFIG['infix_min_chars'])
+    seen, jobs = set(), []
+    rows = query_metrics.fetch_all(cursor, query, params, name="job_lookup")
+    for row in sorted(rows, key=_match_order):
+        if row[0] not in seen:
+            seen.add(row[0])
+            jobs.append(tuple(row[:-1]))
+    jobs = tuple(jobs[:limit])
+    cache.put(key, jobs, version)
+    return jobs
+
+
+def label(job):
+    """Return the picker label of a job tuple."""
+    job_id, title, location, contact_person, salary_range = job
+    return f"{job_id} - {title} ({location}, {contact_person}) {salary_range or 'no salary range'}"
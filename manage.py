@@ -0,0 +1,527 @@
+"""
+Maintenance Commands
+Command-line entry point for one-off and recovery tasks against the
+talent database, e.g.:
+
+    python manage.py backfill-skills
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import audit
+import benchmark
+import bulk_import
+import dashboard_benchmark
+import datagen
+import db
+import dedup
+import export
+import index_advisor
+import job_fields
+import migrate
+import recruiter_stats
+import replicas
+import salary_updates
+import skill_demand
+import skill_salary
+import skills
+import storage
+
+
+def backfill_skills_command(args):
+    """Populate CandidateSkill and JobSkill from existing Skills text."""
+    with storage.connection() as connection:
+        for entity in args.entity:
+            total = skills.backfill_skills(
+                connection, entity, batch_size=args.batch_size,
+                progress=lambda done: print(f"  {entity}: {done} rows", end="\r"),
+            )
+            print(f"Back-filled skills for {total} {entity} rows.")
+        if 'job' in args.entity:
+            skill_demand.rebuild(connection)
+            skill_salary.rebuild(connection)
+            print("Rebuilt skill demand counters and skill salary benchmark.")
+
+
+def rebuild_skill_demand_command(args):
+    """Recompute the skill demand summary tables from JobSkill."""
+    with storage.connection() as connection:
+        skill_demand.rebuild(connection)
+    print("Rebuilt skill demand counters.")
+
+
+def check_skill_demand_command(args):
+    """Report skill demand counters that disagree with JobSkill."""
+    with storage.connection() as connection:
+        mismatches = skill_demand.check_consistency(connection)
+    for table, key, stored, expected in mismatches[:args.limit]:
+        print(f"{table} {key}: stored {stored}, expected {expected}")
+    if mismatches:
+        print(f"{len(mismatches)} inconsistent counters; run 'rebuild-skill-demand' to repair.")
+        return 1
+    print("Skill demand counters are consistent.")
+    return 0
+
+
+def rebuild_skill_salary_command(args):
+    """Recompute the SkillSalary benchmark table from Job and JobSkill."""
+    with storage.connection() as connection:
+        skill_salary.rebuild(connection)
+    print("Rebuilt skill salary benchmark.")
+
+
+def check_skill_salary_command(args):
+    """Report SkillSalary rows that disagree with Job and JobSkill."""
+    with storage.connection() as connection:
+        mismatches = skill_salary.check_consistency(connection)
+    for key, stored, expected in mismatches[:args.limit]:
+        print(f"SkillSalary {key}: stored {stored}, expected {expected}")
+    if mismatches:
+        print(f"{len(mismatches)} inconsistent rows; run 'rebuild-skill-salary' to repair.")
+        return 1
+    print("Skill salary benchmark is consistent.")
+    return 0
+
+
+def rebuild_recruiter_stats_command(args):
+    """Recompute the RecruiterStats summary table from Job."""
+    with storage.connection() as connection:
+        recruiter_stats.rebuild(connection)
+    print("Rebuilt recruiter statistics.")
+
+
+def check_recruiter_stats_command(args):
+    """Report RecruiterStats rows that disagree with Job."""
+    with storage.connection() as connection:
+        mismatches = recruiter_stats.check_consistency(connection)
+    for key, stored, expected in mismatches[:args.limit]:
+        print(f"RecruiterStats {key}: stored {stored}, expected {expected}")
+    if mismatches:
+        print(f"{len(mismatches)} inconsistent rows; run 'rebuild-recruiter-stats' to repair.")
+        return 1
+    print("Recruiter statistics are consistent.")
+    return 0
+
+
+def parse_job_fields_command(args):
+    """Fill SalaryMin/SalaryMax/MinExperienceYears/PostedDate from the Job text columns."""
+    with storage.connection() as connection:
+        report = job_fields.backfill_job_fields(
+            connection, batch_size=args.batch_size,
+            progress=lambda done: print(f"  {done} jobs", end="\r"),
+        )
+        skill_salary.rebuild(connection)
+        recruiter_stats.rebuild(connection)
+    print(f"Parsed {report['processed']} jobs and rebuilt the skill salary benchmark and recruiter statistics.")
+    for label, key in (("SalaryRange", 'unparsed_salary'), ("Experience", 'unparsed_experience'),
+                       ("Date", 'unparsed_date')):
+        unparsed = report[key]
+        if unparsed:
+            print(f"{sum(unparsed.values())} jobs with unparseable {label} ({len(unparsed)} distinct values):")
+            for value, count in sorted(unparsed.items(), key=lambda item: -item[1])[:args.limit]:
+                print(f"  {count:>6}  {value!r}")
+
+
+def export_command(args):
+    """Stream a whole table to a CSV or Parquet file."""
+    with storage.connection() as connection:
+        path, rows = export.export_query(
+            connection, export.TABLE_EXPORTS[args.table], path=args.output, fmt=args.format,
+            batch_size=args.batch_size, progress=lambda done: print(f"  {done} rows", end="\r"),
+        )
+    print(f"Exported {rows} rows to {path}.")
+
+
+def import_csv_command(args):
+    """Bulk-load candidates or jobs from a CSV file (resumable)."""
+    def show_progress(report):
+        print(f"  {report['rows_read']} rows read, {report['inserted']} inserted, "
+              f"{report['rejected']} rejected", end="\r")
+
+    started = time.monotonic()
+    with storage.connection() as connection:
+        report = bulk_import.import_csv(
+            connection, args.entity, args.path, batch_size=args.batch_size,
+            rejects_path=args.rejects, progress=show_progress,
+        )
+    elapsed = time.monotonic() - started
+    if report['resumed_at']:
+        print(f"Resumed after row {report['resumed_at']}.")
+    rate = (report['rows_read'] - report['resumed_at']) / elapsed if elapsed else 0
+    print(f"Inserted {report['inserted']} rows, rejected {report['rejected']} "
+          f"in {elapsed:.1f}s ({rate:,.0f} rows/s).")
+    if report['rejected'] and args.rejects:
+        print(f"Rejected rows written to {args.rejects}.")
+
+
+def update_salaries_command(args):
+    """Apply a CSV of JobId,SalaryRange in one transaction (audited per job)."""
+    started = time.monotonic()
+    with storage.connection() as connection, open(args.path, newline='', encoding='utf-8-sig') as handle:
+        report = salary_updates.update_from_csv(connection, handle, chunk_size=args.chunk_size)
+    print(f"Updated {len(report['updated'])} of {report['rows']} jobs, {report['unchanged']} unchanged, "
+          f"{report['rejected']} rejected in {time.monotonic() - started:.1f}s.")
+    for line, error in report['rejects']:
+        print(f"  line {line}: {error}")
+
+
+def find_duplicates_command(args):
+    """Index every candidate and record likely duplicate pairs for review."""
+    started = time.monotonic()
+    with storage.connection() as connection:
+        found = dedup.scan(connection, full=True)
+        cursor = connection.cursor()
+        try:
+            pending = dedup.count_pending(cursor)
+        finally:
+            cursor.close()
+    print(f"Found {found} likely duplicate pairs in {time.monotonic() - started:.1f}s; "
+          f"{pending} awaiting review.")
+    print(f"  index: {dedup.get_index().stats()}")
+
+
+def archive_audit_command(args):
+    """Move old Job_Audit entries into compressed monthly archive files."""
+    before = (datetime.fromisoformat(args.before) if args.before
+              else audit.retention_cutoff(args.retention_days))
+    with storage.connection() as connection:
+        moved = audit.archive(
+            connection, before, archive_dir=args.archive_dir, batch_size=args.batch_size,
+            progress=lambda done: print(f"  {done} entries", end="\r"),
+        )
+    print(f"Archived {moved} audit entries modified before {before:%Y-%m-%d}.")
+
+
+def generate_data_command(args):
+    """Load a seeded synthetic data set into the primary database or a SQLite file."""
+    if args.sqlite:
+        connection = storage.connect_embedded('sqlite', args.sqlite)
+    else:
+        connection = storage.get_backend().acquire()
+    try:
+        if args.reset:
+            datagen.reset(connection)
+        started = time.monotonic()
+        counts = datagen.generate(
+            connection, args.scale, seed=args.seed, batch_size=args.batch_size,
+            progress=lambda table, rows: print(f"  {table}: {rows} rows"),
+        )
+    finally:
+        if args.sqlite:
+            connection.close()
+        else:
+            storage.get_backend().release(connection)
+    print(f"Generated {sum(counts.values())} rows in {time.monotonic() - started:.1f}s.")
+
+
+def sync_analytics_command(args):
+    """Refresh the embedded analytics copy from the primary database now."""
+    if not storage.analytics_is_copy():
+        print("No analytics copy is configured; set STORAGE_CONFIG['analytics'] in config.py.")
+        return 2
+    started = time.monotonic()
+    counts = storage.sync_now(progress=lambda table, rows: print(f"  {table}: {rows} rows"))
+    print(f"Copied {sum(counts.values())} rows to {storage.get_analytics_backend().path} "
+          f"in {time.monotonic() - started:.1f}s.")
+
+
+def check_replicas_command(args):
+    """Health-check the configured read replicas and show where routed reads land."""
+    router = replicas.get_router()
+    if router is None:
+        print("No read replicas are configured; set REPLICA_CONFIG in config.py or TALENT_DB_REPLICAS.")
+        return 2
+    router.check_all()
+    for status in router.stats()['replicas']:
+        state = "healthy" if status['healthy'] else f"DOWN ({status['error']})"
+        print(f"{status['name']:<30} {state:<40} latency {status['latency_ms']} ms  lag {status['lag_seconds']} s")
+    served = {}
+    for _ in range(args.reads):
+        with router.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT @@hostname, @@port")
+            server = ":".join(str(value) for value in cursor.fetchone())
+            cursor.close()
+        served[server] = served.get(server, 0) + 1
+    for server, count in sorted(served.items()):
+        print(f"  {count:>5} of {args.reads} reads served by {server}")
+    return 0 if all(status['healthy'] for status in router.stats()['replicas']) else 1
+
+
+def benchmark_command(args):
+    """Benchmark the dashboard queries at several data scales against a baseline."""
+    backend = 'sqlite' if args.sqlite else 'mysql'
+    if backend == 'mysql' and not args.reset:
+        print("Benchmarking MySQL wipes the generated tables; pass --reset to confirm.")
+        return 2
+
+    def connect():
+        return db.ConnectionPool(db.DB_CONFIG, max_size=1).acquire()
+
+    results = benchmark.run_suite(backend, args.scales, repeat=args.repeat, seed=args.seed,
+                                  connect=connect, progress=print)
+    return _check_baseline(results, args)
+
+
+def benchmark_dashboard_command(args):
+    """Time the dashboard's cold start and the rerun of every page against a baseline."""
+    results = dashboard_benchmark.run_suite(args.script, args.scale, cold_starts=args.cold_starts,
+                                            repeat=args.repeat, seed=args.seed, progress=print)
+    return _check_baseline(results, args)
+
+
+def _check_baseline(results, args):
+    """Save benchmark results as the baseline, or compare them with it; exits 1 on regressions."""
+    if args.save_baseline:
+        benchmark.save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}.")
+        return 0
+    try:
+        baseline = benchmark.load_baseline(args.baseline)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    regressions = benchmark.compare(results, baseline, tolerance=args.tolerance)
+    for key, before, after in regressions:
+        print(f"REGRESSION {key}: p95 {before:.2f} ms -> {after:.2f} ms")
+    if regressions:
+        print(f"{len(regressions)} benchmarks regressed beyond {args.tolerance}x the baseline p95.")
+        return 1
+    print("No regressions against the baseline.")
+    return 0
+
+
+def migrate_command(args):
+    """Apply pending schema migrations (or revert to --to N) and record them in SchemaVersion."""
+    with storage.connection() as connection:
+        try:
+            if args.status:
+                for migration in migrate.status(connection):
+                    applied = f" {migration['applied_at']}" if migration['applied_at'] else ""
+                    print(f"  {migration['version']:03d} {migration['name']:<28} {migration['state']}{applied}")
+                return 0
+            if args.baseline is not None:
+                recorded = migrate.baseline(connection, args.baseline)
+                print(f"Recorded {len(recorded)} migrations as applied without running them.")
+                return 0
+            applied = migrate.applied_versions(connection)
+            if args.to is not None and applied and args.to < max(applied):
+                done = migrate.downgrade(connection, args.to, progress=print)
+                print(f"Reverted {len(done)} migrations; the schema is at version {args.to}.")
+            else:
+                done = migrate.upgrade(connection, args.to, allow_locking=args.allow_locking, progress=print)
+                print(f"Applied {len(done)} migrations." if done else "The schema is up to date.")
+        except RuntimeError as e:
+            print(e)
+            return 2
+    return 0
+
+
+def advise_indexes_command(args):
+    """Replay the dashboard queries through EXPLAIN and propose and measure indexes for scans and sorts."""
+    work_dir = None
+    if args.primary:
+        connection = storage.get_backend().acquire()
+    else:
+        path = args.sqlite
+        if path is None:
+            work_dir = tempfile.mkdtemp(prefix="talent_advisor_")
+            path = os.path.join(work_dir, "advisor.db")
+        seeded = os.path.exists(path)
+        connection = storage.connect_embedded('sqlite', path)
+        if not seeded:
+            started = time.monotonic()
+            datagen.generate(connection, args.scale, seed=args.seed)
+            print(f"Generated {args.scale:,} candidates in {time.monotonic() - started:.1f}s.")
+    try:
+        report = index_advisor.advise(connection, measure_indexes=args.measure or not args.primary,
+                                      repeat=args.repeat, seed=args.seed, progress=print)
+    except RuntimeError as e:
+        print(e)
+        return 2
+    finally:
+        if args.primary:
+            storage.get_backend().release(connection)
+        else:
+            connection.close()
+            if work_dir:
+                shutil.rmtree(work_dir)
+
+    flagged = [statement for statement in report['statements'] if statement['full_scans'] or statement['sorts']]
+    print(f"Replayed {len(report['statements'])} statements; {len(flagged)} scan a whole table or sort.")
+    for statement in flagged:
+        problems = [f"full scan of {', '.join(statement['full_scans'])}"] if statement['full_scans'] else []
+        problems += [f"sorts ({', '.join(statement['sorts'])})"] if statement['sorts'] else []
+        print(f"\n{', '.join(statement['cases'])}: {statement['ms']:.2f} ms, {'; '.join(problems)}")
+        print(f"  {' '.join(statement['query'].split())[:160]}")
+        for note in statement['advice']:
+            print(f"  - {note}")
+    print()
+    for proposal in report['proposals']:
+        index = f"{proposal['name']} ON {proposal['table']} ({', '.join(proposal['columns'])})"
+        if proposal['before_ms'] is None:
+            print(f"PROPOSED {index} (not measured; pass --measure)")
+            continue
+        verdict = "RECOMMENDED" if proposal['recommended'] else "not recommended"
+        unused = "" if proposal['used'] else ", not used by the planner"
+        print(f"{verdict} {index}: {proposal['before_ms']:.2f} ms -> {proposal['after_ms']:.2f} ms "
+              f"({proposal['speedup']:.2f}x{unused})")
+    if not report['proposals']:
+        print("No index to propose: every flagged statement is already served by an index or cannot use one.")
+
+    recommended = [proposal for proposal in report['proposals'] if proposal['recommended']]
+    if args.write_migration:
+        if not recommended:
+            print("No index was recommended; no migration written.")
+            return 0
+        for path in index_advisor.write_migration(recommended):
+            print(f"Wrote {path}")
+    return 0
+
+
+def build_parser():
+    """Build the argument parser with one subcommand per task."""
+    parser = argparse.ArgumentParser(description="Talent database maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("backfill-skills", help=backfill_skills_command.__doc__)
+    backfill.add_argument("--entity", nargs="+", choices=sorted(skills.SKILL_LINKS),
+                          default=sorted(skills.SKILL_LINKS))
+    backfill.add_argument("--batch-size", type=int, default=5000)
+    backfill.set_defaults(func=backfill_skills_command)
+
+    rebuild = commands.add_parser("rebuild-skill-demand", help=rebuild_skill_demand_command.__doc__)
+    rebuild.set_defaults(func=rebuild_skill_demand_command)
+
+    check = commands.add_parser("check-skill-demand", help=check_skill_demand_command.__doc__)
+    check.add_argument("--limit", type=int, default=20, help="Mismatches to print")
+    check.set_defaults(func=check_skill_demand_command)
+
+    rebuild_salary = commands.add_parser("rebuild-skill-salary", help=rebuild_skill_salary_command.__doc__)
+    rebuild_salary.set_defaults(func=rebuild_skill_salary_command)
+
+    check_salary = commands.add_parser("check-skill-salary", help=check_skill_salary_command.__doc__)
+    check_salary.add_argument("--limit", type=int, default=20, help="Mismatches to print")
+    check_salary.set_defaults(func=check_skill_salary_command)
+
+    rebuild_stats = commands.add_parser("rebuild-recruiter-stats",
+                                        help=rebuild_recruiter_stats_command.__doc__)
+    rebuild_stats.set_defaults(func=rebuild_recruiter_stats_command)
+
+    check_stats = commands.add_parser("check-recruiter-stats", help=check_recruiter_stats_command.__doc__)
+    check_stats.add_argument("--limit", type=int, default=20, help="Mismatches to print")
+    check_stats.set_defaults(func=check_recruiter_stats_command)
+
+    parse = commands.add_parser("parse-job-fields", help=parse_job_fields_command.__doc__)
+    parse.add_argument("--batch-size", type=int, default=5000)
+    parse.add_argument("--limit", type=int, default=20, help="Unparseable values to list")
+    parse.set_defaults(func=parse_job_fields_command)
+
+    export_table = commands.add_parser("export", help=export_command.__doc__)
+    export_table.add_argument("table", choices=sorted(export.TABLE_EXPORTS))
+    export_table.add_argument("output", help="Destination file")
+    export_table.add_argument("--format", choices=sorted(export.FORMATS), default="csv")
+    export_table.add_argument("--batch-size", type=int, default=export.DEFAULT_BATCH_SIZE)
+    export_table.set_defaults(func=export_command)
+
+    import_csv = commands.add_parser("import-csv", help=import_csv_command.__doc__)
+    import_csv.add_argument("entity", choices=sorted(bulk_import.ENTITIES))
+    import_csv.add_argument("path", help="CSV file with a header row")
+    import_csv.add_argument("--batch-size", type=int, default=bulk_import.DEFAULT_BATCH_SIZE)
+    import_csv.add_argument("--rejects", help="Write rejected rows to this CSV file")
+    import_csv.set_defaults(func=import_csv_command)
+
+    update_salaries = commands.add_parser("update-salaries", help=update_salaries_command.__doc__)
+    update_salaries.add_argument("path", help="CSV file of JobId,SalaryRange (header optional)")
+    update_salaries.add_argument("--chunk-size", type=int, default=salary_updates.DEFAULT_CHUNK_SIZE)
+    update_salaries.set_defaults(func=update_salaries_command)
+
+    find_duplicates = commands.add_parser("find-duplicates", help=find_duplicates_command.__doc__)
+    find_duplicates.set_defaults(func=find_duplicates_command)
+
+    archive = commands.add_parser("archive-audit", help=archive_audit_command.__doc__)
+    archive.add_argument("--before", help="Archive entries before this date (YYYY-MM-DD); "
+                                          "defaults to the start of the month retention_days ago")
+    archive.add_argument("--retention-days", type=int, default=None)
+    archive.add_argument("--archive-dir", default=None)
+    archive.add_argument("--batch-size", type=int, default=5000)
+    archive.set_defaults(func=archive_audit_command)
+
+    generate = commands.add_parser("generate-data", help=generate_data_command.__doc__)
+    generate.add_argument("--scale", type=int, default=10_000, help="Number of candidates")
+    generate.add_argument("--seed", type=int, default=datagen.DEFAULT_SEED)
+    generate.add_argument("--sqlite", help="Write to this SQLite file instead of the primary database")
+    generate.add_argument("--reset", action="store_true", help="Delete existing rows first")
+    generate.add_argument("--batch-size", type=int, default=datagen.DEFAULT_BATCH_SIZE)
+    generate.set_defaults(func=generate_data_command)
+
+    check_read_replicas = commands.add_parser("check-replicas", help=check_replicas_command.__doc__)
+    check_read_replicas.add_argument("--reads", type=int, default=20, help="Reads to route through the router")
+    check_read_replicas.set_defaults(func=check_replicas_command)
+
+    sync = commands.add_parser("sync-analytics", help=sync_analytics_command.__doc__)
+    sync.set_defaults(func=sync_analytics_command)
+
+    bench = commands.add_parser("benchmark", help=benchmark_command.__doc__)
+    bench.add_argument("--scales", type=int, nargs="+", default=benchmark.DEFAULT_SCALES)
+    bench.add_argument("--repeat", type=int, default=benchmark.DEFAULT_REPEAT)
+    bench.add_argument("--seed", type=int, default=datagen.DEFAULT_SEED)
+    bench.add_argument("--sqlite", action="store_true", help="Use temporary SQLite databases")
+    bench.add_argument("--reset", action="store_true",
+                       help="Allow wiping the MySQL tables the generator writes")
+    bench.add_argument("--baseline", default="benchmark_baseline.json")
+    bench.add_argument("--save-baseline", action="store_true")
+    bench.add_argument("--tolerance", type=float, default=benchmark.DEFAULT_TOLERANCE)
+    bench.set_defaults(func=benchmark_command)
+
+    bench_app = commands.add_parser("benchmark-dashboard", help=benchmark_dashboard_command.__doc__)
+    bench_app.add_argument("--script", default=dashboard_benchmark.DEFAULT_SCRIPT,
+                           help="Dashboard script to time, e.g. an older version saved next to it")
+    bench_app.add_argument("--scale", type=int, default=dashboard_benchmark.DEFAULT_SCALE)
+    bench_app.add_argument("--cold-starts", type=int, default=dashboard_benchmark.DEFAULT_COLD_STARTS)
+    bench_app.add_argument("--repeat", type=int, default=dashboard_benchmark.DEFAULT_RERUNS)
+    bench_app.add_argument("--seed", type=int, default=datagen.DEFAULT_SEED)
+    bench_app.add_argument("--baseline", default="dashboard_baseline.json")
+    bench_app.add_argument("--save-baseline", action="store_true")
+    bench_app.add_argument("--tolerance", type=float, default=benchmark.DEFAULT_TOLERANCE)
+    bench_app.set_defaults(func=benchmark_dashboard_command)
+
+    migrations = commands.add_parser("migrate", help=migrate_command.__doc__)
+    migrations.add_argument("--to", type=int, help="Upgrade to, or revert down to, this version")
+    migrations.add_argument("--status", action="store_true", help="List migrations and whether they are applied")
+    migrations.add_argument("--baseline", type=int, metavar="VERSION",
+                            help="Record migrations up to VERSION as applied without running them")
+    migrations.add_argument("--allow-locking", action="store_true",
+                            help="Run ALTER TABLE statements that do not state ALGORITHM and LOCK")
+    migrations.set_defaults(func=migrate_command)
+
+    advise = commands.add_parser("advise-indexes", help=advise_indexes_command.__doc__)
+    advise.add_argument("--sqlite", help="Seeded SQLite file to advise on (generated at --scale if missing; "
+                                         "default: a temporary one)")
+    advise.add_argument("--primary", action="store_true",
+                        help="Advise on the primary database (EXPLAIN only unless --measure)")
+    advise.add_argument("--measure", action="store_true",
+                        help="With --primary, create and drop each proposed index to time it")
+    advise.add_argument("--scale", type=int, default=100_000, help="Candidates to generate")
+    advise.add_argument("--repeat", type=int, default=10, help="Timed runs per statement")
+    advise.add_argument("--seed", type=int, default=datagen.DEFAULT_SEED)
+    advise.add_argument("--write-migration", action="store_true",
+                        help="Write the recommended indexes as the next migration")
+    advise.set_defaults(func=advise_indexes_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Candidate-Job Matching
+Ranks all candidates against a job (or all jobs against a candidate) in a
+few vectorized NumPy passes. Skills are held as sparse coordinate/CSR
+arrays (row index and SkillId per non-zero, SkillId used directly as the
+column), weighted by inverse document frequency, and combined with
+experience fit (YearsCoded vs MinExperienceYears) and salary fit
+(PreviousSalary vs SalaryMax). Top-k uses argpartition, so a query over a
+million candidates costs one gather, one bincount and one partition.
+"""
+
+import threading
+
+import numpy as np
+
+import db
+import frames
+
+
+DEFAULT_WEIGHTS = {'skills': 0.6, 'experience': 0.25, 'salary': 0.15}
+
+# Score given to experience or salary fit when the value is unknown
+NEUTRAL_FIT = 0.5
+
+SKILL_METRICS = ('cosine', 'jaccard')
+
+
+class SkillMatrix:
+    """Immutable sparse entity x skill matrix plus per-entity numeric attributes.
+
+    `ids` are the entity keys in ascending order, `indptr`/`skills` the CSR
+    structure, `rows` the row index of every non-zero (COO form, used by
+    bincount) and `attrs` a dict of float arrays aligned with `ids`.
+    """
+
+    def __init__(self, ids, indptr, skills, attrs):
+        self.ids = ids
+        self.indptr = indptr
+        self.skills = skills
+        self.rows = np.repeat(np.arange(len(ids), dtype=np.int32), np.diff(indptr))
+        self.attrs = attrs
+        vocabulary = int(skills.max()) + 1 if len(skills) else 1
+        self.doc_freq = np.bincount(skills, minlength=vocabulary).astype(np.float64)
+        # Smoothed inverse document frequency: rare skills weigh more
+        self.idf = np.log((1 + len(ids)) / (1 + self.doc_freq)) + 1.0
+        weights = self.idf[skills]
+        self.norms = np.sqrt(np.bincount(self.rows, weights=weights ** 2, minlength=len(ids)))
+        self.weight_sums = np.bincount(self.rows, weights=weights, minlength=len(ids))
+
+    @property
+    def watermark(self):
+        """Largest entity key loaded so far."""
+        return int(self.ids[-1]) if len(self.ids) else 0
+
+    def position(self, entity_id):
+        """Return the row index of an entity key, or None if not loaded."""
+        index = int(np.searchsorted(self.ids, entity_id))
+        if index < len(self.ids) and self.ids[index] == entity_id:
+            return index
+        return None
+
+    def row_skills(self, index):
+        return self.skills[self.indptr[index]:self.indptr[index + 1]]
+
+    def appended(self, other):
+        """Return a new matrix with `other`'s rows (keys not loaded here) added, keys kept ascending."""
+        if not len(other.ids):
+            return self
+        ids = np.concatenate([self.ids, other.ids])
+        indptr = np.concatenate([self.indptr, other.indptr[1:] + self.indptr[-1]])
+        skills = np.concatenate([self.skills, other.skills])
+        attrs = {name: np.concatenate([values, other.attrs[name]]) for name, values in self.attrs.items()}
+        if len(self.ids) and other.ids[0] < self.ids[-1]:
+            # Rows committed late (see db.KeyWatermark) go back into key order
+            order = np.argsort(ids, kind='stable')
+            counts = np.diff(indptr)[order]
+            ends = np.cumsum(counts)
+            skills = skills[np.repeat(indptr[:-1][order] - (ends - counts), counts) + np.arange(ends[-1])]
+            indptr = np.concatenate([[0], ends])
+            ids = ids[order]
+            attrs = {name: values[order] for name, values in attrs.items()}
+        return SkillMatrix(ids, indptr, skills, attrs)
+
+    def skill_scores(self, query_skills, metric='cosine'):
+        """Score every row against a set of SkillIds in one vectorized pass."""
+        n = len(self.ids)
+        query_skills = np.unique(query_skills[query_skills < len(self.idf)])
+        if not n or not len(query_skills):
+            return np.zeros(n)
+        in_query = np.zeros(len(self.idf), dtype=bool)
+        in_query[query_skills] = True
+        mask = in_query[self.skills]
+        matched = self.idf[self.skills[mask]]
+        query_weights = self.idf[query_skills]
+        if metric == 'jaccard':
+            overlap = np.bincount(self.rows[mask], weights=matched, minlength=n)
+            union = self.weight_sums + query_weights.sum() - overlap
+            return np.divide(overlap, union, out=np.zeros(n), where=union > 0)
+        overlap = np.bincount(self.rows[mask], weights=matched ** 2, minlength=n)
+        denominator = self.norms * np.sqrt((query_weights ** 2).sum())
+        return np.divide(overlap, denominator, out=np.zeros(n), where=denominator > 0)
+
+
+def _build(ids, attrs, link_ids, skills):
+    """Build a SkillMatrix from ascending keys, their attribute arrays and (key, SkillId) link arrays."""
+    if len(link_ids) and len(ids):
+        positions = np.searchsorted(ids, link_ids)
+        keep = (positions < len(ids)) & (ids[np.minimum(positions, len(ids) - 1)] == link_ids)
+        positions, skills = positions[keep], skills[keep]
+    else:
+        positions = np.zeros(0, dtype=np.int64)
+        skills = np.zeros(0, dtype=np.int32)
+    order = np.argsort(positions, kind='stable')
+    positions, skills = positions[order], skills[order]
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(positions, minlength=len(ids)), out=indptr[1:])
+    return SkillMatrix(ids, indptr, skills, attrs)
+
+
+def _fetch(connection, query, params, dtypes, wanted=None):
+    """Stream a query into one array per column, converting it a batch at a time.
+
+    With `wanted`, only rows whose first column is in it are kept.
+    """
+    chunks = [[] for _ in dtypes]
+    for _, batch in db.iter_batches(connection, query, params):
+        if not batch:
+            continue
+        # NULL becomes NaN in float columns
+        columns = [np.array(values, dtype=dtype) for values, dtype in zip(zip(*batch), dtypes)]
+        if wanted is not None:
+            keep = np.isin(columns[0], wanted)
+            columns = [column[keep] for column in columns]
+        for chunk, column in zip(chunks, columns):
+            chunk.append(column)
+    return [np.concatenate(chunk) if chunk else np.zeros(0, dtype=dtype) for chunk, dtype in zip(chunks, dtypes)]
+
+
+# What is loaded for each side of the match
+_SIDES = {
+    'candidate': {
+        'keys': "SELECT CandidateId FROM Candidate WHERE CandidateId > %s",
+        'entities': """
+            SELECT CandidateId, YearsCoded, PreviousSalary FROM Candidate
+            WHERE CandidateId > %s ORDER BY CandidateId
+        """,
+        'links': """
+            SELECT CandidateId, SkillId FROM CandidateSkill
+            WHERE CandidateId > %s ORDER BY CandidateId
+        """,
+        'attrs': ('years', 'salary'),
+    },
+    'job': {
+        'keys': "SELECT JobId FROM Job WHERE JobId > %s",
+        'entities': """
+            SELECT JobId, MinExperienceYears, SalaryMax FROM Job
+            WHERE JobId > %s ORDER BY JobId
+        """,
+        'links': """
+            SELECT JobId, SkillId FROM JobSkill
+            WHERE JobId > %s ORDER BY JobId
+        """,
+        'attrs': ('min_years', 'salary_max'),
+    },
+}
+
+
+def load_side(connection, side, after=0, wanted=None):
+    """Load candidates or jobs with a key greater than `after` (only the `wanted` keys, if given)
+    into a SkillMatrix."""
+    spec = _SIDES[side]
+    ids, *attrs = _fetch(connection, spec['entities'], (after,),
+                         [np.int64] + [np.float64] * len(spec['attrs']), wanted)
+    link_ids, skills = _fetch(connection, spec['links'], (after,), [np.int64, np.int32], wanted)
+    return _build(ids, dict(zip(spec['attrs'], attrs)), link_ids, skills)
+
+
+def _load_new(connection, side, matrix, watermark):
+    """Return `matrix` (None when nothing is loaded) with the rows of `side` it does not have added."""
+    floor, started = watermark.begin()
+    if matrix is None:
+        matrix = load_side(connection, side, floor)
+    else:
+        loaded = matrix.ids[np.searchsorted(matrix.ids, floor, 'right'):]
+        wanted = frames.unloaded_keys(connection, _SIDES[side]['keys'], floor, loaded)
+        if len(wanted):
+            # Missing rows are usually the newest, so read from the lowest of them
+            matrix = matrix.appended(load_side(connection, side, int(wanted[0]) - 1, wanted))
+    watermark.loaded(started, matrix.watermark)
+    return matrix
+
+
+def experience_fit(years, min_years):
+    """1 when experience meets the requirement, falling linearly to 0 at no experience."""
+    years, min_years = np.broadcast_arrays(np.asarray(years, dtype=float), np.asarray(min_years, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fit = np.clip(years / min_years, 0.0, 1.0)
+    fit = np.where(min_years <= 0, 1.0, fit)
+    return np.where(np.isnan(years) | np.isnan(min_years), NEUTRAL_FIT, fit)
+
+
+def salary_fit(previous_salary, salary_max):
+    """1 when the job pays at least the previous salary, falling to 0 at twice the budget."""
+    previous_salary, salary_max = np.broadcast_arrays(
+        np.asarray(previous_salary, dtype=float), np.asarray(salary_max, dtype=float)
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fit = np.clip(1.0 - (previous_salary - salary_max) / salary_max, 0.0, 1.0)
+    fit = np.where(previous_salary <= salary_max, 1.0, fit)
+    return np.where(np.isnan(previous_salary) | np.isnan(salary_max) | (salary_max <= 0), NEUTRAL_FIT, fit)
+
+
+def top_k(scores, k):
+    """Return the indices of the k highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best], kind='stable')]
+
+
+class MatchingEngine:
+    """In-memory candidate and job matrices with ranked matching in both directions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.candidates = None
+        self.jobs = None
+        self._watermarks = {}
+
+    def refresh(self, connection, full=False):
+        """Load everything on first use, then only rows added since the last refresh.
+
+        New candidates and jobs are picked up incrementally by key, including
+        ones committed after higher keys were loaded (see db.KeyWatermark);
+        edits to rows already loaded need a `full` reload.
+        """
+        with self._lock:
+            if full or self.candidates is None:
+                self._watermarks = {side: db.KeyWatermark() for side in _SIDES}
+                candidates = _load_new(connection, 'candidate', None, self._watermarks['candidate'])
+                jobs = _load_new(connection, 'job', None, self._watermarks['job'])
+            else:
+                candidates = _load_new(connection, 'candidate', self.candidates, self._watermarks['candidate'])
+                jobs = _load_new(connection, 'job', self.jobs, self._watermarks['job'])
+            # Swap in complete matrices so concurrent readers never see a half-built state
+            self.candidates, self.jobs = candidates, jobs
+
+    def _rank(self, pool, query_skills, experience, salary, k, weights, metric):
+        if metric not in SKILL_METRICS:
+            raise ValueError(f"Unknown skill metric: {metric}")
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        skill = pool.skill_scores(query_skills, metric)
+        total = (weights['skills'] * skill
+                 + weights['experience'] * experience
+                 + weights['salary'] * salary)
+        best = top_k(total, k)
+        return [
+            {'id': int(pool.ids[i]), 'score': float(total[i]), 'skill_score': float(skill[i]),
+             'experience_fit': float(experience[i]), 'salary_fit': float(salary[i])}
+            for i in best
+        ]
+
+    def top_candidates(self, job_id, k=10, weights=None, metric='cosine'):
+        """Rank all candidates for one job."""
+        candidates, jobs = self.candidates, self.jobs
+        index = jobs.position(job_id)
+        if index is None:
+            raise KeyError(f"Job {job_id} is not loaded.")
+        experience = experience_fit(candidates.attrs['years'], jobs.attrs['min_years'][index])
+        salary = salary_fit(candidates.attrs['salary'], jobs.attrs['salary_max'][index])
+        return self._rank(candidates, jobs.row_skills(index), experience, salary, k, weights, metric)
+
+    def top_jobs(self, candidate_id, k=10, weights=None, metric='cosine'):
+        """Rank all jobs for one candidate."""
+        candidates, jobs = self.candidates, self.jobs
+        index = candidates.position(candidate_id)
+        if index is None:
+            raise KeyError(f"Candidate {candidate_id} is not loaded.")
+        experience = experience_fit(candidates.attrs['years'][index], jobs.attrs['min_years'])
+        salary = salary_fit(candidates.attrs['salary'][index], jobs.attrs['salary_max'])
+        return self._rank(jobs, candidates.row_skills(index), experience, salary, k, weights, metric)
+
+    def stats(self):
+        """Return loaded sizes and approximate memory use."""
+        sides = {'candidates': self.candidates, 'jobs': self.jobs}
+        stats = {}
+        for name, matrix in sides.items():
+            if matrix is None:
+                continue
+            arrays = [matrix.ids, matrix.indptr, matrix.skills, matrix.rows, matrix.idf,
+                      matrix.doc_freq, matrix.norms, matrix.weight_sums, *matrix.attrs.values()]
+            stats[name] = {'rows': len(matrix.ids), 'skill_links': len(matrix.skills),
+                           'memory_mb': round(sum(a.nbytes for a in arrays) / 1e6, 1)}
+        return stats
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide matching engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MatchingEngine()
+    return _engine
@@ -0,0 +1,245 @@
+"""
+Schema Migrations
+Versioned upgrades of the MySQL schema. Every migration is a pair of
+scripts in migrations/: NNN_name.sql applies it and NNN_name.down.sql
+reverts it. Applied versions are recorded in SchemaVersion with the
+script's checksum and run time, so `python manage.py migrate` applies
+only the pending ones, in order, and `migrate --to N` reverts down to N.
+
+MySQL commits each DDL statement on its own, so a migration is recorded
+once its last statement has run; one failing half way is reported with
+the failed statement and has to be finished or reverted by hand.
+
+Index and column changes must be online: every ALTER TABLE has to state
+its ALGORITHM and LOCK, so MySQL refuses rather than silently copying
+the table under a lock, and DDL waits at most `lock_wait_timeout`
+seconds for the table's metadata lock (retrying a few times), so a long
+query does not queue every other statement on the table behind the
+ALTER.
+
+Embedded (SQLite / DuckDB) databases are created at the current schema
+(storage.EMBEDDED_SCHEMA) and are not migrated.
+"""
+
+import hashlib
+import os
+import re
+import time
+
+import db
+
+
+DEFAULT_MIGRATION_CONFIG = {
+    'lock_wait_timeout': 5,  # Seconds a DDL statement waits for its table's metadata lock
+    'retries': 3,            # Further attempts of a statement that timed out on the lock
+    'retry_delay': 10,       # Seconds between those attempts
+}
+MIGRATION_CONFIG = db.get_config('MIGRATION_CONFIG', DEFAULT_MIGRATION_CONFIG)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS SchemaVersion (
+       Version INT PRIMARY KEY,
+       Name VARCHAR(255) NOT NULL,
+       Checksum CHAR(64) NOT NULL DEFAULT '',
+       AppliedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+       DurationMs INT NOT NULL DEFAULT 0
+    )
+"""
+
+_SCRIPT_NAME = re.compile(r"^(\d{3})_(\w+?)(\.down)?\.sql$")
+_ONLINE_CLAUSES = re.compile(r"\bALGORITHM\s*=.*\bLOCK\s*=", re.IGNORECASE | re.DOTALL)
+
+# MySQL error raised when a statement gives up waiting for a lock
+_LOCK_WAIT_TIMEOUT = 1205
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """Return the migrations in a directory, oldest first, as dicts: version, name, up, down (paths)."""
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        match = _SCRIPT_NAME.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        entry = migrations.setdefault(version, {'version': version, 'name': match.group(2), 'up': None, 'down': None})
+        entry['down' if match.group(3) else 'up'] = os.path.join(directory, filename)
+    for entry in migrations.values():
+        if entry['up'] is None:
+            raise ValueError(f"Migration {entry['version']:03d} has a down script but no up script.")
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def checksum(path):
+    """Return the SHA-256 of a script, recorded to notice scripts edited after they were applied."""
+    with open(path, 'rb') as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+
+def statements(path):
+    """Return the statements of a script, without comments and USE statements.
+
+    The runner works on the configured database, which may not be called
+    Final_Project; the scripts keep their USE line for the mysql client.
+    """
+    with open(path, encoding='utf-8') as handle:
+        lines = [line for line in handle if not line.lstrip().startswith("--")]
+    found = []
+    for statement in "".join(lines).split(";"):
+        statement = statement.strip()
+        if statement and not re.match(r"USE\s", statement, re.IGNORECASE):
+            found.append(statement)
+    return found
+
+
+def check_online(path):
+    """Return the ALTER TABLE statements of a script that do not state ALGORITHM and LOCK."""
+    return [statement for statement in statements(path)
+            if re.match(r"ALTER\s+TABLE", statement, re.IGNORECASE) and not _ONLINE_CLAUSES.search(statement)]
+
+
+def _check_backend(connection):
+    dialect = getattr(connection, 'dialect', 'mysql')
+    if dialect != 'mysql':
+        raise RuntimeError(f"Embedded {dialect} databases are created with the current schema; "
+                           "migrations only apply to MySQL.")
+
+
+def applied_versions(connection):
+    """Return {version: (name, checksum, applied_at)} of the applied migrations (creating SchemaVersion)."""
+    _check_backend(connection)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(SCHEMA_VERSION_TABLE)
+        cursor.execute("SELECT Version, Name, Checksum, AppliedAt FROM SchemaVersion ORDER BY Version")
+        return {row[0]: row[1:] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def status(connection, directory=MIGRATIONS_DIR):
+    """Return every known migration with its state.
+
+    'applied', 'pending', 'changed' (the script was edited after it was
+    applied) or 'baseline' (recorded without being run, see baseline()).
+    """
+    applied = applied_versions(connection)
+    report = []
+    for migration in discover(directory):
+        entry = dict(migration)
+        recorded = applied.get(migration['version'])
+        if recorded is None:
+            entry['state'], entry['applied_at'] = 'pending', None
+        else:
+            if not recorded[1]:
+                entry['state'] = 'baseline'
+            else:
+                entry['state'] = 'applied' if recorded[1] == checksum(migration['up']) else 'changed'
+            entry['applied_at'] = recorded[2]
+        report.append(entry)
+    return report
+
+
+def _execute(cursor, statement):
+    """Run one statement, retrying when it timed out waiting for a metadata lock."""
+    for attempt in range(MIGRATION_CONFIG['retries'] + 1):
+        try:
+            cursor.execute(statement)
+            return
+        except Exception as e:
+            if getattr(e, 'args', (None,))[0] != _LOCK_WAIT_TIMEOUT or attempt == MIGRATION_CONFIG['retries']:
+                raise
+            time.sleep(MIGRATION_CONFIG['retry_delay'])
+
+
+def _run_script(connection, path):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SET SESSION lock_wait_timeout = %s", (MIGRATION_CONFIG['lock_wait_timeout'],))
+        for statement in statements(path):
+            try:
+                _execute(cursor, statement)
+            except Exception as e:
+                raise RuntimeError(f"{os.path.basename(path)} failed at: {' '.join(statement.split())[:200]}: {e}")
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def upgrade(connection, target=None, directory=MIGRATIONS_DIR, allow_locking=False, progress=None):
+    """Apply the pending migrations up to `target` (default: all) in order; returns the versions applied.
+
+    Scripts with ALTER TABLE statements that could lock the table are
+    refused unless `allow_locking`.
+    """
+    applied = applied_versions(connection)
+    pending = [migration for migration in discover(directory)
+               if migration['version'] not in applied and (target is None or migration['version'] <= target)]
+    if not allow_locking:
+        for migration in pending:
+            blocking = check_online(migration['up'])
+            if blocking:
+                raise RuntimeError(f"{os.path.basename(migration['up'])} has ALTER TABLE statements without "
+                                   f"ALGORITHM and LOCK: {' '.join(blocking[0].split())[:200]}")
+    done = []
+    for migration in pending:
+        if progress:
+            progress(f"Applying {migration['version']:03d}_{migration['name']}...")
+        started = time.monotonic()
+        _run_script(connection, migration['up'])
+        _record(connection, migration, int((time.monotonic() - started) * 1000), checksum(migration['up']))
+        done.append(migration['version'])
+    return done
+
+
+def downgrade(connection, target, directory=MIGRATIONS_DIR, progress=None):
+    """Revert the applied migrations above version `target`, newest first; returns the versions reverted."""
+    applied = applied_versions(connection)
+    reverting = [migration for migration in reversed(discover(directory))
+                 if migration['version'] in applied and migration['version'] > target]
+    for migration in reverting:
+        if migration['down'] is None:
+            raise RuntimeError(f"Migration {migration['version']:03d}_{migration['name']} has no down script.")
+    done = []
+    for migration in reverting:
+        if progress:
+            progress(f"Reverting {migration['version']:03d}_{migration['name']}...")
+        _run_script(connection, migration['down'])
+        cursor = connection.cursor()
+        try:
+            cursor.execute("DELETE FROM SchemaVersion WHERE Version = %s", (migration['version'],))
+            connection.commit()
+        finally:
+            cursor.close()
+        done.append(migration['version'])
+    return done
+
+
+def _record(connection, migration, duration_ms, recorded_checksum):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO SchemaVersion (Version, Name, Checksum, DurationMs) VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE Name = VALUES(Name), Checksum = VALUES(Checksum), DurationMs = VALUES(DurationMs)
+        """, (migration['version'], migration['name'], recorded_checksum, duration_ms))
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def baseline(connection, version, directory=MIGRATIONS_DIR):
+    """Record the migrations up to `version` as applied without running them.
+
+    For databases upgraded by hand before the runner tracked them
+    (SQL_Setup_MySQL.sql records the versions it already includes the
+    same way). They are recorded without a checksum. Returns the
+    versions recorded.
+    """
+    applied = applied_versions(connection)
+    recorded = []
+    for migration in discover(directory):
+        if migration['version'] <= version and migration['version'] not in applied:
+            _record(connection, migration, 0, '')
+            recorded.append(migration['version'])
+    return recorded
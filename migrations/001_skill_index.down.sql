@@ -0,0 +1,9 @@
+-- Migration 001 (down): Normalized skill index
+-- Drops the skill link tables and Skill. Later migrations reference Skill,
+-- so revert 002 and 009 first (python manage.py migrate --to 0 does).
+
+USE Final_Project;
+
+DROP TABLE IF EXISTS JobSkill;
+DROP TABLE IF EXISTS CandidateSkill;
+DROP TABLE IF EXISTS Skill;
@@ -0,0 +1,35 @@
+-- Migration 001: Normalized skill index
+-- Adds Skill, CandidateSkill and JobSkill so skill filters join through
+-- indexes instead of scanning Skills text with LIKE.
+-- Back-fill existing rows afterwards with: python manage.py backfill-skills
+
+USE Final_Project;
+
+-- Table: Skill
+-- One row per normalized (case-folded) skill token
+CREATE TABLE IF NOT EXISTS Skill (
+   SkillId INT PRIMARY KEY AUTO_INCREMENT,
+   Name VARCHAR(255) COLLATE utf8mb4_bin NOT NULL UNIQUE
+);
+
+-- Table: CandidateSkill
+-- Links candidates to the skills parsed from Candidate.Skills
+CREATE TABLE IF NOT EXISTS CandidateSkill (
+   SkillId INT NOT NULL,
+   CandidateId INT NOT NULL,
+   PRIMARY KEY (SkillId, CandidateId),
+   INDEX idx_candidateskill_candidate (CandidateId),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE,
+   FOREIGN KEY (CandidateId) REFERENCES Candidate(CandidateId) ON DELETE CASCADE
+);
+
+-- Table: JobSkill
+-- Links jobs to the skills parsed from Job.Skills
+CREATE TABLE IF NOT EXISTS JobSkill (
+   SkillId INT NOT NULL,
+   JobId INT NOT NULL,
+   PRIMARY KEY (SkillId, JobId),
+   INDEX idx_jobskill_job (JobId),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE,
+   FOREIGN KEY (JobId) REFERENCES Job(JobId) ON DELETE CASCADE
+);
@@ -0,0 +1,6 @@
+-- Migration 002 (down): Skill demand summary
+
+USE Final_Project;
+
+DROP TABLE IF EXISTS SkillLocationDemand;
+DROP TABLE IF EXISTS SkillDemand;
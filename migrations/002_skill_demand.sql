@@ -0,0 +1,26 @@
+-- Migration 002: Skill demand summary
+-- Materialized job counts per skill and per skill and location, kept up to
+-- date by the application's job write path.
+-- Populate existing data afterwards with: python manage.py rebuild-skill-demand
+
+USE Final_Project;
+
+-- Table: SkillDemand
+-- Number of jobs requiring each skill
+CREATE TABLE IF NOT EXISTS SkillDemand (
+   SkillId INT NOT NULL PRIMARY KEY,
+   JobCount INT NOT NULL DEFAULT 0,
+   INDEX idx_skilldemand_count (JobCount),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE
+);
+
+-- Table: SkillLocationDemand
+-- Number of jobs requiring each skill, per job location ('' when unknown)
+CREATE TABLE IF NOT EXISTS SkillLocationDemand (
+   Location VARCHAR(255) NOT NULL,
+   SkillId INT NOT NULL,
+   JobCount INT NOT NULL DEFAULT 0,
+   PRIMARY KEY (Location, SkillId),
+   INDEX idx_skilllocationdemand_count (Location, JobCount),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE
+);
@@ -0,0 +1,11 @@
+-- Migration 003 (down): Numeric salary and experience columns
+-- Dropping the columns drops their indexes; the table is rebuilt in place
+-- while reads and writes continue.
+
+USE Final_Project;
+
+ALTER TABLE Job
+   DROP COLUMN SalaryMin,
+   DROP COLUMN SalaryMax,
+   DROP COLUMN MinExperienceYears,
+   ALGORITHM=INPLACE, LOCK=NONE;
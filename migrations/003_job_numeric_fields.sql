@@ -0,0 +1,17 @@
+-- Migration 003: Numeric salary and experience columns
+-- Parsed copies of Job.SalaryRange and Job.Experience, indexed so salary
+-- ordering and minimum-experience filters become index range scans.
+-- Parse existing rows afterwards with: python manage.py parse-job-fields
+
+USE Final_Project;
+
+ALTER TABLE Job
+   ADD COLUMN SalaryMin INT UNSIGNED NULL,
+   ADD COLUMN SalaryMax INT UNSIGNED NULL,
+   ADD COLUMN MinExperienceYears SMALLINT UNSIGNED NULL,
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Job
+   ADD INDEX idx_job_salarymax (SalaryMax),
+   ADD INDEX idx_job_minexperience (MinExperienceYears),
+   ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,16 @@
+-- Migration 004 (down): Indexes for the View Data browser
+
+USE Final_Project;
+
+ALTER TABLE Recruiter
+   DROP INDEX idx_recruiter_company,
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Job
+   DROP INDEX idx_job_location,
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Candidate
+   DROP INDEX idx_candidate_country,
+   DROP INDEX idx_candidate_edlevel_yearscoded,
+   ALGORITHM=INPLACE, LOCK=NONE;
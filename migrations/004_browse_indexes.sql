@@ -0,0 +1,17 @@
+-- Migration 004: Indexes for the View Data browser
+-- Serve the browser's equality and range filters from indexes.
+
+USE Final_Project;
+
+ALTER TABLE Recruiter
+   ADD INDEX idx_recruiter_company (Company),
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Job
+   ADD INDEX idx_job_location (Location),
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Candidate
+   ADD INDEX idx_candidate_country (Country),
+   ADD INDEX idx_candidate_edlevel_yearscoded (EdLevel, YearsCoded),
+   ALGORITHM=INPLACE, LOCK=NONE;
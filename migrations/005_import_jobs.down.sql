@@ -0,0 +1,6 @@
+-- Migration 005 (down): Bulk import checkpoints
+-- Interrupted imports can no longer be resumed afterwards.
+
+USE Final_Project;
+
+DROP TABLE IF EXISTS ImportJob;
@@ -0,0 +1,21 @@
+-- Migration 005: Bulk import checkpoints
+-- One row per CSV import; counters advance in the same transaction as each
+-- imported batch so an interrupted import can resume where it stopped.
+
+USE Final_Project;
+
+-- Table: ImportJob
+-- Progress of bulk CSV imports, keyed by the file's checksum
+CREATE TABLE IF NOT EXISTS ImportJob (
+   ImportId INT PRIMARY KEY AUTO_INCREMENT,
+   Entity VARCHAR(20) NOT NULL,
+   SourceName VARCHAR(255) NOT NULL,
+   SourceChecksum CHAR(64) NOT NULL,
+   Status ENUM('running', 'completed', 'failed') NOT NULL DEFAULT 'running',
+   RowsRead INT NOT NULL DEFAULT 0,
+   RowsInserted INT NOT NULL DEFAULT 0,
+   RowsRejected INT NOT NULL DEFAULT 0,
+   StartedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+   INDEX idx_importjob_checksum (Entity, SourceChecksum)
+);
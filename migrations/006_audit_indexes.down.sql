@@ -0,0 +1,9 @@
+-- Migration 006 (down): Indexes for the Audit Log
+-- JobID keeps the foreign key's own index.
+
+USE Final_Project;
+
+ALTER TABLE Job_Audit
+   DROP INDEX idx_job_audit_modified,
+   DROP INDEX idx_job_audit_job_modified,
+   ALGORITHM=INPLACE, LOCK=NONE;
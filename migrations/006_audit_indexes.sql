@@ -0,0 +1,10 @@
+-- Migration 006: Indexes for the Audit Log
+-- Serve newest-first paging, JobID filters and date ranges on Job_Audit
+-- from indexes instead of sorting the whole table.
+
+USE Final_Project;
+
+ALTER TABLE Job_Audit
+   ADD INDEX idx_job_audit_modified (ModifiedAt, AuditID),
+   ADD INDEX idx_job_audit_job_modified (JobID, ModifiedAt, AuditID),
+   ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,17 @@
+-- Migration 007 (down): FULLTEXT Search Indexes
+-- search.py needs these indexes on MySQL: revert only to rebuild them,
+-- e.g. after changing innodb_ft_min_token_size.
+
+USE Final_Project;
+
+ALTER TABLE Candidate
+   DROP INDEX ft_candidate_skills,
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Job
+   DROP INDEX ft_job_title_skills,
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Recruiter
+   DROP INDEX ft_recruiter_profile,
+   ALGORITHM=INPLACE, LOCK=NONE;
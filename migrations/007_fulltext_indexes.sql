@@ -0,0 +1,23 @@
+-- Migration 007: FULLTEXT Search Indexes
+-- Relevance-ranked MATCH ... AGAINST search over candidate skills, job
+-- titles and skills, and recruiter company profiles.
+--
+-- InnoDB indexes words of at least innodb_ft_min_token_size characters
+-- (3 by default), so short skills such as "Go", "R" or "C" need
+-- innodb_ft_min_token_size = 1 in my.cnf (and a server restart) before
+-- these indexes are built. Adding a FULLTEXT index blocks writes to the
+-- table while it builds (LOCK=SHARED); reads continue.
+
+USE Final_Project;
+
+ALTER TABLE Candidate
+   ADD FULLTEXT INDEX ft_candidate_skills (Skills),
+   ALGORITHM=INPLACE, LOCK=SHARED;
+
+ALTER TABLE Job
+   ADD FULLTEXT INDEX ft_job_title_skills (Title, Skills),
+   ALGORITHM=INPLACE, LOCK=SHARED;
+
+ALTER TABLE Recruiter
+   ADD FULLTEXT INDEX ft_recruiter_profile (CompanyProfile),
+   ALGORITHM=INPLACE, LOCK=SHARED;
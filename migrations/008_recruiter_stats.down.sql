@@ -0,0 +1,9 @@
+-- Migration 008 (down): Job posting dates and recruiter statistics
+
+USE Final_Project;
+
+DROP TABLE IF EXISTS RecruiterStats;
+
+ALTER TABLE Job
+   DROP COLUMN PostedDate,
+   ALGORITHM=INPLACE, LOCK=NONE;
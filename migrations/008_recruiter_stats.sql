@@ -0,0 +1,30 @@
+-- Migration 008: Job posting dates and recruiter statistics
+-- PostedDate is the DATE parsed from the free-text Job.Date; RecruiterStats
+-- holds jobs posted and salary totals per recruiter per day, week and month
+-- so Recruiter Analysis reads rolling windows without grouping Job.
+-- Fill both afterwards with:
+--   python manage.py parse-job-fields
+-- (which also rebuilds RecruiterStats).
+
+USE Final_Project;
+
+ALTER TABLE Job
+   ADD COLUMN PostedDate DATE NULL,
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Job
+   ADD INDEX idx_job_posted (PostedDate),
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+CREATE TABLE IF NOT EXISTS RecruiterStats (
+   ContactPerson VARCHAR(255) NOT NULL,
+   PeriodType ENUM('day', 'week', 'month', 'total') NOT NULL,
+   PeriodStart DATE NOT NULL,
+   JobCount INT NOT NULL DEFAULT 0,
+   SalaryCount INT NOT NULL DEFAULT 0,
+   SalaryMinSum BIGINT NOT NULL DEFAULT 0,
+   SalaryMaxSum BIGINT NOT NULL DEFAULT 0,
+   PRIMARY KEY (ContactPerson, PeriodType, PeriodStart),
+   INDEX idx_recruiterstats_period (PeriodType, PeriodStart),
+   FOREIGN KEY (ContactPerson) REFERENCES Recruiter(ContactPerson) ON DELETE CASCADE
+);
@@ -0,0 +1,5 @@
+-- Migration 009 (down): Per-skill salary benchmark
+
+USE Final_Project;
+
+DROP TABLE IF EXISTS SkillSalary;
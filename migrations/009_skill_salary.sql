@@ -0,0 +1,18 @@
+-- Migration 009: Per-skill salary benchmark
+-- SkillSalary holds, per skill and SalaryMax bucket of 5000, the number of
+-- jobs with a parsed salary range and their SalaryMin/SalaryMax totals, so
+-- the salary benchmark groups by individual skill instead of by the whole
+-- Skills string. Fill it afterwards with:
+--   python manage.py rebuild-skill-salary
+
+USE Final_Project;
+
+CREATE TABLE IF NOT EXISTS SkillSalary (
+   SkillId INT NOT NULL,
+   Bucket INT NOT NULL,
+   JobCount INT NOT NULL DEFAULT 0,
+   SalaryMinSum BIGINT NOT NULL DEFAULT 0,
+   SalaryMaxSum BIGINT NOT NULL DEFAULT 0,
+   PRIMARY KEY (SkillId, Bucket),
+   FOREIGN KEY (SkillId) REFERENCES Skill(SkillId) ON DELETE CASCADE
+);
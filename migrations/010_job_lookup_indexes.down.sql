@@ -0,0 +1,8 @@
+-- Migration 010 (down): Job Lookup Indexes
+
+USE Final_Project;
+
+ALTER TABLE Job
+   DROP INDEX ft_job_lookup,
+   DROP INDEX idx_job_title,
+   ALGORITHM=INPLACE, LOCK=NONE;
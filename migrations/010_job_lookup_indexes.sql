@@ -0,0 +1,20 @@
+-- Migration 010: Job Lookup Indexes
+-- Serve the salary update page's typeahead job picker from indexes: Title
+-- prefixes from a B-tree (Location and ContactPerson already have one), and
+-- text anywhere in Title, Location or ContactPerson from an ngram FULLTEXT
+-- index, searched as a phrase of the term's n-grams.
+--
+-- The ngram parser splits text into ngram_token_size characters (2 by
+-- default, set in my.cnf); the picker uses it for terms of 3 or more
+-- characters. Adding a FULLTEXT index blocks writes to the table while it
+-- builds (LOCK=SHARED); reads continue.
+
+USE Final_Project;
+
+ALTER TABLE Job
+   ADD INDEX idx_job_title (Title),
+   ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Job
+   ADD FULLTEXT INDEX ft_job_lookup (Title, Location, ContactPerson) WITH PARSER ngram,
+   ALGORITHM=INPLACE, LOCK=SHARED;
@@ -0,0 +1,6 @@
+-- Migration 011 (down): Candidate Duplicates
+-- Drops the detected pairs and their review decisions.
+
+USE Final_Project;
+
+DROP TABLE IF EXISTS CandidateDuplicate;
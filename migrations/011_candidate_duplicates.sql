@@ -0,0 +1,22 @@
+-- Migration 011: Candidate Duplicates
+-- Keep the near-duplicate candidate pairs found by the MinHash/LSH index
+-- (dedup.py) and their review on the Duplicate Candidates page: pending
+-- until an admin merges the newer candidate into the older one or
+-- dismisses the pair, which then is not proposed again.
+--
+-- A new table; existing tables are not touched.
+
+USE Final_Project;
+
+-- Table: CandidateDuplicate
+-- Candidate pairs proposed as near-duplicates, DuplicateOf the older one
+CREATE TABLE IF NOT EXISTS CandidateDuplicate (
+   CandidateId INT NOT NULL,
+   DuplicateOf INT NOT NULL,
+   Score DECIMAL(4,3) NOT NULL,
+   Status ENUM('pending', 'merged', 'dismissed') NOT NULL DEFAULT 'pending',
+   DetectedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+   ReviewedAt TIMESTAMP NULL,
+   PRIMARY KEY (CandidateId, DuplicateOf),
+   INDEX idx_candidateduplicate_status_score (Status, Score)
+);
@@ -0,0 +1,151 @@
+"""
+Named Queries
+The SQL behind the analytics pages, built as (sql, params) pairs so the
+dashboard, exports and the benchmark suite run exactly the same
+statements. Names match the ones query timings are recorded under.
+"""
+
+import recruiter_stats
+import skill_demand
+import skills as skill_index
+
+
+# Columns of the candidate listings (candidate_search, candidates_by_ids)
+CANDIDATE_COLUMNS = ['CandidateID', 'EdLevel', 'Gender', 'YearsCoded', 'Country', 'PreviousSalary', 'Skills']
+
+
+def recruiter_job_counts():
+    """Total jobs posted by each recruiter, from the recruiters' 'total' summary rows."""
+    return """
+        SELECT r.ContactPerson, COALESCE(s.JobCount, 0) AS TotalJobsPosted
+        FROM Recruiter r
+        LEFT JOIN RecruiterStats s
+            ON s.ContactPerson = r.ContactPerson AND s.PeriodType = %s AND s.PeriodStart = %s
+        ORDER BY TotalJobsPosted DESC
+    """, (recruiter_stats.TOTAL, recruiter_stats.ALL_TIME.isoformat())
+
+
+def recruiter_activity(days, today=None):
+    """Jobs posted and average advertised salary range per recruiter over the last `days` days."""
+    return """
+        SELECT ContactPerson, SUM(JobCount) AS JobsPosted,
+               SUM(SalaryMinSum) * 1.0 / NULLIF(SUM(SalaryCount), 0) AS AvgSalaryMin,
+               SUM(SalaryMaxSum) * 1.0 / NULLIF(SUM(SalaryCount), 0) AS AvgSalaryMax
+        FROM RecruiterStats
+        WHERE PeriodType = 'day' AND PeriodStart >= %s
+        GROUP BY ContactPerson
+        ORDER BY JobsPosted DESC
+    """, (recruiter_stats.window_start(days, today).isoformat(),)
+
+
+def posting_trend(period='week', since=None):
+    """Jobs posted by all recruiters per day, week or month, oldest first."""
+    return """
+        SELECT PeriodStart, SUM(JobCount) AS JobsPosted
+        FROM RecruiterStats
+        WHERE PeriodType = %s AND PeriodStart >= %s
+        GROUP BY PeriodStart
+        ORDER BY PeriodStart
+    """, (period, (since or recruiter_stats.ALL_TIME).isoformat())
+
+
+def candidate_search(skills, ed_level, min_experience, match="any"):
+    """Candidates with any/all of the skills, an education level and minimum experience."""
+    skill_clause, skill_params = skill_index.skill_match_clause('candidate', skills, match, alias="c")
+    return f"""
+        SELECT c.CandidateID, c.EdLevel, c.Gender, c.YearsCoded, c.Country, c.PreviousSalary, c.Skills
+        FROM Candidate c
+        WHERE {skill_clause}
+        AND c.EdLevel = %s
+        AND c.YearsCoded >= %s
+    """, (*skill_params, ed_level, min_experience)
+
+
+def candidates_by_ids(candidate_ids):
+    """Candidates with the given ids, e.g. one page of a facet selection."""
+    placeholders = ", ".join(["%s"] * len(candidate_ids))
+    return f"""
+        SELECT CandidateID, EdLevel, Gender, YearsCoded, Country, PreviousSalary, Skills
+        FROM Candidate
+        WHERE CandidateID IN ({placeholders})
+        ORDER BY CandidateID
+    """, tuple(int(candidate_id) for candidate_id in candidate_ids)
+
+
+def top_skills(limit=3, location=None):
+    """Most in-demand job skills, optionally in one location."""
+    return skill_demand.top_skills_query(limit=limit, location=location)
+
+
+def recruiters_by_location(location):
+    """Recruiters with jobs in a location."""
+    return """
+        SELECT r.ContactPerson, r.Company, j.Title, j.Location
+        FROM Recruiter r
+        JOIN Job j ON r.ContactPerson = j.ContactPerson
+        WHERE j.Location = %s
+    """, (location,)
+
+
+def top_paying_jobs_for_skill(skill, limit=5):
+    """Best-paid jobs requiring a skill."""
+    skill_clause, skill_params = skill_index.skill_match_clause('job', skill)
+    return f"""
+        SELECT Title, Location, SalaryRange, Skills
+        FROM Job
+        WHERE {skill_clause}
+        ORDER BY SalaryMax DESC
+        LIMIT %s
+    """, (*skill_params, limit)
+
+
+def jobs_by_min_experience(min_experience):
+    """Jobs, with their recruiter, requiring at least the given years of experience."""
+    return """
+        SELECT r.ContactPerson, r.Company, j.Title, j.Experience
+        FROM Recruiter r
+        JOIN Job j ON r.ContactPerson = j.ContactPerson
+        WHERE j.MinExperienceYears >= %s
+    """, (min_experience,)
+
+
+def mean_salary_by_education(ed_level):
+    """Mean previous salary of candidates with an education level."""
+    return """
+        SELECT AVG(PreviousSalary) AS MeanSalary
+        FROM Candidate
+        WHERE EdLevel = %s
+    """, (ed_level,)
+
+
+def mean_salary_by_skill(skill):
+    """Mean previous salary of candidates with a skill."""
+    skill_clause, skill_params = skill_index.skill_match_clause('candidate', skill)
+    return f"""
+        SELECT AVG(PreviousSalary) AS MeanSalary
+        FROM Candidate
+        WHERE {skill_clause}
+    """, skill_params
+
+
+def skill_salary_benchmark():
+    """Jobs and average advertised salary bounds per skill, from SkillSalary."""
+    return """
+        SELECT s.Name AS Skill, SUM(ss.JobCount) AS Jobs,
+               SUM(ss.SalaryMinSum) * 1.0 / SUM(ss.JobCount) AS AverageSalaryMin,
+               SUM(ss.SalaryMaxSum) * 1.0 / SUM(ss.JobCount) AS AverageSalaryMax
+        FROM SkillSalary ss
+        JOIN Skill s ON s.SkillId = ss.SkillId
+        GROUP BY ss.SkillId, s.Name
+        ORDER BY Jobs DESC, Skill
+    """, ()
+
+
+def skill_salary_buckets():
+    """Every SkillSalary bucket with its skill's name and demand, for skill_salary.benchmark()."""
+    return """
+        SELECT s.Name AS Skill, d.JobCount AS Demand, ss.Bucket, ss.JobCount, ss.SalaryMinSum, ss.SalaryMaxSum
+        FROM SkillSalary ss
+        JOIN Skill s ON s.SkillId = ss.SkillId
+        LEFT JOIN SkillDemand d ON d.SkillId = ss.SkillId
+    """, ()
@@ -0,0 +1,134 @@
+"""
+Query Result Cache
+Process-wide LRU cache of query results keyed by (query, parameters),
+shared by every Streamlit session. Each entry remembers the version of the
+tables it read; the write paths bump those versions after committing, so
+a write invalidates exactly the results that depended on the changed
+tables. Entries also expire after a TTL, which covers writes made by
+other processes (e.g. manage.py).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import db
+import query_metrics
+
+
+DEFAULT_CACHE_CONFIG = {
+    'max_entries': 256,  # Results kept before least recently used are evicted
+    'ttl': 300,          # Seconds a result stays valid without any write
+}
+CACHE_CONFIG = db.get_config('CACHE_CONFIG', DEFAULT_CACHE_CONFIG)
+
+
+class QueryCache:
+    """Thread-safe, size-bounded LRU of query results with TTL and table versions."""
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (result, expires_at, {table: version})
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'expirations': 0}
+
+    def versions(self, tables):
+        """Return the current version of each table."""
+        with self._lock:
+            return {table: self._versions.get(table, 0) for table in tables}
+
+    def bump(self, *tables):
+        """Record a committed write to the given tables."""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, key):
+        """Return (True, result) on a fresh hit, else (False, None)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return False, None
+            result, expires_at, versions = entry
+            if expires_at <= now:
+                stale = 'expirations'
+            elif any(self._versions.get(table, 0) != version for table, version in versions.items()):
+                stale = 'invalidations'
+            else:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return True, result
+            del self._entries[key]
+            self._stats[stale] += 1
+            self._stats['misses'] += 1
+            return False, None
+
+    def put(self, key, result, versions, ttl=None):
+        """Store a result computed against the given table versions."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if any(self._versions.get(table, 0) != version for table, version in versions.items()):
+                return  # A write committed while the query ran; don't cache stale data
+            self._entries[key] = (result, expires_at, versions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['max_entries'] = self.max_entries
+            stats['table_versions'] = dict(self._versions)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide query cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QueryCache(**CACHE_CONFIG)
+    return _cache
+
+
+def invalidate(*tables):
+    """Invalidate cached results that read any of the given tables."""
+    get_cache().bump(*tables)
+
+
+def fetch_all(cursor, query, params=(), tables=(), ttl=None, fresh=False):
+    """Run a read-only query through the cache and return its rows.
+
+    `tables` lists every table the query reads. With `fresh`, a cached
+    result is not used, though the new one is still stored. Returned rows
+    are shared between sessions and must not be modified.
+    """
+    cache = get_cache()
+    key = (type(cursor).__name__, " ".join(query.split()), tuple(params))
+    hit, result = (False, None) if fresh else cache.get(key)
+    if hit:
+        query_metrics.get_metrics().count(query_metrics.current_name(), cache_hits=1)
+        return result
+    versions = cache.versions(tables)
+    result = tuple(query_metrics.fetch_all(cursor, query, params))
+    cache.put(key, result, versions, ttl)
+    return result
@@ -0,0 +1,302 @@
+"""
+Query Metrics
+Process-wide timing of the dashboard's named queries. Each named query
+(e.g. "top_skills") is tracked through its phases (connect, execute,
+fetch, dataframe, render) with row and byte counts; the last `window`
+samples of every phase form a rolling latency histogram. Queries slower
+than `slow_query_ms` are logged together with their EXPLAIN plan. The
+metrics can be dumped as JSON or Prometheus text.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pymysql
+
+import db
+
+
+DEFAULT_METRICS_CONFIG = {
+    'slow_query_ms': 500,   # Queries slower than this are logged with their plan
+    'window': 1000,         # Samples per phase kept for the rolling histograms
+    'slow_log_size': 100,   # Slow queries kept for the Performance page
+    'dump_path': None,      # Write metrics here (.prom for Prometheus text, else JSON)
+    'dump_interval': 60,    # Seconds between automatic dumps
+}
+METRICS_CONFIG = db.get_config('METRICS_CONFIG', DEFAULT_METRICS_CONFIG)
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ('connect', 'execute', 'fetch', 'dataframe', 'render', 'total')
+
+UNNAMED = "untracked"
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _result_bytes(rows):
+    """Approximate the wire size of fetched rows without deep-sizing every object."""
+    total = 0
+    for row in rows:
+        for value in (row.values() if isinstance(row, dict) else row):
+            total += len(value) if isinstance(value, (str, bytes)) else 8
+    return total
+
+
+class QueryMetrics:
+    """Thread-safe rolling latency samples and counters per named query."""
+
+    def __init__(self, slow_query_ms=500, window=1000, slow_log_size=100,
+                 dump_path=None, dump_interval=60):
+        self.slow_query_ms = slow_query_ms
+        self.window = window
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self._samples = {}   # name -> {phase: deque of seconds}
+        self._counters = {}  # name -> {'calls', 'errors', 'cache_hits', 'rows', 'bytes'}
+        self._slow = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+        self._last_dump = time.monotonic()
+
+    def _entry(self, name):
+        """Return (samples, counters) for a name; caller holds the lock."""
+        if name not in self._samples:
+            self._samples[name] = {phase: deque(maxlen=self.window) for phase in PHASES}
+            self._counters[name] = {'calls': 0, 'errors': 0, 'cache_hits': 0, 'rows': 0, 'bytes': 0}
+        return self._samples[name], self._counters[name]
+
+    def record(self, name, phase, seconds):
+        with self._lock:
+            self._entry(name)[0][phase].append(seconds)
+
+    def count(self, name, **increments):
+        with self._lock:
+            counters = self._entry(name)[1]
+            for key, value in increments.items():
+                counters[key] += value
+
+    def record_slow(self, name, query, params, seconds, plan):
+        entry = {
+            'name': name, 'ms': round(seconds * 1000, 1), 'query': " ".join(query.split()),
+            'params': [str(param) for param in params], 'plan': plan,
+            'at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            self._slow.appendleft(entry)
+        logger.warning("Slow query %s (%.0f ms): %s params=%s plan=%s",
+                       name, entry['ms'], entry['query'], entry['params'], plan)
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow)
+
+    def snapshot(self):
+        """Return {name: {counters..., phases: {phase: summary}}} for every tracked query."""
+        with self._lock:
+            samples = {name: {phase: list(values) for phase, values in phases.items()}
+                       for name, phases in self._samples.items()}
+            counters = {name: dict(values) for name, values in self._counters.items()}
+        snapshot = {}
+        for name, phases in samples.items():
+            summary = dict(counters[name])
+            summary['phases'] = {}
+            for phase, values in phases.items():
+                if not values:
+                    continue
+                ordered = sorted(values)
+                summary['phases'][phase] = {
+                    'count': len(ordered),
+                    'mean_ms': sum(ordered) / len(ordered) * 1000,
+                    'p50_ms': _percentile(ordered, 0.50) * 1000,
+                    'p95_ms': _percentile(ordered, 0.95) * 1000,
+                    'p99_ms': _percentile(ordered, 0.99) * 1000,
+                    'max_ms': ordered[-1] * 1000,
+                    'sum_seconds': sum(ordered),
+                    'buckets': [sum(1 for value in ordered if value <= bound) for bound in BUCKETS],
+                }
+            snapshot[name] = summary
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counters.clear()
+            self._slow.clear()
+
+    def to_json(self):
+        return json.dumps({'queries': self.snapshot(), 'slow_queries': self.slow_queries(),
+                           'buckets': list(BUCKETS)}, indent=2, default=str)
+
+    def to_prometheus(self):
+        """Render the metrics in the Prometheus text exposition format.
+
+        Histograms cover the rolling window, so they can go down as old
+        samples drop out; the counters are cumulative.
+        """
+        lines = [
+            "# HELP talent_query_seconds Query phase latency over the rolling window.",
+            "# TYPE talent_query_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for name, summary in snapshot.items():
+            for phase, stats in summary['phases'].items():
+                labels = f'query="{name}",phase="{phase}"'
+                for bound, count in zip(BUCKETS, stats['buckets']):
+                    lines.append(f'talent_query_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'talent_query_seconds_bucket{{{labels},le="+Inf"}} {stats["count"]}')
+                lines.append(f'talent_query_seconds_sum{{{labels}}} {stats["sum_seconds"]:.6f}')
+                lines.append(f'talent_query_seconds_count{{{labels}}} {stats["count"]}')
+        for counter in ('calls', 'errors', 'cache_hits', 'rows', 'bytes'):
+            lines.append(f"# TYPE talent_query_{counter}_total counter")
+            for name, summary in snapshot.items():
+                lines.append(f'talent_query_{counter}_total{{query="{name}"}} {summary[counter]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write the metrics to `path` atomically (Prometheus text for .prom, else JSON)."""
+        text = self.to_prometheus() if path.endswith('.prom') else self.to_json()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            handle.write(text)
+        os.replace(temp_path, path)
+
+    def maybe_dump(self):
+        """Dump to the configured path when dump_interval has passed since the last dump."""
+        if not self.dump_path:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_dump < self.dump_interval:
+                return
+            self._last_dump = now
+        try:
+            self.dump(self.dump_path)
+        except OSError as e:
+            logger.warning("Could not write query metrics to %s: %s", self.dump_path, e)
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+_current = threading.local()
+
+
+def get_metrics():
+    """Return the process-wide query metrics, creating them on first use."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = QueryMetrics(**METRICS_CONFIG)
+    return _metrics
+
+
+def current_name():
+    """Return the name of the query being tracked on this thread."""
+    return getattr(_current, 'name', None) or UNNAMED
+
+
+@contextmanager
+def track(name):
+    """Attribute the phases recorded inside the block to `name` and time the whole block."""
+    metrics = get_metrics()
+    previous = getattr(_current, 'name', None)
+    _current.name = name
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(name, 'total', time.perf_counter() - start)
+        metrics.count(name, calls=1)
+        _current.name = previous
+        metrics.maybe_dump()
+
+
+@contextmanager
+def phase(phase_name, name=None):
+    """Time one phase (connect, dataframe, render, ...) of the current query."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        get_metrics().record(name or current_name(), phase_name, time.perf_counter() - start)
+
+
+def explain(cursor, query, params):
+    """Return the EXPLAIN rows for a SELECT, or None for other statements."""
+    if not query.lstrip().upper().startswith("SELECT"):
+        return None
+    # Embedded (SQLite) connections describe their plan with EXPLAIN QUERY PLAN
+    dialect = getattr(cursor.connection, 'dialect', 'mysql')
+    keyword = "EXPLAIN QUERY PLAN" if dialect == 'sqlite' else "EXPLAIN"
+    explain_cursor = cursor.connection.cursor(pymysql.cursors.DictCursor)
+    try:
+        explain_cursor.execute(f"{keyword} {query}", params)
+        return [{key: value for key, value in row.items() if value is not None}
+                for row in explain_cursor.fetchall()]
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        explain_cursor.close()
+
+
+def _check_slow(metrics, name, cursor, query, params, seconds):
+    if seconds * 1000 >= metrics.slow_query_ms:
+        metrics.record_slow(name, query, params, seconds, explain(cursor, query, params))
+
+
+def execute(cursor, query, params=(), name=None):
+    """Run a statement, recording its execute time and affected rows. Returns the row count."""
+    metrics = get_metrics()
+    name = name or current_name()
+    start = time.perf_counter()
+    try:
+        rowcount = cursor.execute(query, params)
+    except Exception:
+        metrics.count(name, errors=1)
+        raise
+    elapsed = time.perf_counter() - start
+    metrics.record(name, 'execute', elapsed)
+    metrics.count(name, rows=max(rowcount or 0, 0))
+    _check_slow(metrics, name, cursor, query, params, elapsed)
+    return rowcount
+
+
+def fetch_all(cursor, query, params=(), name=None):
+    """Run a query and fetch every row, recording execute and fetch times, rows and bytes."""
+    metrics = get_metrics()
+    name = name or current_name()
+    start = time.perf_counter()
+    try:
+        cursor.execute(query, params)
+        executed = time.perf_counter()
+        rows = cursor.fetchall()
+    except Exception:
+        metrics.count(name, errors=1)
+        raise
+    done = time.perf_counter()
+    metrics.record(name, 'execute', executed - start)
+    metrics.record(name, 'fetch', done - executed)
+    metrics.count(name, rows=len(rows), bytes=_result_bytes(rows))
+    _check_slow(metrics, name, cursor, query, params, done - start)
+    return rows
+
+
+def fetch_one(cursor, query, params=(), name=None):
+    """Like fetch_all, returning only the first row (or None)."""
+    rows = fetch_all(cursor, query, params, name)
+    return rows[0] if rows else None
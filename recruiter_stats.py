@@ -0,0 +1,162 @@
+"""
+Recruiter Statistics
+Jobs posted and advertised salary totals per recruiter per day, week and
+month of Job.PostedDate (RecruiterStats), plus one 'total' row per
+recruiter covering every job, dated or not. The job write paths keep the
+table current incrementally, so Recruiter Analysis reads rolling windows
+from a bounded number of summary rows instead of grouping the Job table.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+import db
+
+
+PERIODS = ('day', 'week', 'month')
+TOTAL = 'total'
+
+# PeriodStart of the 'total' rows (the smallest MySQL DATE)
+ALL_TIME = date(1000, 1, 1)
+
+# Rolling windows offered on the Recruiter Analysis page, in days
+WINDOWS = (7, 30, 90)
+
+# Counters per row, in column order
+COUNTERS = ('JobCount', 'SalaryCount', 'SalaryMinSum', 'SalaryMaxSum')
+
+
+def _as_date(value):
+    # Embedded databases hand DATE columns back as ISO strings
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def period_starts(posted):
+    """Return the (PeriodType, PeriodStart) buckets a job posted on `posted` counts in."""
+    buckets = [(TOTAL, ALL_TIME)]
+    posted = _as_date(posted)
+    if posted:
+        buckets.append(('day', posted))
+        buckets.append(('week', posted - timedelta(days=posted.weekday())))  # Weeks start on Monday
+        buckets.append(('month', posted.replace(day=1)))
+    return buckets
+
+
+def stored_job_state(cursor, job_id):
+    """Return (ContactPerson, PostedDate, SalaryMin, SalaryMax) of a stored job, or None."""
+    cursor.execute(
+        "SELECT ContactPerson, PostedDate, SalaryMin, SalaryMax FROM Job WHERE JobId = %s", (job_id,)
+    )
+    row = cursor.fetchone()
+    return tuple(row) if row is not None else None
+
+
+def _add(deltas, state, sign):
+    contact_person, posted, salary_min, salary_max = state
+    if contact_person is None:
+        return
+    salaried = salary_min is not None and salary_max is not None
+    for bucket in period_starts(posted):
+        counters = deltas[(contact_person, *bucket)]
+        counters[0] += sign
+        if salaried:
+            counters[1] += sign
+            counters[2] += sign * salary_min
+            counters[3] += sign * salary_max
+
+
+def record_job_change(cursor, old=None, new=None):
+    """Apply the deltas for one job write in the caller's transaction.
+
+    `old` and `new` are the job's (ContactPerson, PostedDate, SalaryMin,
+    SalaryMax) before and after the write; pass None for `old` on insert and
+    for `new` on delete.
+    """
+    record_job_changes(cursor, [(old, new)])
+
+
+def record_job_changes(cursor, changes):
+    """Apply the combined deltas of many (old, new) job writes at once."""
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+    for old, new in changes:
+        if old is not None:
+            _add(deltas, old, -1)
+        if new is not None:
+            _add(deltas, new, 1)
+    rows = [(contact_person, period, start.isoformat(), *counters)
+            for (contact_person, period, start), counters in deltas.items() if any(counters)]
+    if not rows:
+        return
+    cursor.executemany("""
+        INSERT INTO RecruiterStats (ContactPerson, PeriodType, PeriodStart,
+                                    JobCount, SalaryCount, SalaryMinSum, SalaryMaxSum)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE JobCount = JobCount + VALUES(JobCount),
+                                SalaryCount = SalaryCount + VALUES(SalaryCount),
+                                SalaryMinSum = SalaryMinSum + VALUES(SalaryMinSum),
+                                SalaryMaxSum = SalaryMaxSum + VALUES(SalaryMaxSum)
+    """, rows)
+    cursor.executemany(
+        "DELETE FROM RecruiterStats WHERE ContactPerson = %s AND PeriodType = %s "
+        "AND PeriodStart = %s AND JobCount <= 0",
+        [row[:3] for row in rows if row[3] < 0],
+    )
+
+
+def _aggregate(connection, batch_size=db.DEFAULT_BATCH_SIZE):
+    """Compute every RecruiterStats row from Job: {(recruiter, period, start): counters}."""
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+    for _, rows in db.iter_batches(
+        connection, "SELECT ContactPerson, PostedDate, SalaryMin, SalaryMax FROM Job", batch_size=batch_size
+    ):
+        for row in rows:
+            _add(deltas, row, 1)
+    return {key: counters for key, counters in deltas.items() if counters[0]}
+
+
+def rebuild(connection, batch_size=db.DEFAULT_BATCH_SIZE):
+    """Recompute RecruiterStats from Job in one transaction."""
+    expected = _aggregate(connection, batch_size)
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM RecruiterStats")
+        rows = [(contact_person, period, start.isoformat(), *counters)
+                for (contact_person, period, start), counters in expected.items()]
+        for offset in range(0, len(rows), batch_size):
+            cursor.executemany("""
+                INSERT INTO RecruiterStats (ContactPerson, PeriodType, PeriodStart,
+                                            JobCount, SalaryCount, SalaryMinSum, SalaryMaxSum)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, rows[offset:offset + batch_size])
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def check_consistency(connection):
+    """Compare RecruiterStats with a fresh aggregation of Job.
+
+    Returns a list of (key, stored, expected) tuples, empty when the table
+    is consistent.
+    """
+    expected = _aggregate(connection)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT ContactPerson, PeriodType, PeriodStart, {', '.join(COUNTERS)} FROM RecruiterStats
+        """)
+        stored = {(row[0], row[1], _as_date(row[2])): [int(value) for value in row[3:]]
+                  for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+    return [(key, stored.get(key), expected.get(key))
+            for key in sorted(stored.keys() | expected.keys(), key=str)
+            if stored.get(key) != expected.get(key)]
+
+
+def window_start(days, today=None):
+    """Return the first day of the rolling `days`-day window ending today."""
+    return (today or date.today()) - timedelta(days=days - 1)
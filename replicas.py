@@ -0,0 +1,277 @@
+"""
+Read Replicas
+Routes the read-only pages to the MySQL replicas in REPLICA_CONFIG (or the
+TALENT_DB_REPLICAS environment variable) while every write stays on the
+primary backend. A replica is picked round-robin or by lowest recent ping
+latency among the healthy ones. A background thread pings every replica
+each health_interval seconds and takes it out of rotation while it is
+unreachable or lags the primary by more than max_lag_seconds; with no
+healthy replica, reads fail over to the primary. A session that has just
+written reads from the primary for sticky_seconds, so it sees its own
+writes.
+
+The query cache is shared by all sessions and only knows which writes were
+committed, not whether a replica has applied them: a result read from a
+replica just after a write would be stored as current. Cached pages
+therefore keep replica results for at most max_lag_seconds (cache_ttl) and
+sticky sessions skip cached results (is_sticky), reading the primary.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+
+import db
+import storage
+
+
+DEFAULT_REPLICA_CONFIG = {
+    'replicas': [],              # DB_CONFIG overrides per replica, e.g. {'host': '10.0.0.2', 'port': 3306}
+    'selection': 'round_robin',  # 'round_robin' or 'least_latency'
+    'sticky_seconds': 10,        # Reads stay on the primary this long after a session writes
+    'health_interval': 10,       # Seconds between replica health checks
+    'max_lag_seconds': 30,       # Replicas further behind the primary are skipped
+}
+REPLICA_CONFIG = db.get_config('REPLICA_CONFIG', DEFAULT_REPLICA_CONFIG)
+
+SELECTIONS = ('round_robin', 'least_latency')
+
+# Weight of the newest ping in a replica's smoothed latency
+LATENCY_SMOOTHING = 0.3
+
+
+def parse_address(address):
+    """Return the DB_CONFIG overrides for a "host[:port]" address."""
+    host, _, port = address.strip().partition(":")
+    return {'host': host, 'port': int(port)} if port else {'host': host}
+
+
+def replica_configs(config=None, environ=os.environ):
+    """Return the full connection settings of every configured replica.
+
+    TALENT_DB_REPLICAS ("host1:3307,host2") replaces the replicas of the
+    config file; either way the rest of the settings come from DB_CONFIG.
+    """
+    replicas = (config or REPLICA_CONFIG)['replicas']
+    if environ.get('TALENT_DB_REPLICAS'):
+        replicas = [parse_address(address) for address in environ['TALENT_DB_REPLICAS'].split(",")
+                    if address.strip()]
+    return [{**db.DB_CONFIG, **replica} for replica in replicas]
+
+
+def replication_lag(cursor):
+    """Return the replica's Seconds_Behind_Source: 0 on a server that is not a replica,
+    infinity when replication is stopped, None when the status cannot be read."""
+    for statement, column in (("SHOW REPLICA STATUS", 'Seconds_Behind_Source'),
+                              ("SHOW SLAVE STATUS", 'Seconds_Behind_Master')):
+        try:
+            cursor.execute(statement)
+        except pymysql.err.MySQLError:
+            continue  # Older servers only know SHOW SLAVE STATUS; it also needs REPLICATION CLIENT
+        row = cursor.fetchone()
+        if row is None:
+            return 0.0
+        lag = row.get(column)
+        return float('inf') if lag is None else float(lag)
+    return None
+
+
+class Replica:
+    """One replica's connection pool and its latest health."""
+
+    def __init__(self, config, pool_config=None):
+        self.name = f"{config['host']}:{config.get('port', 3306)}"
+        self.backend = storage.MySQLBackend(db.ConnectionPool(config, **(pool_config or db.POOL_CONFIG)))
+        self.healthy = True  # Until a check or a failed checkout says otherwise
+        self.latency = None  # Smoothed ping time in seconds
+        self.lag = None
+        self.error = None
+        self.checked_at = None
+        self._lock = threading.Lock()
+
+    def mark_down(self, error):
+        with self._lock:
+            self.healthy = False
+            self.error = str(error)
+
+    def check(self, max_lag_seconds):
+        """Ping the replica and read its lag; returns whether it is usable."""
+        start = time.perf_counter()
+        try:
+            with self.backend.connection() as connection:
+                cursor = connection.cursor(pymysql.cursors.DictCursor)
+                try:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchall()
+                    elapsed = time.perf_counter() - start
+                    lag = replication_lag(cursor)
+                finally:
+                    cursor.close()
+        except Exception as e:
+            self.mark_down(e)
+            self.checked_at = time.time()
+            return False
+        with self._lock:
+            self.latency = elapsed if self.latency is None else (
+                LATENCY_SMOOTHING * elapsed + (1 - LATENCY_SMOOTHING) * self.latency)
+            self.lag = lag
+            self.healthy = lag is None or lag <= max_lag_seconds
+            self.error = None if self.healthy else f"Replication lag {lag}s"
+            self.checked_at = time.time()
+        return self.healthy
+
+    def status(self):
+        with self._lock:
+            return {'name': self.name, 'healthy': self.healthy,
+                    'latency_ms': None if self.latency is None else round(self.latency * 1000, 2),
+                    'lag_seconds': self.lag, 'error': self.error, 'checked_at': self.checked_at,
+                    'pool': self.backend.stats()}
+
+
+class ReplicaRouter:
+    """A read-only backend spreading checkouts over healthy replicas, falling back to the primary."""
+
+    name = 'replicas'
+
+    def __init__(self, primary, replicas, selection='round_robin', sticky_seconds=10,
+                 health_interval=10, max_lag_seconds=30):
+        if selection not in SELECTIONS:
+            raise ValueError(f"Unknown replica selection: {selection}")
+        self.primary = primary
+        self.replicas = replicas
+        self.selection = selection
+        self.sticky_seconds = sticky_seconds
+        self.health_interval = health_interval
+        self.max_lag_seconds = max_lag_seconds
+        self._next = 0
+        self._owners = {}  # id(connection) -> backend it was checked out from
+        self._lock = threading.Lock()
+        self._stats = {'replica_reads': 0, 'primary_reads': 0, 'sticky_reads': 0, 'failovers': 0}
+        self._thread = threading.Thread(target=self._check_loop, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def _check_loop(self):
+        while True:
+            self.check_all()
+            time.sleep(self.health_interval)
+
+    def check_all(self):
+        """Run a health check on every replica now."""
+        for replica in self.replicas:
+            replica.check(self.max_lag_seconds)
+
+    def candidates(self):
+        """Healthy replicas in the order they should be tried."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if self.selection == 'least_latency':
+            return sorted(healthy, key=lambda replica: float('inf') if replica.latency is None else replica.latency)
+        with self._lock:
+            start = self._next % len(healthy) if healthy else 0
+            self._next += 1
+        return healthy[start:] + healthy[:start]
+
+    def acquire(self):
+        """Check out a replica connection, or a primary one when no replica can serve."""
+        for replica in self.candidates():
+            try:
+                connection = replica.backend.acquire()
+            except Exception as e:
+                replica.mark_down(e)
+                with self._lock:
+                    self._stats['failovers'] += 1
+                continue
+            self._own(connection, replica.backend, 'replica_reads')
+            return connection
+        connection = self.primary.acquire()
+        self._own(connection, self.primary, 'primary_reads')
+        return connection
+
+    def _own(self, connection, backend, counter):
+        with self._lock:
+            self._owners[id(connection)] = backend
+            self._stats[counter] += 1
+
+    def release(self, connection, discard=False):
+        with self._lock:
+            backend = self._owners.pop(id(connection), self.primary)
+        backend.release(connection, discard=discard)
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def is_replica(self, connection):
+        """True when a connection checked out here came from a replica rather than the primary."""
+        with self._lock:
+            backend = self._owners.get(id(connection), self.primary)
+        return backend is not self.primary
+
+    def is_sticky(self, last_write_at=None):
+        """True while a session that wrote at `last_write_at` reads from the primary."""
+        return last_write_at is not None and time.time() - last_write_at < self.sticky_seconds
+
+    def for_session(self, last_write_at=None):
+        """Return the backend a session's reads use: the primary right after it wrote, else self."""
+        if self.is_sticky(last_write_at):
+            with self._lock:
+                self._stats['sticky_reads'] += 1
+            return self.primary
+        return self
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        return {'backend': self.name, 'selection': self.selection, **stats,
+                'replicas': [replica.status() for replica in self.replicas]}
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """Return the process-wide replica router, or None when no replicas are configured.
+
+    Replicas only apply to a MySQL primary.
+    """
+    global _router
+    if _router is None:
+        primary = storage.get_backend()
+        configs = replica_configs()
+        if not configs or primary.name != 'mysql':
+            return None
+        with _router_lock:
+            if _router is None:
+                settings = {key: REPLICA_CONFIG[key] for key in
+                            ('selection', 'sticky_seconds', 'health_interval', 'max_lag_seconds')}
+                _router = ReplicaRouter(primary, [Replica(config) for config in configs], **settings)
+    return _router
+
+
+def read_backend(last_write_at=None):
+    """Return the backend for a read-only page of a session that last wrote at `last_write_at`."""
+    router = get_router()
+    if router is None:
+        return storage.get_backend()
+    return router.for_session(last_write_at)
+
+
+def is_sticky(last_write_at=None):
+    """True while a session that wrote at `last_write_at` has its reads pinned to the primary."""
+    router = get_router()
+    return router is not None and router.is_sticky(last_write_at)
+
+
+def cache_ttl(connection, ttl):
+    """Return how long to cache a result read on `connection`: `ttl`, capped at max_lag_seconds on a replica."""
+    router = get_router()
+    if router is None or not router.is_replica(connection):
+        return ttl
+    return min(ttl, router.max_lag_seconds)
@@ -0,0 +1,228 @@
+"""
+Salary Analytics
+Count, mean, median, p10/p90 and a histogram of Candidate.PreviousSalary
+for every education level, country, experience bucket and skill, computed
+together from one scan of Candidate and CandidateSkill with vectorized
+pandas groupby. The result is cached process-wide, so any drill-down on
+the dashboard is answered from memory; it is recomputed after a Candidate
+write bumps the table version (see query_cache) or once the TTL expires.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import db
+import query_cache
+
+
+DEFAULT_SALARY_ANALYTICS_CONFIG = {
+    'ttl': 600,            # Seconds the statistics are served without any Candidate write
+    'histogram_bins': 20,  # Equal-width salary bins shared by every group
+}
+SALARY_ANALYTICS_CONFIG = db.get_config('SALARY_ANALYTICS_CONFIG', DEFAULT_SALARY_ANALYTICS_CONFIG)
+
+# dimension -> label shown on the dashboard
+DIMENSIONS = {
+    'EdLevel': "Education Level",
+    'Country': "Country",
+    'Experience': "Years Coded",
+    'Skill': "Skill",
+}
+
+# Lower bounds of the YearsCoded buckets; the last bucket is open-ended
+EXPERIENCE_BUCKETS = (0, 2, 5, 10, 15, 20, 30)
+
+STATISTICS = ('count', 'mean', 'median', 'p10', 'p90')
+
+# The histogram range ends at this salary quantile; higher salaries land in the last bin
+HISTOGRAM_UPPER_QUANTILE = 0.99
+
+# Tables whose writes make the statistics stale
+SOURCE_TABLES = ('Candidate',)
+
+
+def experience_labels():
+    """Return the label of every YearsCoded bucket, e.g. "2-4" and "30+"."""
+    bounds = EXPERIENCE_BUCKETS
+    return [f"{low}-{high - 1}" for low, high in zip(bounds, bounds[1:])] + [f"{bounds[-1]}+"]
+
+
+def histogram_edges(salaries, bins):
+    """Equal-width bin edges from 0 to a high quantile of `salaries`, rounded up to 10K."""
+    upper = float(np.quantile(salaries, HISTOGRAM_UPPER_QUANTILE)) if len(salaries) else 0.0
+    return np.linspace(0, max(np.ceil(upper / 10_000) * 10_000, 10_000), bins + 1)
+
+
+def _summarize(groups, salaries, bin_index, bins, order=None):
+    """Statistics and histogram counts for every group, by groupby over all rows at once."""
+    if not len(salaries):
+        return pd.DataFrame(columns=list(STATISTICS)), pd.DataFrame(columns=range(bins))
+    frame = pd.DataFrame({'group': groups, 'salary': salaries, 'bin': bin_index})
+    grouped = frame.groupby('group', observed=True, sort=False)['salary']
+    summary = grouped.agg(['count', 'mean'])
+    quantiles = grouped.quantile([0.1, 0.5, 0.9]).unstack()
+    summary['median'] = quantiles[0.5]
+    summary['p10'] = quantiles[0.1]
+    summary['p90'] = quantiles[0.9]
+    summary = summary[list(STATISTICS)]
+    if order is None:
+        summary = summary.sort_values('count', ascending=False, kind='stable')
+    else:
+        summary = summary.reindex([value for value in order if value in summary.index])
+    histogram = (frame.groupby(['group', 'bin'], observed=True).size()
+                 .unstack(fill_value=0)
+                 .reindex(index=summary.index, columns=range(bins), fill_value=0))
+    return summary, histogram
+
+
+class SalaryAnalytics:
+    """Immutable per-group salary statistics and histograms for every dimension."""
+
+    def __init__(self, candidates, links, skill_names, bins):
+        """Build from Candidate rows with a salary, CandidateSkill links and Skill names (DataFrames)."""
+        salaries = pd.to_numeric(candidates['PreviousSalary']).to_numpy(dtype=np.float64)
+        self.edges = histogram_edges(salaries, bins)
+        bin_index = np.clip(np.searchsorted(self.edges, salaries, side='right') - 1, 0, bins - 1)
+        experience = pd.cut(pd.to_numeric(candidates['YearsCoded']),
+                            [*EXPERIENCE_BUCKETS, np.inf], right=False, labels=experience_labels())
+
+        # One row per skill link of a candidate with a salary
+        positions = pd.Index(candidates['CandidateId']).get_indexer(links['CandidateId'])
+        linked = positions >= 0
+        positions = positions[linked]
+        names = pd.Series(skill_names['Name'].to_numpy(), index=skill_names['SkillId'].to_numpy())
+        link_skills = pd.Categorical(names.reindex(links['SkillId'].to_numpy()[linked]).to_numpy())
+
+        self._tables = {
+            'EdLevel': _summarize(candidates['EdLevel'].to_numpy(), salaries, bin_index, bins),
+            'Country': _summarize(candidates['Country'].to_numpy(), salaries, bin_index, bins),
+            'Experience': _summarize(experience, salaries, bin_index, bins, order=experience_labels()),
+            'Skill': _summarize(link_skills, salaries[positions], bin_index[positions], bins),
+        }
+        self.candidates = len(salaries)
+        self.skill_links = int(linked.sum())
+        self.built_at = time.time()
+
+    def groups(self, dimension):
+        """Return the groups of a dimension, largest first (experience buckets in order)."""
+        return list(self._tables[dimension][0].index)
+
+    def summary(self, dimension):
+        """Return a DataFrame of the statistics of every group of a dimension."""
+        return self._tables[dimension][0].rename_axis(DIMENSIONS[dimension])
+
+    def group(self, dimension, value):
+        """Return the statistics of one group as a dict, or None when it has no salaries."""
+        summary = self._tables[dimension][0]
+        if value not in summary.index:
+            return None
+        row = summary.loc[value]
+        return {'count': int(row['count']), **{name: float(row[name]) for name in STATISTICS[1:]}}
+
+    def histogram(self, dimension, value):
+        """Return the salary histogram of one group: a 'Candidates' column indexed by bin label."""
+        histogram = self._tables[dimension][1]
+        counts = histogram.loc[value].to_numpy() if value in histogram.index else np.zeros(len(self.edges) - 1)
+        return pd.DataFrame({'Candidates': counts.astype(int)}, index=pd.Index(self.bin_labels(), name='Salary'))
+
+    def bin_labels(self):
+        """Return a label per histogram bin; the last bin is open-ended."""
+        labels = [f"${low / 1000:,.0f}K-${high / 1000:,.0f}K" for low, high in zip(self.edges, self.edges[1:])]
+        labels[-1] = f"${self.edges[-2] / 1000:,.0f}K+"
+        return labels
+
+    def stats(self):
+        """Return row counts, group counts and approximate memory use."""
+        memory = sum(summary.memory_usage(deep=True).sum() + histogram.memory_usage(deep=True).sum()
+                     for summary, histogram in self._tables.values())
+        return {
+            'candidates': self.candidates,
+            'skill_links': self.skill_links,
+            'groups': {dimension: len(table[0]) for dimension, table in self._tables.items()},
+            'memory_mb': round(float(memory) / 1e6, 2),
+        }
+
+
+def _load_frame(connection, query, columns, batch_size):
+    frames = [pd.DataFrame.from_records(rows, columns=columns)
+              for _, rows in db.iter_batches(connection, query, batch_size=batch_size) if rows]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def compute(connection, bins=None, batch_size=db.DEFAULT_BATCH_SIZE):
+    """Scan Candidate, CandidateSkill and Skill once each and build SalaryAnalytics."""
+    candidates = _load_frame(connection, """
+        SELECT CandidateId, EdLevel, Country, YearsCoded, PreviousSalary FROM Candidate
+        WHERE PreviousSalary IS NOT NULL
+    """, ['CandidateId', 'EdLevel', 'Country', 'YearsCoded', 'PreviousSalary'], batch_size)
+    links = _load_frame(connection, "SELECT CandidateId, SkillId FROM CandidateSkill",
+                        ['CandidateId', 'SkillId'], batch_size)
+    skill_names = _load_frame(connection, "SELECT SkillId, Name FROM Skill", ['SkillId', 'Name'], batch_size)
+    return SalaryAnalytics(candidates, links, skill_names, bins or SALARY_ANALYTICS_CONFIG['histogram_bins'])
+
+
+class SalaryAnalyticsCache:
+    """Holds the latest SalaryAnalytics and recomputes it only when stale."""
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._analytics = None
+        self._versions = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'builds': 0}
+
+    def current(self):
+        """Return the statistics if they are still fresh, else None; needs no connection."""
+        versions = query_cache.get_cache().versions(SOURCE_TABLES)
+        with self._lock:
+            if (self._analytics is None or versions != self._versions
+                    or time.monotonic() >= self._expires_at):
+                return None
+            self._stats['hits'] += 1
+            return self._analytics
+
+    def get(self, connection, refresh=False):
+        """Return fresh statistics, computing them with `connection` when stale.
+
+        Concurrent callers wait for a single computation instead of each
+        scanning the tables.
+        """
+        # Versions are read before the scan, so a write during it triggers another build
+        versions = query_cache.get_cache().versions(SOURCE_TABLES)
+        with self._lock:
+            if (refresh or self._analytics is None or versions != self._versions
+                    or time.monotonic() >= self._expires_at):
+                self._analytics = compute(connection)
+                self._versions = versions
+                self._expires_at = time.monotonic() + self.ttl
+                self._stats['builds'] += 1
+            else:
+                self._stats['hits'] += 1
+            return self._analytics
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the process-wide salary analytics cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SalaryAnalyticsCache(ttl=SALARY_ANALYTICS_CONFIG['ttl'])
+    return _cache
+
+
+def get_analytics(connection, refresh=False):
+    """Return the cached SalaryAnalytics, recomputing it when stale."""
+    return get_cache().get(connection, refresh)
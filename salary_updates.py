@@ -0,0 +1,175 @@
+"""
+Salary Range Updates
+Changes Job.SalaryRange (and the parsed SalaryMin / SalaryMax) of one job
+or of every job in a CSV file of JobId -> new range. A bulk update runs as
+one transaction of a few set-based statements per chunk of jobs: current
+values are read with IN lists and the new ones written by a single UPDATE
+with CASE expressions, so the job_salary_audit trigger still logs each
+changed row while the client makes no round trip per row. RecruiterStats
+and SkillSalary receive the combined deltas of the whole update.
+"""
+
+import csv
+import itertools
+
+import job_fields
+import query_metrics
+import recruiter_stats
+import skill_salary
+
+
+# Jobs read and updated per statement; bounds the statements' parameter counts
+DEFAULT_CHUNK_SIZE = 500
+
+# Rejects kept in the report for display
+MAX_REPORTED_REJECTS = 100
+
+# Accepted CSV header spellings of the two columns
+HEADER_ALIASES = {
+    'jobid': 'JobId', 'job id': 'JobId', 'job_id': 'JobId', 'id': 'JobId',
+    'salaryrange': 'SalaryRange', 'salary range': 'SalaryRange', 'salary_range': 'SalaryRange',
+    'new salary range': 'SalaryRange', 'salary': 'SalaryRange',
+}
+
+
+def read_csv(handle):
+    """Read a JobId,SalaryRange CSV from a text file object.
+
+    A header row is optional (without one the first two columns are used).
+    Returns (updates, rejects): [(line, job_id, salary_range)] and [(line, error)].
+    """
+    reader = csv.reader(handle)
+    first = next(reader, None)
+    if first is None:
+        return [], []
+    columns = [HEADER_ALIASES.get(name.strip().casefold()) for name in first]
+    if 'JobId' in columns and 'SalaryRange' in columns:
+        job_index, salary_index = columns.index('JobId'), columns.index('SalaryRange')
+        rows = reader
+    elif first and first[0].strip().isdigit():
+        job_index, salary_index = 0, 1
+        rows = itertools.chain([first], reader)
+    else:
+        raise ValueError("CSV needs JobId and SalaryRange columns.")
+
+    updates, rejects = [], []
+    for fields in rows:
+        line = reader.line_num
+        if not any(field.strip() for field in fields):
+            continue
+        job_id = fields[job_index].strip() if job_index < len(fields) else ""
+        salary_range = " ".join(fields[salary_index].split()) if salary_index < len(fields) else ""
+        if not job_id.isdigit():
+            rejects.append((line, f"JobId is not a number: {job_id!r}"))
+        elif not salary_range:
+            rejects.append((line, "SalaryRange is empty"))
+        else:
+            updates.append((line, int(job_id), salary_range))
+    return updates, rejects
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _stored_states(cursor, job_ids):
+    """Return {JobId: (SalaryRange, recruiter_stats state, skill_salary state)} of the stored jobs."""
+    placeholders = ", ".join(["%s"] * len(job_ids))
+    cursor.execute(
+        f"SELECT JobId, SalaryRange, ContactPerson, PostedDate, SalaryMin, SalaryMax "
+        f"FROM Job WHERE JobId IN ({placeholders})", job_ids
+    )
+    jobs = cursor.fetchall()
+    cursor.execute(f"SELECT JobId, SkillId FROM JobSkill WHERE JobId IN ({placeholders})", job_ids)
+    skill_ids = {}
+    for job_id, skill_id in cursor.fetchall():
+        skill_ids.setdefault(job_id, set()).add(skill_id)
+    return {
+        job_id: (salary_range, (contact_person, posted, salary_min, salary_max),
+                 (skill_ids.get(job_id, set()), salary_min, salary_max))
+        for job_id, salary_range, contact_person, posted, salary_min, salary_max in jobs
+    }
+
+
+def _write_chunk(cursor, changes):
+    """Set the new salary columns of many jobs with one UPDATE."""
+    cases = " ".join(["WHEN %s THEN %s"] * len(changes))
+    placeholders = ", ".join(["%s"] * len(changes))
+    params = []
+    for column in range(3):
+        params.extend(value for job_id, values in changes for value in (job_id, values[column]))
+    params.extend(job_id for job_id, _ in changes)
+    query_metrics.execute(cursor, f"""
+        UPDATE Job
+        SET SalaryRange = CASE JobId {cases} END,
+            SalaryMin = CASE JobId {cases} END,
+            SalaryMax = CASE JobId {cases} END
+        WHERE JobId IN ({placeholders})
+    """, params, name="salary_update")
+
+
+def apply_updates(connection, updates, chunk_size=DEFAULT_CHUNK_SIZE, rejects=()):
+    """Apply [(line, job_id, salary_range)] in one transaction and commit.
+
+    Unparseable ranges, unknown jobs and repeated JobIds are rejected (added
+    to the given `rejects`); jobs whose range is already the new one are
+    left alone. Returns a report dict: rows, updated (JobIds), unchanged,
+    rejected and the first rejects.
+    """
+    rows = len(updates) + len(rejects)
+    rejects, valid, seen = list(rejects), [], {}
+    for line, job_id, salary_range in updates:
+        salary = job_fields.parse_salary_range(salary_range)
+        if salary is None:
+            rejects.append((line, f"SalaryRange could not be parsed: {salary_range!r}"))
+        elif job_id in seen:
+            rejects.append((line, f"JobId {job_id} is already updated on line {seen[job_id]}"))
+        else:
+            seen[job_id] = line
+            valid.append((line, job_id, salary_range, salary))
+
+    report = {'rows': rows, 'updated': [], 'unchanged': 0}
+    cursor = connection.cursor()
+    try:
+        stats_changes, salary_changes = [], []
+        for chunk in _chunks(valid, chunk_size):
+            stored = _stored_states(cursor, [job_id for _, job_id, _, _ in chunk])
+            changes = []
+            for line, job_id, salary_range, salary in chunk:
+                if job_id not in stored:
+                    rejects.append((line, f"No job with JobId {job_id}"))
+                    continue
+                old_range, old_stats, old_salary = stored[job_id]
+                if old_range == salary_range:
+                    report['unchanged'] += 1
+                    continue
+                changes.append((job_id, (salary_range, *salary)))
+                stats_changes.append((old_stats, (*old_stats[:2], *salary)))
+                salary_changes.append((old_salary, (old_salary[0], *salary)))
+            if changes:
+                _write_chunk(cursor, changes)
+                report['updated'].extend(job_id for job_id, _ in changes)
+        recruiter_stats.record_job_changes(cursor, stats_changes)
+        skill_salary.record_job_changes(cursor, salary_changes)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    rejects.sort()
+    report['rejected'] = len(rejects)
+    report['rejects'] = rejects[:MAX_REPORTED_REJECTS]
+    return report
+
+
+def update_salary(connection, job_id, salary_range):
+    """Change one job's salary range and commit. Returns the apply_updates report."""
+    return apply_updates(connection, [(1, job_id, " ".join(salary_range.split()))])
+
+
+def update_from_csv(connection, handle, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Apply a JobId,SalaryRange CSV text file object in one transaction; returns the report."""
+    updates, rejects = read_csv(handle)
+    return apply_updates(connection, updates, chunk_size, rejects)
@@ -0,0 +1,158 @@
+"""
+Full-Text Search
+Relevance-ranked search over candidate skills, job titles and skills, and
+recruiter company profiles using the FULLTEXT indexes (MATCH ... AGAINST)
+in natural-language or boolean mode, combined with the usual filters and
+keyset-paginated by (score, key) so every page is LIMIT-bounded. Only the
+best MAX_RESULTS matches are ranked: each page scores the matching rows
+once in a LIMIT-bounded inner query and sorts and pages through those, so
+neither the final sort nor the keyset condition re-evaluates MATCH.
+
+Embedded databases have no FULLTEXT indexes; there the score is the
+number of search terms each row contains (a LIKE scan), which keeps the
+search page working on a SQLite backend.
+"""
+
+import re
+
+
+# Ways of reading the search text
+MODES = ('natural', 'all', 'boolean')
+
+MAX_PAGE_SIZE = 100
+
+# Best matches a search ranks and pages through
+MAX_RESULTS = 1000
+
+# target -> table, key, FULLTEXT index columns, result columns and filters
+TARGETS = {
+    'candidate': {
+        'label': "Candidates",
+        'table': 'Candidate',
+        'key': 'CandidateId',
+        'match': ['Skills'],
+        'columns': ['CandidateId', 'EdLevel', 'Gender', 'YearsCoded', 'Country', 'PreviousSalary', 'Skills'],
+        'filters': {'ed_level': "EdLevel = %s", 'min_experience': "YearsCoded >= %s"},
+    },
+    'job': {
+        'label': "Jobs",
+        'table': 'Job',
+        'key': 'JobId',
+        'match': ['Title', 'Skills'],
+        'columns': ['JobId', 'Title', 'Location', 'Experience', 'SalaryRange', 'Skills', 'ContactPerson'],
+        'filters': {'location': "Location = %s"},
+    },
+    'recruiter': {
+        'label': "Recruiters",
+        'table': 'Recruiter',
+        'key': 'ContactPerson',
+        'match': ['CompanyProfile'],
+        'columns': ['ContactPerson', 'Company', 'Contact', 'CompanyProfile'],
+        'filters': {},
+    },
+}
+
+_TERM = re.compile(r"[^\s,]+")
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+_WORD = re.compile(r"^\w+$")
+
+
+def terms(text):
+    """Split search text into terms on whitespace and commas."""
+    return _TERM.findall(text or "")
+
+
+def against(text, mode='natural'):
+    """Return (search expression, AGAINST modifier) for a mode.
+
+    'natural' ranks rows containing any of the words; 'all' requires every
+    term (a term such as "node.js" or "c++" must appear as a phrase);
+    'boolean' passes MySQL boolean syntax (+must -not "phrase" prefix*)
+    through unchanged.
+    """
+    if mode == 'natural':
+        return text, "IN NATURAL LANGUAGE MODE"
+    if mode == 'all':
+        required = []
+        for term in terms(text):
+            term = term.replace('"', '')
+            required.append(f"+{term}" if _WORD.match(term) else f'+"{term}"')
+        return " ".join(required), "IN BOOLEAN MODE"
+    if mode == 'boolean':
+        return text, "IN BOOLEAN MODE"
+    raise ValueError(f"Unknown search mode: {mode}")
+
+
+def _fulltext_score(spec, text, mode):
+    expression, modifier = against(text, mode)
+    score = f"MATCH({', '.join(spec['match'])}) AGAINST (%s {modifier})"
+    return score, [expression], score, [expression]
+
+
+def _like_score(spec, text, mode):
+    """Score and match conditions for embedded databases: one point per term found."""
+    raw_terms = terms(text)
+    if mode == 'boolean':
+        # Excluded terms are dropped; the rest are required
+        raw_terms = [term for term in raw_terms if not term.startswith("-")]
+    words = [word for word in (_BOOLEAN_OPERATORS.sub("", term) for term in raw_terms) if word]
+    if not words:
+        return "0", [], "1 = 0", []
+    found = [f"({' OR '.join(f'{column} LIKE %s' for column in spec['match'])})" for _ in words]
+    params = [f"%{word}%" for word in words for _ in spec['match']]
+    score = f"({' + '.join(found)})"
+    if mode == 'natural':
+        return score, params, f"{score} > 0", params
+    return score, params, " AND ".join(found), params
+
+
+def search_query(target, text, mode='natural', filters=None, after=None, page_size=25, dialect='mysql'):
+    """Return (sql, params) for one page of ranked results, best first.
+
+    `after` is the (Score, key) of the last row of the previous page.
+    """
+    spec = TARGETS[target]
+    build = _fulltext_score if dialect == 'mysql' else _like_score
+    score, score_params, match, match_params = build(spec, text, mode)
+    conditions = [match]
+    params = list(match_params)
+    for name, value in (filters or {}).items():
+        if value is not None and value != "":
+            conditions.append(spec['filters'][name])
+            params.append(value)
+    key = spec['key']
+    # The keyset condition compares the inner query's scores instead of evaluating MATCH again
+    after_condition, after_params = "", []
+    if after is not None:
+        last_score, last_key = after
+        after_condition = f"WHERE ranked.Score < %s OR (ranked.Score = %s AND ranked.{key} > %s)"
+        after_params = [last_score, last_score, last_key]
+    columns = ', '.join(f"t.{column}" for column in spec['columns'])
+    return f"""
+        SELECT {columns}, ranked.Score
+        FROM (
+            SELECT {key}, {score} AS Score
+            FROM {spec['table']}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY Score DESC, {key}
+            LIMIT %s
+        ) ranked
+        JOIN {spec['table']} t ON t.{key} = ranked.{key}
+        {after_condition}
+        ORDER BY ranked.Score DESC, ranked.{key}
+        LIMIT %s
+    """, (*score_params, *params, MAX_RESULTS, *after_params, min(page_size, MAX_PAGE_SIZE))
+
+
+def search(cursor, target, text, mode='natural', filters=None, after=None, page_size=25):
+    """Fetch one page of ranked results; returns (rows, next_after). Expects a DictCursor."""
+    if not terms(text):
+        return [], None
+    dialect = getattr(cursor.connection, 'dialect', 'mysql')
+    query, params = search_query(target, text, mode, filters, after, page_size, dialect)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    next_after = None
+    if len(rows) == min(page_size, MAX_PAGE_SIZE):
+        next_after = (rows[-1]['Score'], rows[-1][TARGETS[target]['key']])
+    return rows, next_after
@@ -0,0 +1,179 @@
+"""
+Skill Demand Summary
+Materialized job counts per skill (SkillDemand) and per skill and location
+(SkillLocationDemand), maintained incrementally by the application's job
+write path so "most in-demand skills" is an indexed top-N read.
+"""
+
+from collections import Counter
+
+import recruiter_stats
+import skill_salary
+import skills as skill_index
+
+
+def _job_state(cursor, job_id):
+    """Return (location, skill_ids) of a stored job, or None if it does not exist."""
+    cursor.execute("SELECT Location FROM Job WHERE JobId = %s", (job_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    cursor.execute("SELECT SkillId FROM JobSkill WHERE JobId = %s", (job_id,))
+    return row[0] or "", {skill_row[0] for skill_row in cursor.fetchall()}
+
+
+def record_job_change(cursor, old=None, new=None):
+    """Apply the counter deltas for one job write in the caller's transaction.
+
+    `old` and `new` are the job's (location, skill_ids) before and after the
+    write; pass None for `old` on insert and for `new` on delete.
+    """
+    record_job_changes(cursor, [(old, new)])
+
+
+def record_job_changes(cursor, changes):
+    """Apply the combined counter deltas of many (old, new) job writes at once."""
+    skill_deltas = Counter()
+    location_deltas = Counter()
+    for old, new in changes:
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            location, skill_ids = state
+            for skill_id in skill_ids:
+                skill_deltas[skill_id] += sign
+                location_deltas[(location or "", skill_id)] += sign
+
+    skill_rows = [(skill_id, delta) for skill_id, delta in skill_deltas.items() if delta]
+    location_rows = [
+        (location, skill_id, delta)
+        for (location, skill_id), delta in location_deltas.items() if delta
+    ]
+    if skill_rows:
+        cursor.executemany("""
+            INSERT INTO SkillDemand (SkillId, JobCount) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE JobCount = JobCount + VALUES(JobCount)
+        """, skill_rows)
+        cursor.executemany(
+            "DELETE FROM SkillDemand WHERE SkillId = %s AND JobCount <= 0",
+            [(skill_id,) for skill_id, delta in skill_rows if delta < 0],
+        )
+    if location_rows:
+        cursor.executemany("""
+            INSERT INTO SkillLocationDemand (Location, SkillId, JobCount) VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE JobCount = JobCount + VALUES(JobCount)
+        """, location_rows)
+        cursor.executemany(
+            "DELETE FROM SkillLocationDemand WHERE Location = %s AND SkillId = %s AND JobCount <= 0",
+            [(location, skill_id) for location, skill_id, delta in location_rows if delta < 0],
+        )
+
+
+def update_job(cursor, job_id, location, skills):
+    """Change a job's location and skills, keeping links and counters in step."""
+    old = _job_state(cursor, job_id)
+    if old is None:
+        raise ValueError(f"Job {job_id} does not exist.")
+    salary_old = skill_salary.stored_job_state(cursor, job_id)
+    cursor.execute("UPDATE Job SET Location = %s, Skills = %s WHERE JobId = %s",
+                   (location, skills, job_id))
+    _, new_ids = skill_index.sync_skills(cursor, 'job', job_id, skills)
+    record_job_change(cursor, old=old, new=(location, new_ids))
+    skill_salary.record_job_change(cursor, old=salary_old, new=(new_ids, *salary_old[1:]))
+
+
+def delete_job(cursor, job_id):
+    """Delete a job and decrement the counters of its skills and its recruiter."""
+    old = _job_state(cursor, job_id)
+    if old is None:
+        return False
+    salary_old = skill_salary.stored_job_state(cursor, job_id)
+    recruiter_old = recruiter_stats.stored_job_state(cursor, job_id)
+    cursor.execute("DELETE FROM Job WHERE JobId = %s", (job_id,))
+    record_job_change(cursor, old=old)
+    skill_salary.record_job_change(cursor, old=salary_old)
+    recruiter_stats.record_job_change(cursor, old=recruiter_old)
+    return True
+
+
+def top_skills_query(limit=3, location=None):
+    """Return (sql, params) for the most demanded skills overall or in one location."""
+    if location:
+        return """
+            SELECT s.Name AS Skill, d.JobCount AS SkillCount
+            FROM SkillLocationDemand d
+            JOIN Skill s ON s.SkillId = d.SkillId
+            WHERE d.Location = %s
+            ORDER BY d.JobCount DESC
+            LIMIT %s
+        """, (location, limit)
+    return """
+        SELECT s.Name AS Skill, d.JobCount AS SkillCount
+        FROM SkillDemand d
+        JOIN Skill s ON s.SkillId = d.SkillId
+        ORDER BY d.JobCount DESC
+        LIMIT %s
+    """, (limit,)
+
+
+def top_skills(cursor, limit=3, location=None):
+    """Return the most demanded skills overall or in one location."""
+    cursor.execute(*top_skills_query(limit, location))
+    return cursor.fetchall()
+
+
+# Aggregations the summary tables must equal; shared by rebuild and check
+_SKILL_COUNTS = """
+    SELECT SkillId, COUNT(*) FROM JobSkill GROUP BY SkillId
+"""
+_LOCATION_COUNTS = """
+    SELECT COALESCE(j.Location, ''), js.SkillId, COUNT(*)
+    FROM JobSkill js
+    JOIN Job j ON j.JobId = js.JobId
+    GROUP BY COALESCE(j.Location, ''), js.SkillId
+"""
+
+
+def rebuild(connection):
+    """Recompute both summary tables from JobSkill in one transaction."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM SkillDemand")
+        cursor.execute(f"INSERT INTO SkillDemand (SkillId, JobCount) {_SKILL_COUNTS}")
+        cursor.execute("DELETE FROM SkillLocationDemand")
+        cursor.execute(
+            f"INSERT INTO SkillLocationDemand (Location, SkillId, JobCount) {_LOCATION_COUNTS}"
+        )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def check_consistency(connection):
+    """Compare the summary tables with a fresh aggregation.
+
+    Returns a list of (table, key, stored, expected) tuples, empty when the
+    counters are consistent.
+    """
+    cursor = connection.cursor()
+    try:
+        checks = [
+            ("SkillDemand", "SELECT SkillId, JobCount FROM SkillDemand", _SKILL_COUNTS),
+            ("SkillLocationDemand",
+             "SELECT Location, SkillId, JobCount FROM SkillLocationDemand", _LOCATION_COUNTS),
+        ]
+        mismatches = []
+        for table, stored_query, expected_query in checks:
+            cursor.execute(stored_query)
+            stored = {tuple(row[:-1]): row[-1] for row in cursor.fetchall()}
+            cursor.execute(expected_query)
+            expected = {tuple(row[:-1]): row[-1] for row in cursor.fetchall()}
+            for key in sorted(stored.keys() | expected.keys(), key=str):
+                if stored.get(key, 0) != expected.get(key, 0):
+                    mismatches.append((table, key, stored.get(key, 0), expected.get(key, 0)))
+        return mismatches
+    finally:
+        cursor.close()
@@ -0,0 +1,169 @@
+"""
+Skill Salary Benchmark
+Advertised salaries per individual skill (SkillSalary): for each skill and
+SalaryMax bucket, the number of jobs with a parsed salary range and their
+SalaryMin / SalaryMax totals. The job write paths keep the table current
+incrementally; job counts, mean bounds, SalaryMax percentiles (to the
+bucket) and demand rank of every skill are then derived in one vectorized
+pandas pass over a table of at most a few thousand rows.
+"""
+
+from collections import defaultdict
+
+import db
+
+
+# Width of a SalaryMax bucket; percentiles are reported at bucket midpoints
+BUCKET_WIDTH = 5000
+
+# SalaryMax percentiles reported per skill
+PERCENTILES = {'P25 Salary Max': 0.25, 'Median Salary Max': 0.5, 'P75 Salary Max': 0.75}
+
+BENCHMARK_COLUMNS = ['Skill', 'Demand Rank', 'Jobs', 'Salaried Jobs', 'Avg Salary Min', 'Avg Salary Max',
+                     *PERCENTILES]
+
+# Counters per row, in column order
+COUNTERS = ('JobCount', 'SalaryMinSum', 'SalaryMaxSum')
+
+
+def bucket(salary_max):
+    """Return the SalaryMax bucket of a salary."""
+    return int(salary_max) // BUCKET_WIDTH
+
+
+def stored_job_state(cursor, job_id):
+    """Return (skill_ids, SalaryMin, SalaryMax) of a stored job, or None."""
+    cursor.execute("SELECT SalaryMin, SalaryMax FROM Job WHERE JobId = %s", (job_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    cursor.execute("SELECT SkillId FROM JobSkill WHERE JobId = %s", (job_id,))
+    return {skill_row[0] for skill_row in cursor.fetchall()}, row[0], row[1]
+
+
+def _add(deltas, state, sign):
+    skill_ids, salary_min, salary_max = state
+    if salary_min is None or salary_max is None:
+        return
+    salary_bucket = bucket(salary_max)
+    for skill_id in skill_ids:
+        counters = deltas[(skill_id, salary_bucket)]
+        counters[0] += sign
+        counters[1] += sign * salary_min
+        counters[2] += sign * salary_max
+
+
+def record_job_change(cursor, old=None, new=None):
+    """Apply the deltas for one job write in the caller's transaction.
+
+    `old` and `new` are the job's (skill_ids, SalaryMin, SalaryMax) before
+    and after the write; pass None for `old` on insert and for `new` on
+    delete.
+    """
+    record_job_changes(cursor, [(old, new)])
+
+
+def record_job_changes(cursor, changes):
+    """Apply the combined deltas of many (old, new) job writes at once."""
+    deltas = defaultdict(lambda: [0, 0, 0])
+    for old, new in changes:
+        if old is not None:
+            _add(deltas, old, -1)
+        if new is not None:
+            _add(deltas, new, 1)
+    rows = [(*key, *counters) for key, counters in deltas.items() if any(counters)]
+    if not rows:
+        return
+    cursor.executemany("""
+        INSERT INTO SkillSalary (SkillId, Bucket, JobCount, SalaryMinSum, SalaryMaxSum)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE JobCount = JobCount + VALUES(JobCount),
+                                SalaryMinSum = SalaryMinSum + VALUES(SalaryMinSum),
+                                SalaryMaxSum = SalaryMaxSum + VALUES(SalaryMaxSum)
+    """, rows)
+    cursor.executemany(
+        "DELETE FROM SkillSalary WHERE SkillId = %s AND Bucket = %s AND JobCount <= 0",
+        [row[:2] for row in rows if row[2] < 0],
+    )
+
+
+def _aggregate(connection, batch_size=db.DEFAULT_BATCH_SIZE):
+    """Compute every SkillSalary row from Job and JobSkill: {(skill, bucket): counters}."""
+    deltas = defaultdict(lambda: [0, 0, 0])
+    for _, rows in db.iter_batches(connection, """
+        SELECT js.SkillId, j.SalaryMin, j.SalaryMax
+        FROM JobSkill js
+        JOIN Job j ON j.JobId = js.JobId
+        WHERE j.SalaryMin IS NOT NULL AND j.SalaryMax IS NOT NULL
+    """, batch_size=batch_size):
+        for skill_id, salary_min, salary_max in rows:
+            _add(deltas, ((skill_id,), salary_min, salary_max), 1)
+    return {key: counters for key, counters in deltas.items() if counters[0]}
+
+
+def rebuild(connection, batch_size=db.DEFAULT_BATCH_SIZE):
+    """Recompute SkillSalary from Job and JobSkill in one transaction."""
+    expected = _aggregate(connection, batch_size)
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM SkillSalary")
+        rows = [(*key, *counters) for key, counters in expected.items()]
+        for offset in range(0, len(rows), batch_size):
+            cursor.executemany("""
+                INSERT INTO SkillSalary (SkillId, Bucket, JobCount, SalaryMinSum, SalaryMaxSum)
+                VALUES (%s, %s, %s, %s, %s)
+            """, rows[offset:offset + batch_size])
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def check_consistency(connection):
+    """Compare SkillSalary with a fresh aggregation of Job and JobSkill.
+
+    Returns a list of (key, stored, expected) tuples, empty when the table
+    is consistent.
+    """
+    expected = _aggregate(connection)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT SkillId, Bucket, {', '.join(COUNTERS)} FROM SkillSalary")
+        stored = {(row[0], row[1]): [int(value) for value in row[2:]] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+    return [(key, stored.get(key), expected.get(key))
+            for key in sorted(stored.keys() | expected.keys())
+            if stored.get(key) != expected.get(key)]
+
+
+def benchmark(rows):
+    """Build the per-skill benchmark from queries.skill_salary_buckets() rows.
+
+    Returns a DataFrame with BENCHMARK_COLUMNS, one row per skill, in
+    demand order (jobs requiring the skill, salaried or not).
+    """
+    import pandas as pd  # Imported here so the job write paths using this module do not load pandas
+
+    if not rows:
+        return pd.DataFrame(columns=BENCHMARK_COLUMNS)
+    frame = pd.DataFrame(rows, columns=['Skill', 'Demand', 'Bucket', *COUNTERS])
+    frame[list(COUNTERS)] = frame[list(COUNTERS)].astype('int64')
+    frame = frame.sort_values(['Skill', 'Bucket'], kind='stable')
+    grouped = frame.groupby('Skill', sort=False)
+    result = grouped[list(COUNTERS)].sum()
+    result['Demand'] = grouped['Demand'].first().fillna(0).astype('int64')
+
+    # Each bucket's cumulative share of its skill's jobs; a percentile is the first bucket reaching it
+    share = grouped['JobCount'].cumsum() / frame['Skill'].map(result['JobCount'])
+    for column, fraction in PERCENTILES.items():
+        reached = frame.loc[share >= fraction - 1e-9].groupby('Skill', sort=False)['Bucket'].first()
+        result[column] = (reached + 0.5) * BUCKET_WIDTH
+
+    result['Avg Salary Min'] = result['SalaryMinSum'] / result['JobCount']
+    result['Avg Salary Max'] = result['SalaryMaxSum'] / result['JobCount']
+    result['Demand Rank'] = result['Demand'].rank(method='min', ascending=False).astype('int64')
+    result = result.rename(columns={'Demand': 'Jobs', 'JobCount': 'Salaried Jobs'}).reset_index()
+    return result.sort_values(['Demand Rank', 'Skill'], kind='stable')[BENCHMARK_COLUMNS].reset_index(drop=True)
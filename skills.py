@@ -0,0 +1,168 @@
+"""
+Skill Index
+Normalized Skill / CandidateSkill / JobSkill tables that replace
+`Skills LIKE '%x%'` scans on the comma-separated Skills text columns.
+"""
+
+import re
+
+
+# Skills are stored as free text separated by commas (job postings) or
+# semicolons (applicant exports)
+SKILL_SEPARATORS = re.compile(r"[,;]")
+
+# Longest skill token that fits Skill.Name
+MAX_SKILL_LENGTH = 255
+
+# Link table and owning key for each entity that carries a Skills column
+SKILL_LINKS = {
+    'candidate': ('CandidateSkill', 'CandidateId'),
+    'job': ('JobSkill', 'JobId'),
+}
+
+
+def normalize_skill(skill):
+    """Return the case-folded, whitespace-collapsed form of one skill."""
+    return " ".join(skill.split()).casefold()[:MAX_SKILL_LENGTH]
+
+
+def normalize_skills(skills):
+    """Split a Skills string (or list) into unique normalized tokens, keeping order."""
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        skills = SKILL_SEPARATORS.split(skills)
+    tokens = []
+    seen = set()
+    for skill in skills:
+        token = normalize_skill(skill)
+        if token and token not in seen:
+            seen.add(token)
+            tokens.append(token)
+    return tokens
+
+
+def ensure_skill_ids(cursor, tokens, cache=None):
+    """Return {token: SkillId}, inserting any tokens missing from Skill."""
+    cache = {} if cache is None else cache
+    missing = [token for token in tokens if token not in cache]
+    if missing:
+        cursor.executemany("INSERT IGNORE INTO Skill (Name) VALUES (%s)", missing)
+        placeholders = ", ".join(["%s"] * len(missing))
+        cursor.execute(
+            f"SELECT Name, SkillId FROM Skill WHERE Name IN ({placeholders})",
+            missing,
+        )
+        for name, skill_id in cursor.fetchall():
+            cache[name] = skill_id
+    return {token: cache[token] for token in tokens if token in cache}
+
+
+def sync_skills(cursor, entity, entity_id, skills, cache=None):
+    """Bring the skill links of one candidate or job in line with its Skills text.
+
+    Runs in the caller's transaction and returns (old_ids, new_ids), the
+    sets of SkillIds linked before and after the change.
+    """
+    table, key = SKILL_LINKS[entity]
+    new_ids = set(ensure_skill_ids(cursor, normalize_skills(skills), cache).values())
+    cursor.execute(f"SELECT SkillId FROM {table} WHERE {key} = %s", (entity_id,))
+    old_ids = {row[0] for row in cursor.fetchall()}
+    removed = old_ids - new_ids
+    added = new_ids - old_ids
+    if removed:
+        placeholders = ", ".join(["%s"] * len(removed))
+        cursor.execute(
+            f"DELETE FROM {table} WHERE {key} = %s AND SkillId IN ({placeholders})",
+            (entity_id, *removed),
+        )
+    if added:
+        cursor.executemany(
+            f"INSERT INTO {table} ({key}, SkillId) VALUES (%s, %s)",
+            [(entity_id, skill_id) for skill_id in added],
+        )
+    return old_ids, new_ids
+
+
+def add_skill_links(cursor, entity, rows, cache=None):
+    """Link many new candidates or jobs to their skills in one round of writes.
+
+    `rows` holds (entity_id, skills_text) pairs for entities that have no
+    links yet. Returns {entity_id: set of SkillIds}.
+    """
+    table, key = SKILL_LINKS[entity]
+    cache = {} if cache is None else cache
+    tokens_by_id = [(entity_id, normalize_skills(skills)) for entity_id, skills in rows]
+    all_tokens = list(dict.fromkeys(token for _, tokens in tokens_by_id for token in tokens))
+    skill_ids = ensure_skill_ids(cursor, all_tokens, cache)
+    linked = {}
+    links = []
+    for entity_id, tokens in tokens_by_id:
+        ids = {skill_ids[token] for token in tokens if token in skill_ids}
+        linked[entity_id] = ids
+        links.extend((entity_id, skill_id) for skill_id in ids)
+    if links:
+        cursor.executemany(f"INSERT INTO {table} ({key}, SkillId) VALUES (%s, %s)", links)
+    return linked
+
+
+def skill_match_clause(entity, skills, match="any", alias=None):
+    """Return (sql, params) restricting rows to those having any/all of the given skills.
+
+    The clause is an `<key> IN (...)` filter served by the skill link
+    table's (SkillId, <key>) primary key, so it never scans Skills text.
+    """
+    table, key = SKILL_LINKS[entity]
+    tokens = normalize_skills(skills)
+    if not tokens:
+        raise ValueError("At least one skill is required.")
+    if match not in ("any", "all"):
+        raise ValueError(f"Unknown skill match mode: {match}")
+    column = f"{alias}.{key}" if alias else key
+    placeholders = ", ".join(["%s"] * len(tokens))
+    sql = f"""{column} IN (
+            SELECT l.{key}
+            FROM {table} l
+            JOIN Skill s ON s.SkillId = l.SkillId
+            WHERE s.Name IN ({placeholders})
+            GROUP BY l.{key}
+            HAVING COUNT(*) >= %s
+        )"""
+    required = len(tokens) if match == "all" else 1
+    return sql, [*tokens, required]
+
+
+def backfill_skills(connection, entity, batch_size=5000, progress=None):
+    """Rebuild skill links for every candidate or job from its Skills text.
+
+    Rows are walked in primary-key order and each batch is committed on
+    its own, so the back-fill can be re-run safely after an interruption.
+    """
+    table, key = SKILL_LINKS[entity]
+    source = "Candidate" if entity == "candidate" else "Job"
+    cache = {}
+    last_id = 0
+    processed = 0
+    cursor = connection.cursor()
+    try:
+        while True:
+            cursor.execute(
+                f"SELECT {key}, Skills FROM {source} WHERE {key} > %s ORDER BY {key} LIMIT %s",
+                (last_id, batch_size),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.execute(
+                f"DELETE FROM {table} WHERE {key} BETWEEN %s AND %s",
+                (rows[0][0], rows[-1][0]),
+            )
+            add_skill_links(cursor, entity, rows, cache)
+            connection.commit()
+            last_id = rows[-1][0]
+            processed += len(rows)
+            if progress:
+                progress(processed)
+    finally:
+        cursor.close()
+    return processed
@@ -0,0 +1,535 @@
+"""
+Storage Backends
+Every connection the application uses comes from a backend exposing the
+same calls as the MySQL pool (acquire, release, connection, stats), so the
+same query functions run against either:
+
+- 'mysql': the pooled PyMySQL connections from db.py (the default), and
+- 'sqlite' / 'duckdb': an embedded database file behind a wrapper that
+  speaks the MySQL dialect this project uses.
+
+The primary backend takes every write; set it to 'sqlite' to run the
+dashboard without a MySQL server. The analytics pages (skill demand,
+salary benchmarks, recruiter stats) can instead read an embedded copy of
+the tables they scan, refreshed from the primary every `sync_interval`
+seconds, which keeps their aggregates off the transactional server.
+DuckDB (columnar) is used for the copy when it is installed and selected.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import db
+import query_cache
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+
+DEFAULT_STORAGE_CONFIG = {
+    'primary': 'mysql',               # 'mysql', or 'sqlite' to run without a MySQL server
+    'sqlite_path': 'talent.db',       # Database file of the 'sqlite' primary
+    'analytics': None,                # None (read the primary), 'sqlite' or 'duckdb'
+    'analytics_path': 'analytics.db', # Database file of the analytics copy
+    'sync_interval': 300,             # Seconds between refreshes of the copy (0: manual only)
+}
+STORAGE_CONFIG = db.get_config('STORAGE_CONFIG', DEFAULT_STORAGE_CONFIG)
+
+EMBEDDED_ENGINES = ('sqlite', 'duckdb')
+
+# Tables copied to the analytics store, parents first
+ANALYTICS_TABLES = ['Recruiter', 'Job', 'Candidate', 'Skill', 'JobSkill', 'CandidateSkill',
+                    'SkillDemand', 'SkillLocationDemand', 'SkillSalary', 'RecruiterStats']
+
+# The MySQL schema (SQL_Setup_MySQL.sql) in SQLite syntax. Timestamps default
+# to local time, as MySQL's TIMESTAMP columns read back in the session zone.
+EMBEDDED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Recruiter (
+   ContactPerson TEXT PRIMARY KEY, Contact TEXT NOT NULL, Company TEXT NOT NULL, CompanyProfile TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_recruiter_company ON Recruiter (Company);
+CREATE TABLE IF NOT EXISTS Job (
+   JobId INTEGER PRIMARY KEY AUTOINCREMENT, Location TEXT, Date TEXT, Experience TEXT, Skills TEXT,
+   Title TEXT, ContactPerson TEXT REFERENCES Recruiter(ContactPerson) ON DELETE CASCADE,
+   SalaryRange TEXT, SalaryMin INTEGER, SalaryMax INTEGER, MinExperienceYears INTEGER, PostedDate DATE
+);
+CREATE INDEX IF NOT EXISTS idx_job_location ON Job (Location);
+CREATE INDEX IF NOT EXISTS idx_job_salarymax ON Job (SalaryMax);
+CREATE INDEX IF NOT EXISTS idx_job_minexperience ON Job (MinExperienceYears);
+CREATE INDEX IF NOT EXISTS idx_job_contactperson ON Job (ContactPerson);
+CREATE INDEX IF NOT EXISTS idx_job_posted ON Job (PostedDate);
+CREATE INDEX IF NOT EXISTS idx_job_lookup_title ON Job (Title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_job_lookup_location ON Job (Location COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_job_lookup_contactperson ON Job (ContactPerson COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS Candidate (
+   CandidateId INTEGER PRIMARY KEY AUTOINCREMENT, EdLevel TEXT, Gender TEXT, YearsCoded INTEGER,
+   Country TEXT, PreviousSalary INTEGER, Skills TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_candidate_country ON Candidate (Country);
+CREATE INDEX IF NOT EXISTS idx_candidate_edlevel_yearscoded ON Candidate (EdLevel, YearsCoded);
+CREATE TABLE IF NOT EXISTS Users (
+   UserId INTEGER PRIMARY KEY AUTOINCREMENT, Username TEXT NOT NULL UNIQUE, Password TEXT NOT NULL,
+   Role TEXT NOT NULL DEFAULT 'recruiter', CreatedAt TEXT DEFAULT (datetime('now', 'localtime'))
+);
+CREATE TABLE IF NOT EXISTS Job_Audit (
+   AuditID INTEGER PRIMARY KEY AUTOINCREMENT, JobID INTEGER NOT NULL, ActionType TEXT NOT NULL,
+   OldSalaryRange TEXT, NewSalaryRange TEXT, ModifiedAt TEXT DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_job_audit_modified ON Job_Audit (ModifiedAt, AuditID);
+CREATE INDEX IF NOT EXISTS idx_job_audit_job_modified ON Job_Audit (JobID, ModifiedAt, AuditID);
+CREATE TABLE IF NOT EXISTS Skill (SkillId INTEGER PRIMARY KEY AUTOINCREMENT, Name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS CandidateSkill (
+   SkillId INTEGER NOT NULL, CandidateId INTEGER NOT NULL, PRIMARY KEY (SkillId, CandidateId)
+);
+CREATE INDEX IF NOT EXISTS idx_candidateskill_candidate ON CandidateSkill (CandidateId);
+CREATE TABLE IF NOT EXISTS JobSkill (
+   SkillId INTEGER NOT NULL, JobId INTEGER NOT NULL, PRIMARY KEY (SkillId, JobId)
+);
+CREATE INDEX IF NOT EXISTS idx_jobskill_job ON JobSkill (JobId);
+CREATE TABLE IF NOT EXISTS SkillDemand (SkillId INTEGER PRIMARY KEY, JobCount INTEGER NOT NULL DEFAULT 0);
+CREATE INDEX IF NOT EXISTS idx_skilldemand_count ON SkillDemand (JobCount);
+CREATE TABLE IF NOT EXISTS SkillLocationDemand (
+   Location TEXT NOT NULL, SkillId INTEGER NOT NULL, JobCount INTEGER NOT NULL DEFAULT 0,
+   PRIMARY KEY (Location, SkillId)
+);
+CREATE INDEX IF NOT EXISTS idx_skilllocationdemand_count ON SkillLocationDemand (Location, JobCount);
+CREATE TABLE IF NOT EXISTS SkillSalary (
+   SkillId INTEGER NOT NULL, Bucket INTEGER NOT NULL, JobCount INTEGER NOT NULL DEFAULT 0,
+   SalaryMinSum INTEGER NOT NULL DEFAULT 0, SalaryMaxSum INTEGER NOT NULL DEFAULT 0,
+   PRIMARY KEY (SkillId, Bucket)
+);
+CREATE TABLE IF NOT EXISTS RecruiterStats (
+   ContactPerson TEXT NOT NULL, PeriodType TEXT NOT NULL, PeriodStart DATE NOT NULL,
+   JobCount INTEGER NOT NULL DEFAULT 0, SalaryCount INTEGER NOT NULL DEFAULT 0,
+   SalaryMinSum INTEGER NOT NULL DEFAULT 0, SalaryMaxSum INTEGER NOT NULL DEFAULT 0,
+   PRIMARY KEY (ContactPerson, PeriodType, PeriodStart)
+);
+CREATE INDEX IF NOT EXISTS idx_recruiterstats_period ON RecruiterStats (PeriodType, PeriodStart);
+CREATE TABLE IF NOT EXISTS ImportJob (
+   ImportId INTEGER PRIMARY KEY AUTOINCREMENT, Entity TEXT NOT NULL, SourceName TEXT NOT NULL,
+   SourceChecksum TEXT NOT NULL, Status TEXT NOT NULL DEFAULT 'running',
+   RowsRead INTEGER NOT NULL DEFAULT 0, RowsInserted INTEGER NOT NULL DEFAULT 0,
+   RowsRejected INTEGER NOT NULL DEFAULT 0,
+   StartedAt TEXT DEFAULT (datetime('now', 'localtime')),
+   UpdatedAt TEXT DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_importjob_checksum ON ImportJob (Entity, SourceChecksum);
+CREATE TABLE IF NOT EXISTS CandidateDuplicate (
+   CandidateId INTEGER NOT NULL, DuplicateOf INTEGER NOT NULL, Score REAL NOT NULL,
+   Status TEXT NOT NULL DEFAULT 'pending', DetectedAt TEXT DEFAULT (datetime('now', 'localtime')),
+   ReviewedAt TEXT, PRIMARY KEY (CandidateId, DuplicateOf)
+);
+CREATE INDEX IF NOT EXISTS idx_candidateduplicate_status_score ON CandidateDuplicate (Status, Score);
+CREATE TABLE IF NOT EXISTS AnalyticsSync (TableName TEXT NOT NULL, CopiedRows INTEGER, SyncedAt TEXT);
+"""
+
+# The job_salary_audit trigger of the MySQL schema
+SQLITE_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS job_salary_audit
+AFTER UPDATE OF SalaryRange ON Job
+FOR EACH ROW WHEN OLD.SalaryRange != NEW.SalaryRange
+BEGIN
+   INSERT INTO Job_Audit (JobID, ActionType, OldSalaryRange, NewSalaryRange)
+   VALUES (NEW.JobId, 'UPDATE', OLD.SalaryRange, NEW.SalaryRange);
+END;
+"""
+
+_TABLE_NAME = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)")
+_CONSTRAINTS = re.compile(
+    r",\s*PRIMARY KEY \([^)]*\)|\s+PRIMARY KEY( AUTOINCREMENT)?|\s+UNIQUE"
+    r"|\s+REFERENCES \w+\(\w+\) ON DELETE CASCADE|\s+DEFAULT \(datetime\([^)]*\)\)"
+)
+_PLACEHOLDER = re.compile(r"%s")
+_UPSERT_VALUES = re.compile(r"VALUES\((\w+)\)")
+
+logger = logging.getLogger(__name__)
+
+
+def duckdb_schema():
+    """Return the CREATE TABLE statements of the analytics tables for DuckDB.
+
+    The copy is rewritten wholesale on every sync, so it keeps no keys,
+    constraints or indexes: DuckDB scans its columns directly.
+    """
+    statements = []
+    for statement in EMBEDDED_SCHEMA.split(";"):
+        match = _TABLE_NAME.search(statement)
+        if match and match.group(1) in (*ANALYTICS_TABLES, 'AnalyticsSync'):
+            statements.append(_CONSTRAINTS.sub("", statement.strip()))
+    return statements
+
+
+def translate(query):
+    """Rewrite the MySQL-only syntax this project uses for SQLite and DuckDB."""
+    query = _PLACEHOLDER.sub("?", query).replace("INSERT IGNORE", "INSERT OR IGNORE")
+    head, upsert, assignments = query.partition("ON DUPLICATE KEY UPDATE")
+    if upsert:
+        query = head + "ON CONFLICT DO UPDATE SET" + _UPSERT_VALUES.sub(r"excluded.\1", assignments)
+    return query
+
+
+class EmbeddedCursor:
+    """DB-API cursor over SQLite or DuckDB accepting the project's MySQL dialect."""
+
+    as_dict = False
+
+    def __init__(self, connection):
+        self.connection = connection
+        # DuckDB transactions belong to the connection, so its cursors share it
+        raw = connection._connection
+        self._cursor = raw.cursor() if connection.dialect == 'sqlite' else raw
+
+    def execute(self, query, params=()):
+        self._cursor.execute(translate(query), tuple(params))
+        return self.rowcount
+
+    def executemany(self, query, rows):
+        rows = [tuple(row) if isinstance(row, (tuple, list)) else (row,) for row in rows]
+        if rows:
+            self._cursor.executemany(translate(query), rows)
+        return self.rowcount
+
+    def _row(self, row):
+        if row is None or not self.as_dict:
+            return row
+        return dict(zip((column[0] for column in self._cursor.description), row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def lastrowid(self):
+        return getattr(self._cursor, 'lastrowid', None)
+
+    @property
+    def rowcount(self):
+        return getattr(self._cursor, 'rowcount', -1)
+
+    def close(self):
+        if self._cursor is not self.connection._connection:
+            self._cursor.close()
+
+
+class EmbeddedDictCursor(EmbeddedCursor):
+    """EmbeddedCursor returning rows as dicts, like pymysql.cursors.DictCursor."""
+
+    as_dict = True
+
+
+class EmbeddedConnection:
+    """Connection wrapper exposing the PyMySQL calls the project makes."""
+
+    def __init__(self, dialect, path, create_schema=True):
+        if dialect not in EMBEDDED_ENGINES:
+            raise ValueError(f"Unknown embedded engine: {dialect}")
+        self.dialect = dialect
+        self.path = path
+        if dialect == 'sqlite':
+            self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            if create_schema:
+                self._connection.execute("PRAGMA journal_mode=WAL")  # Readers don't block a sync
+                self._connection.executescript(EMBEDDED_SCHEMA + SQLITE_TRIGGERS)
+        else:
+            if duckdb is None:
+                raise RuntimeError("The 'duckdb' engine needs the duckdb package (pip install duckdb).")
+            self._connection = duckdb.connect(path)
+            if create_schema:
+                for statement in duckdb_schema():
+                    self._connection.execute(statement)
+            self._connection.begin()  # Like PyMySQL: no autocommit
+
+    @property
+    def open(self):
+        return self._connection is not None
+
+    def cursor(self, cursor_class=None):
+        if 'Dict' in getattr(cursor_class, '__name__', ''):
+            return EmbeddedDictCursor(self)
+        return EmbeddedCursor(self)
+
+    def insert_rows(self, table, columns, rows):
+        """Bulk-insert rows; DuckDB loads them as one DataFrame scan instead of row by row."""
+        if self.dialect == 'duckdb':
+            import pandas as pd  # Only DuckDB needs it; keeps pandas out of the dashboard's startup
+
+            self._connection.register('_insert_batch', pd.DataFrame(list(rows), columns=columns))
+            try:
+                self._connection.execute(
+                    f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(columns)} FROM _insert_batch"
+                )
+            finally:
+                self._connection.unregister('_insert_batch')
+            return
+        placeholders = ", ".join(["%s"] * len(columns))
+        cursor = self.cursor()
+        try:
+            cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+        finally:
+            cursor.close()
+
+    def commit(self):
+        self._connection.commit()
+        if self.dialect == 'duckdb':
+            self._connection.begin()
+
+    def rollback(self):
+        self._connection.rollback()
+        if self.dialect == 'duckdb':
+            self._connection.begin()
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def connect_embedded(dialect, path, create_schema=True):
+    """Open an embedded database file, creating the project's tables if needed."""
+    return EmbeddedConnection(dialect, path, create_schema)
+
+
+class MySQLBackend:
+    """The process-wide PyMySQL connection pool."""
+
+    name = 'mysql'
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def acquire(self):
+        return self.pool.acquire()
+
+    def release(self, connection, discard=False):
+        self.pool.release(connection, discard=discard)
+
+    def connection(self):
+        return self.pool.connection()
+
+    def stats(self):
+        return {'backend': self.name, **self.pool.stats()}
+
+
+class EmbeddedBackend:
+    """A SQLite or DuckDB file; every checkout opens its own connection."""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self._schema_ready = False
+        self._lock = threading.Lock()
+        self._metrics = {'checkouts': 0, 'in_use': 0}
+
+    def acquire(self):
+        with self._lock:
+            if not self._schema_ready:
+                connection = connect_embedded(self.name, self.path)
+                self._schema_ready = True
+            else:
+                connection = None
+            self._metrics['checkouts'] += 1
+            self._metrics['in_use'] += 1
+        try:
+            return connection or connect_embedded(self.name, self.path, create_schema=False)
+        except Exception:
+            with self._lock:
+                self._metrics['in_use'] -= 1
+            raise
+
+    def release(self, connection, discard=False):
+        """Close a checked-out connection, rolling back any open transaction."""
+        try:
+            connection.rollback()
+        finally:
+            connection.close()
+            with self._lock:
+                self._metrics['in_use'] -= 1
+
+    @contextmanager
+    def connection(self):
+        """Context manager that opens a connection and always closes it."""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def stats(self):
+        with self._lock:
+            return {'backend': self.name, 'path': self.path, **self._metrics}
+
+
+def create_backend(name, path=None):
+    """Return the backend called `name` ('mysql', 'sqlite' or 'duckdb')."""
+    if name == 'mysql':
+        return MySQLBackend(db.get_pool())
+    if name in EMBEDDED_ENGINES:
+        return EmbeddedBackend(name, path)
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+_backend = None
+_analytics = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the process-wide primary backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(STORAGE_CONFIG['primary'], STORAGE_CONFIG['sqlite_path'])
+    return _backend
+
+
+def get_analytics_backend():
+    """Return the backend the analytics pages read: the copy if one is configured, else the primary."""
+    global _analytics
+    if _analytics is None:
+        primary = get_backend()
+        with _backend_lock:
+            if _analytics is None:
+                engine = STORAGE_CONFIG['analytics']
+                if engine and primary.name == 'mysql':
+                    _analytics = create_backend(engine, STORAGE_CONFIG['analytics_path'])
+                else:
+                    _analytics = primary  # An embedded primary is already local
+    return _analytics
+
+
+def analytics_is_copy():
+    """Return True when the analytics pages read a synced copy rather than the primary."""
+    return get_analytics_backend() is not get_backend()
+
+
+def connection():
+    """Check out a connection from the primary backend (context manager)."""
+    return get_backend().connection()
+
+
+def sync_analytics(source, target, tables=ANALYTICS_TABLES, batch_size=db.DEFAULT_BATCH_SIZE,
+                   progress=None):
+    """Replace the target's copy of `tables` with the source's rows; returns rows copied per table.
+
+    Everything is read in one source transaction (a consistent snapshot on
+    InnoDB) and written in one target transaction, so readers of the copy
+    see either the old tables or the new ones, never a mix.
+    """
+    cursor = target.cursor()
+    counts = {}
+    try:
+        for table in tables:
+            cursor.execute(f"DELETE FROM {table}")
+            copied = 0
+            for description, rows in db.iter_batches(source, f"SELECT * FROM {table}", batch_size=batch_size):
+                if rows:
+                    target.insert_rows(table, [column[0] for column in description], rows)
+                    copied += len(rows)
+            counts[table] = copied
+            if progress:
+                progress(table, copied)
+        synced_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        cursor.execute("DELETE FROM AnalyticsSync")
+        cursor.executemany("INSERT INTO AnalyticsSync (TableName, CopiedRows, SyncedAt) VALUES (%s, %s, %s)",
+                           [(table, copied, synced_at) for table, copied in counts.items()])
+        target.commit()
+        return counts
+    except Exception:
+        target.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def last_synced(connection):
+    """Return when the analytics copy behind `connection` was last refreshed, or None."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT MIN(SyncedAt) FROM AnalyticsSync")
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S") if row and row[0] else None
+
+
+def sync_now(progress=None):
+    """Refresh the analytics copy from the primary; returns rows copied per table."""
+    if not analytics_is_copy():
+        raise ValueError("No analytics copy is configured (STORAGE_CONFIG['analytics']).")
+    with get_backend().connection() as source, get_analytics_backend().connection() as target:
+        counts = sync_analytics(source, target, progress=progress)
+    query_cache.get_cache().bump(*ANALYTICS_TABLES)
+    return counts
+
+
+_sync_lock = threading.Lock()
+_sync_thread = None
+_next_sync = None  # time.monotonic() when the copy is next due; None until first checked
+
+
+def _sync_in_background():
+    try:
+        sync_now()
+    except Exception as e:
+        logger.warning("Analytics copy refresh failed: %s", e)
+
+
+def maybe_sync():
+    """Start a background refresh of the analytics copy when one is due.
+
+    An empty copy is filled in the foreground instead, so the analytics
+    pages never read it before the first sync has finished.
+    """
+    global _sync_thread, _next_sync
+    if not analytics_is_copy():
+        return
+    interval = STORAGE_CONFIG['sync_interval']
+    with _sync_lock:
+        if _sync_thread is not None and _sync_thread.is_alive():
+            return
+        now = time.monotonic()
+        if _next_sync is None:
+            with get_analytics_backend().connection() as connection:
+                synced_at = last_synced(connection)
+            if synced_at is None:
+                sync_now()
+                _next_sync = time.monotonic() + (interval or 0)
+                return
+            age = (datetime.now() - synced_at).total_seconds()
+            _next_sync = now + max((interval or 0) - age, 0)
+        if not interval or now < _next_sync:
+            return
+        _next_sync = now + interval
+        _sync_thread = threading.Thread(target=_sync_in_background, name="analytics-sync", daemon=True)
+        _sync_thread.start()
+
+
+def analytics_status():
+    """Return the analytics store's backend, last refresh and whether a refresh is running."""
+    backend = get_analytics_backend()
+    status = {'backend': backend.name, 'copy': analytics_is_copy()}
+    if status['copy']:
+        with backend.connection() as connection:
+            synced_at = last_synced(connection)
+        status['path'] = backend.path
+        status['synced_at'] = synced_at.isoformat(sep=' ') if synced_at else None
+        status['sync_interval'] = STORAGE_CONFIG['sync_interval']
+        status['syncing'] = _sync_thread is not None and _sync_thread.is_alive()
+    return status
@@ -0,0 +1,67 @@
+"""
+Dashboard Pages
+One module per menu entry, each exposing render(). A page's module, and
+with it the libraries only that page needs (pandas, NumPy, pyarrow, ...),
+is imported the first time the page is selected, so a rerun executes
+only the selected page and the dashboard starts without loading them.
+Pages check out a database connection only once they need data.
+
+Kept out of a `pages/` directory, which Streamlit would turn into its
+own multipage navigation.
+"""
+
+import importlib
+import threading
+
+
+# menu label -> page module under views/, in menu order
+PAGES = {
+    "Add User": 'add_user',
+    "Add Recruiter": 'add_recruiter',
+    "Add Job": 'add_job',
+    "Add Candidate": 'add_candidate',
+    "Bulk Import": 'csv_import',
+    "Recruiter Analysis": 'recruiter_analysis',
+    "Candidate Analysis": 'candidate_analysis',
+    "Candidate Facets": 'candidate_facets',
+    "Search": 'ranked_search',
+    "Candidate Matching": 'candidate_matching',
+    "Duplicate Candidates": 'duplicate_candidates',
+    "View Data": 'view_data',
+    "Audit Log Dashboard": 'audit_log',
+    "Get Latest Job Salary Range Updates": 'salary_update',
+    "Complex Queries": 'complex_queries',
+    "Performance": 'performance',
+}
+
+
+def load(label):
+    """Import the module of a menu entry (once per process) and return it."""
+    return importlib.import_module(f"{__name__}.{PAGES[label]}")
+
+
+def render(label):
+    """Render the page of a menu entry."""
+    load(label).render()
+
+
+_warmed = False
+_warm_lock = threading.Lock()
+
+
+def warm_up(backend):
+    """Start loading the candidate facet index from `backend` once per process.
+
+    facets (and the NumPy and pandas imports it brings) is imported on the
+    loader thread, so the first page is not held up by it.
+    """
+    global _warmed
+    with _warm_lock:
+        if _warmed:
+            return
+        _warmed = True
+
+    def load_facets():
+        importlib.import_module('facets').load_in_background(backend)
+
+    threading.Thread(target=load_facets, name="facet-index-import", daemon=True).start()
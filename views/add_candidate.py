@@ -0,0 +1,70 @@
+"""
+Add Candidate: queue a new candidate for the background writer, after
+checking it against the dedup index for likely duplicates.
+"""
+
+import streamlit as st
+
+import dedup
+import query_metrics
+import storage
+import write_queue
+from views.common import create_connection, report_write
+
+
+# Insert Data into Candidate Table
+@query_metrics.track("add_candidate")
+def insert_candidate(ed_level, gender, years_coded, country, previous_salary, skills):
+    """Queue a new candidate for the background writer."""
+    pending = write_queue.submit('candidate', (ed_level, gender, years_coded, country, previous_salary, skills))
+    report_write(pending, "Candidate added successfully!", "Error adding candidate")
+
+
+@query_metrics.track("dedup_check")
+def similar_candidates(ed_level, gender, years_coded, country, previous_salary, skills):
+    """Return [(CandidateId, score)] of stored candidates likely to be this one.
+
+    Until the dedup index has loaded (in the background) nothing is found.
+    """
+    index = dedup.get_index()
+    if not index.loaded:
+        dedup.load_in_background(storage.get_backend())
+        return []
+    with create_connection() as connection:
+        if connection:
+            # Picks up candidates added since the last check, e.g. this form submitted a moment ago
+            dedup.record_pairs(connection, index.refresh_if_stale(connection))
+    return index.find_similar(country, ed_level, gender, years_coded, previous_salary, skills)
+
+
+def render():
+    st.header("Add a New Candidate")
+    ed_level = st.text_input("Education Level")
+    gender = st.radio("Gender", ["Male", "Female", "Other"])
+    years_coded = st.number_input("Years Coded", min_value=0)
+    country = st.text_input("Country")
+    previous_salary = st.number_input("Previous Salary", min_value=0)
+    skills = st.text_area("Skills")
+    if st.button("Add Candidate"):
+        if ed_level and gender and country:
+            candidate = (ed_level, gender, years_coded, country, previous_salary, skills)
+            matches = similar_candidates(*candidate)
+            if matches:
+                st.session_state['candidate_duplicates'] = (candidate, matches)
+            else:
+                insert_candidate(*candidate)
+        else:
+            st.error("Please fill all required fields!")
+
+    if 'candidate_duplicates' in st.session_state:
+        candidate, matches = st.session_state['candidate_duplicates']
+        st.warning("This candidate looks like one already stored: " + ", ".join(
+            f"Candidate {candidate_id} (score {score:.2f})" for candidate_id, score in matches
+        ))
+        add_col, cancel_col = st.columns(2)
+        if add_col.button("Add Anyway"):
+            del st.session_state['candidate_duplicates']
+            insert_candidate(*candidate)
+        elif cancel_col.button("Cancel"):
+            del st.session_state['candidate_duplicates']
+            st.rerun()
@@ -0,0 +1,34 @@
+"""
+Add Job: queue a new job posting for the background writer.
+"""
+
+import streamlit as st
+
+import query_metrics
+import write_queue
+from views.common import report_write
+
+
+# Insert Data into Job Table
+@query_metrics.track("add_job")
+def insert_job(location, date, experience, skills, title, contact_person, salary_range):
+    """Queue a new job posting for the background writer."""
+    pending = write_queue.submit('job', write_queue.job_row(
+        location, date, experience, skills, title, contact_person, salary_range))
+    report_write(pending, "Job added successfully!", "Error adding job")
+
+
+def render():
+    st.header("Add a New Job")
+    location = st.text_input("Location")
+    date = st.date_input("Date").isoformat()
+    experience = st.text_input("Experience")
+    skills = st.text_area("Skills")
+    title = st.text_input("Job Title")
+    contact_person = st.text_input("Contact Person")
+    salary_range = st.text_input("Salary Range")
+    if st.button("Add Job"):
+        if location and date and experience and title and contact_person:
+            insert_job(location, date, experience, skills, title, contact_person, salary_range)
+        else:
+            st.error("Please fill all required fields!")
@@ -0,0 +1,30 @@
+"""
+Add Recruiter: queue a new recruiter for the background writer.
+"""
+
+import streamlit as st
+
+import query_metrics
+import write_queue
+from views.common import report_write
+
+
+# Insert Data into Recruiter Table
+@query_metrics.track("add_recruiter")
+def insert_recruiter(contact_person, contact, company, company_profile):
+    """Queue a new recruiter for the background writer."""
+    pending = write_queue.submit('recruiter', (contact_person, contact, company, company_profile))
+    report_write(pending, "Recruiter added successfully!", "Error adding recruiter")
+
+
+def render():
+    st.header("Add a New Recruiter")
+    contact_person = st.text_input("Contact Person")
+    contact = st.text_input("Contact")
+    company = st.text_input("Company")
+    company_profile = st.text_area("Company Profile")
+    if st.button("Add Recruiter"):
+        if contact_person and contact and company:
+            insert_recruiter(contact_person, contact, company, company_profile)
+        else:
+            st.error("Please fill all required fields!")
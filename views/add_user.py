@@ -0,0 +1,33 @@
+"""
+Add User: create a dashboard account (its password is hashed before queueing).
+"""
+
+import bcrypt
+import streamlit as st
+
+import query_metrics
+import write_queue
+from views.common import report_write
+
+
+# Function to insert a new user into the Users table
+@query_metrics.track("add_user")
+def add_new_user(username, password, role):
+    """Queue a new user with a hashed password for the background writer."""
+    # Hash the password before saving it (it is never queued or spilled in clear text)
+    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    pending = write_queue.submit('user', (username, hashed_password.decode('utf-8'), role))
+    report_write(pending, f"User '{username}' added successfully as {role}!", "Error adding user")
+
+
+def render():
+    st.header("Add New User")
+    new_username = st.text_input("Enter Username")
+    new_password = st.text_input("Enter Password", type="password")
+    role = st.selectbox("Select Role", ["admin", "recruiter"])
+    
+    if st.button("Create User"):
+        if new_username and new_password and role:
+            add_new_user(new_username, new_password, role)
+        else:
+            st.error("Please fill all the fields.")
@@ -0,0 +1,107 @@
+"""
+Audit Log Dashboard: salary changes page by page, live or archived.
+"""
+
+from datetime import datetime, timedelta
+
+import pymysql
+import streamlit as st
+
+import audit
+import browser
+import frames
+import query_metrics
+from views.common import read_connection
+from views.downloads import export_controls
+
+
+def render():
+    st.header("Audit Log Dashboard")
+    st.subheader("View Changes Made to Job Entries")
+
+    source = st.selectbox("Source", ["live"] + audit.list_archives(),
+                          format_func=lambda s: "Current entries" if s == "live" else f"Archive {s}")
+    filter_col, date_col, size_col = st.columns(3)
+    job_filter = filter_col.number_input("Job ID (0 for all)", min_value=0, step=1)
+    date_range = date_col.date_input("Modified Between", value=())
+    page_size = size_col.selectbox("Rows per Page", browser.PAGE_SIZES, index=1)
+    filters = {'job_id': int(job_filter) or None}
+    if len(date_range) == 2:
+        # Half-open range covering both selected days
+        filters['start'] = datetime.combine(date_range[0], datetime.min.time())
+        filters['end'] = datetime.combine(date_range[1] + timedelta(days=1), datetime.min.time())
+
+    columns = ["AuditID", "JobID", "Action Type", "Old Salary Range", "New Salary Range", "Modified At"]
+    if source != "live":
+        with query_metrics.track("audit_archive"):
+            rows = audit.read_archive(source, filters)
+        if rows:
+            st.dataframe(frames.to_frame(rows, labels=columns), use_container_width=True, hide_index=True)
+        else:
+            st.info("No archived entries match these filters.")
+    else:
+        # Each entry is the keyset cursor a page starts after; reset when the view changes
+        view = (page_size, repr(sorted(filters.items())))
+        if st.session_state.get('audit_view') != view:
+            st.session_state['audit_view'] = view
+            st.session_state['audit_pages'] = [None]
+            st.session_state['audit_next'] = None
+            st.session_state['audit_seen'] = None
+            st.session_state['audit_new'] = []
+            st.session_state['audit_new_dropped'] = 0
+        pages = st.session_state['audit_pages']
+
+        with query_metrics.track("audit_log"), read_connection() as connection:
+            if connection:
+                cursor = connection.cursor(pymysql.cursors.DictCursor)
+                try:
+                    if st.session_state['audit_seen'] is None:
+                        st.session_state['audit_seen'] = audit.latest_audit_id(cursor)
+                    if st.button("Check for New Entries"):
+                        # Only entries newer than the last one seen are read, oldest first, a batch per check
+                        new_rows = audit.fetch_since(cursor, st.session_state['audit_seen'], filters)
+                        if new_rows:
+                            st.session_state['audit_seen'] = new_rows[-1]['AuditID']
+                            shown = new_rows[::-1] + st.session_state['audit_new']
+                            st.session_state['audit_new'] = shown[:audit.MAX_NEW_ENTRIES]
+                            st.session_state['audit_new_dropped'] += len(shown) - len(st.session_state['audit_new'])
+                            if len(new_rows) == audit.MAX_NEW_ENTRIES:
+                                st.info(f"More new entries are waiting; check again to load the next "
+                                        f"{audit.MAX_NEW_ENTRIES}.")
+                        else:
+                            st.info("No new entries.")
+                    if st.session_state['audit_new']:
+                        st.success(f"{len(st.session_state['audit_new']) + st.session_state['audit_new_dropped']} "
+                                   "new entries since this page was opened:")
+                        st.dataframe(frames.to_frame(st.session_state['audit_new'], labels=columns),
+                                     use_container_width=True, hide_index=True)
+                        if st.session_state['audit_new_dropped']:
+                            st.caption(f"Showing the newest {len(st.session_state['audit_new'])}; "
+                                       f"{st.session_state['audit_new_dropped']} older new entries are in the "
+                                       "log below.")
+
+                    rows, next_after = audit.fetch_page(cursor, filters, after=pages[-1], page_size=page_size)
+                    st.session_state['audit_next'] = next_after
+                    st.caption(f"Page {len(pages)}")
+                    if rows:
+                        with query_metrics.phase('dataframe'):
+                            df = frames.to_frame(rows, labels=columns)
+                        with query_metrics.phase('render'):
+                            st.dataframe(df, use_container_width=True, hide_index=True)
+                    else:
+                        st.info("No audit log entries found.")
+                except Exception as e:
+                    st.error(f"Error executing query: {e}")
+                finally:
+                    cursor.close()
+            else:
+                st.error("Failed to connect to the database.")
+
+        prev_col, next_col = st.columns(2)
+        prev_col.button("Previous Page", disabled=len(pages) == 1,
+                        on_click=lambda: st.session_state['audit_pages'].pop())
+        next_col.button("Next Page", disabled=st.session_state['audit_next'] is None,
+                        on_click=lambda: st.session_state['audit_pages'].append(st.session_state['audit_next']))
+
+        st.subheader("Export")
+        export_controls("job_audit", *audit.export_query(filters))
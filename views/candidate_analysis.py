@@ -0,0 +1,57 @@
+"""
+Candidate Analysis: candidates by skills, education level and experience.
+"""
+
+import streamlit as st
+
+import frames
+import queries
+import query_metrics
+from views.common import read_connection
+from views.tables import show_frame
+
+LABELS = ["CandidateID", "Education Level", "Gender", "Years Coded", "Country", "Previous Salary", "Skills"]
+
+
+# Function to Fetch Matching Candidates
+@query_metrics.track("candidate_search")
+def fetch_candidates(skill, ed_level, min_experience, match="any"):
+    """Fetch candidates having any/all of the given skills and matching the other criteria as a frame."""
+    with read_connection() as connection:
+        if connection:
+            try:
+                query, params = queries.candidate_search(skill, ed_level, min_experience, match)
+                return frames.fetch_frame(connection, query, params, labels=LABELS)
+            except Exception as e:
+                st.error(f"Error executing query: {e}")
+                return None
+        else:
+            return None
+
+
+def render():
+    st.header("Candidate Skills Search and Matching")
+    st.subheader("Find Candidates by Skills, Education Level, and Experience")
+
+    # Input Fields
+    skill = st.text_input("Enter Skills (e.g., Python, SQL)")
+    match = st.radio("Match", ["any", "all"], horizontal=True,
+                     format_func=lambda m: "Any of these skills" if m == "any" else "All of these skills")
+    ed_level = st.selectbox("Select Education Level", ["Undergraduate", "Master", "PhD"])
+    min_experience = st.number_input("Minimum Years of Coding Experience", min_value=0, step=1)
+
+    # Search Button; the last result stays on the page (a page at a time) until the inputs change
+    view = (skill, match, ed_level, min_experience)
+    results = None
+    if st.button("Search Candidates"):
+        if skill and ed_level and min_experience is not None:
+            results = fetch_candidates(skill, ed_level, min_experience, match)
+            if results is not None and results.empty:
+                st.warning("No matching candidates found.")
+            elif results is not None:
+                st.success("Matching Candidates Found:")
+        else:
+            st.error("Please fill in all the fields.")
+
+    # Display Results
+    show_frame("candidate_search", results, view, name="candidate_search")
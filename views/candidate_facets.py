@@ -0,0 +1,82 @@
+"""
+Candidate Facets: filter candidates by facet values with live counts.
+"""
+
+import streamlit as st
+
+import browser
+import facets
+import frames
+import queries
+import query_metrics
+from views.common import read_connection
+
+
+def render():
+    st.header("Candidate Facets")
+    st.subheader("Narrow Down Candidates by Country, Education, Experience, Salary and Skills")
+
+    index = facets.get_index()
+    with query_metrics.track("facet_refresh"), read_connection() as connection:
+        if connection:
+            try:
+                # Reads only candidates added since the last refresh
+                index.refresh_if_stale(connection)
+            except Exception as e:
+                st.error(f"Error loading facet index: {e}")
+
+    if index.loaded:
+        skill_match = st.radio("Skills", ["all", "any"], horizontal=True,
+                               format_func=lambda m: "All selected skills" if m == "all" else "Any selected skill")
+        # Counts are computed from the selection of the previous run; every change reruns the page
+        selected = {name: st.session_state.get(f"facet_{name}", []) for name in facets.FACETS}
+        with query_metrics.track("facet_query"):
+            ids, counts = index.query(selected, skill_match)
+
+        columns = st.columns(3)
+        for position, (name, label) in enumerate(facets.FACETS.items()):
+            columns[position % 3].multiselect(
+                label, index.values(name), key=f"facet_{name}",
+                format_func=lambda value, counts=counts[name]: f"{value} ({counts.get(value, 0):,})",
+            )
+
+        st.metric("Matching Candidates", f"{len(ids):,}")
+        page_size = st.selectbox("Candidates per Page", browser.PAGE_SIZES)
+        view = (repr(sorted(selected.items())), skill_match, page_size)
+        if st.session_state.get('facet_view') != view:
+            st.session_state['facet_view'] = view
+            st.session_state['facet_page'] = 0
+        page = st.session_state['facet_page']
+        page_ids = ids[page * page_size:(page + 1) * page_size]
+        if len(page_ids):
+            with query_metrics.track("facet_page"), read_connection() as connection:
+                if connection:
+                    cursor = connection.cursor()
+                    try:
+                        rows = query_metrics.fetch_all(cursor, *queries.candidates_by_ids(page_ids))
+                        with query_metrics.phase('dataframe'):
+                            df = frames.to_frame(rows, queries.CANDIDATE_COLUMNS, labels=[
+                                "CandidateID", "Education Level", "Gender", "Years Coded", "Country",
+                                "Previous Salary", "Skills",
+                            ])
+                        with query_metrics.phase('render'):
+                            st.dataframe(df, use_container_width=True, hide_index=True)
+                    except Exception as e:
+                        st.error(f"Error executing query: {e}")
+                    finally:
+                        cursor.close()
+            st.caption(f"Page {page + 1} of {-(-len(ids) // page_size)}")
+            prev_col, next_col = st.columns(2)
+            prev_col.button("Previous Page", disabled=page == 0, key="facet_previous",
+                            on_click=lambda: st.session_state.update(facet_page=page - 1))
+            next_col.button("Next Page", disabled=(page + 1) * page_size >= len(ids), key="facet_next",
+                            on_click=lambda: st.session_state.update(facet_page=page + 1))
+        else:
+            st.warning("No matching candidates found.")
+        if st.session_state['role'] == 'admin':
+            st.caption(f"Facet index: {index.stats()}")
+            if st.button("Reload All Candidates (picks up edited candidates)"):
+                with read_connection() as connection:
+                    if connection:
+                        index.refresh(connection, full=True)
+                        st.rerun()
@@ -0,0 +1,59 @@
+"""
+Candidate Matching: rank candidates for a job, or jobs for a candidate.
+"""
+
+import pandas as pd
+import streamlit as st
+
+import matching
+import query_metrics
+from views.common import read_connection
+
+
+def render():
+    st.header("Candidate Matching")
+    st.subheader("Rank Candidates for a Job, or Jobs for a Candidate")
+
+    direction = st.radio("Find", ["candidates", "jobs"], horizontal=True,
+                         format_func=lambda d: "Best candidates for a job" if d == "candidates" else "Best jobs for a candidate")
+    entity_id = st.number_input("Job ID" if direction == "candidates" else "Candidate ID", min_value=1, step=1)
+    k = st.slider("Number of Results", min_value=5, max_value=100, value=10, step=5)
+    with st.expander("Scoring"):
+        metric = st.selectbox("Skill Similarity", matching.SKILL_METRICS)
+        weights = {
+            'skills': st.slider("Skills Weight", 0.0, 1.0, matching.DEFAULT_WEIGHTS['skills']),
+            'experience': st.slider("Experience Weight", 0.0, 1.0, matching.DEFAULT_WEIGHTS['experience']),
+            'salary': st.slider("Salary Weight", 0.0, 1.0, matching.DEFAULT_WEIGHTS['salary']),
+        }
+        full_reload = st.checkbox("Reload all rows (picks up edited candidates and jobs)")
+
+    if st.button("Find Matches"):
+        engine = matching.get_engine()
+        with query_metrics.track("matching_refresh"), read_connection() as connection:
+            if connection:
+                try:
+                    # Only rows added since the last refresh are read unless a full reload is asked for
+                    engine.refresh(connection, full=full_reload)
+                except Exception as e:
+                    st.error(f"Error loading matching data: {e}")
+                    engine = None
+        if engine and engine.candidates is not None:
+            try:
+                with query_metrics.track(f"matching_top_{direction}"):
+                    if direction == "candidates":
+                        results = engine.top_candidates(int(entity_id), k, weights, metric)
+                    else:
+                        results = engine.top_jobs(int(entity_id), k, weights, metric)
+                df = pd.DataFrame(results).rename(columns={
+                    'id': "CandidateID" if direction == "candidates" else "JobID",
+                    'score': "Score", 'skill_score': "Skill Match",
+                    'experience_fit': "Experience Fit", 'salary_fit': "Salary Fit",
+                })
+                if df.empty:
+                    st.warning("No matches found.")
+                else:
+                    st.dataframe(df, hide_index=True)
+            except KeyError as e:
+                st.error(e.args[0])
+        if st.session_state['role'] == 'admin':
+            st.caption(f"Matching index: {engine.stats() if engine else {}}")
@@ -0,0 +1,102 @@
+"""
+Connection and write-reporting helpers shared by the dashboard pages.
+Kept free of pandas and the page modules so the dashboard shell can import
+it on every run without loading them.
+"""
+
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+import query_cache
+import query_metrics
+import replicas
+import storage
+import write_queue
+
+
+# Database Connection Functions
+@contextmanager
+def create_connection(backend=None):
+    """Check out a connection from the primary (or given) backend, yielding None if unavailable."""
+    backend = backend or storage.get_backend()
+    try:
+        with query_metrics.phase('connect'):
+            connection = backend.acquire()
+    except Exception as e:
+        st.error(f"Database Connection Error: {e}")
+        yield None
+        return
+    try:
+        yield connection
+    finally:
+        backend.release(connection)
+
+
+def read_connection():
+    """Check out a connection for a read-only page: a replica, unless this session has just written."""
+    return create_connection(replicas.read_backend(st.session_state.get('last_write_at')))
+
+
+def mark_write():
+    """Note that this session wrote, so its next reads go to the primary."""
+    st.session_state['last_write_at'] = time.time()
+
+
+def cached_fetch_all(cursor, query, params=(), tables=()):
+    """query_cache.fetch_all for a cursor of read_connection() or analytics_connection().
+
+    Results read from a replica are cached for at most max_lag_seconds, as
+    they may predate a committed write, and a session that has just written
+    skips cached results so it reads its writes back from the primary.
+    """
+    ttl = replicas.cache_ttl(cursor.connection, query_cache.get_cache().ttl)
+    fresh = replicas.is_sticky(st.session_state.get('last_write_at'))
+    return query_cache.fetch_all(cursor, query, params, tables=tables, ttl=ttl, fresh=fresh)
+
+
+def analytics_connection():
+    """Check out a connection to the analytics store, refreshing its copy when one is due."""
+    if not storage.analytics_is_copy():
+        return read_connection()
+    try:
+        storage.maybe_sync()
+    except Exception as e:
+        st.warning(f"Analytics copy could not be refreshed: {e}")
+    return create_connection(storage.get_analytics_backend())
+
+# Seconds a form waits for its queued write before reporting it as in progress
+WRITE_WAIT_SECONDS = 5
+
+
+# Outcome of a write handed to the background write queue
+def report_write(pending, success, failure):
+    """Wait briefly for a queued write's group commit and show how it went."""
+    mark_write()
+    status = pending.wait(WRITE_WAIT_SECONDS)
+    if status == write_queue.COMMITTED:
+        st.success(success)
+    elif status == write_queue.FAILED:
+        st.error(f"{failure}: {pending.error}")
+    elif status == write_queue.SPILLED:
+        st.warning("The database is unavailable; the entry was saved and will be written when it is back.")
+    else:
+        # Reported on a later rerun, once the writer gets to it
+        st.session_state.setdefault('pending_writes', []).append((pending, success, failure))
+        st.info("Saving in the background...")
+
+
+def report_finished_writes():
+    """Show the outcome of queued writes that finished after their page was rendered."""
+    still_pending = []
+    for pending, success, failure in st.session_state.get('pending_writes', []):
+        if pending.status == write_queue.COMMITTED:
+            st.toast(success)
+        elif pending.status == write_queue.FAILED:
+            st.toast(f"{failure}: {pending.error}")
+        elif pending.status == write_queue.SPILLED:
+            st.toast("The database is unavailable; queued entries will be written when it is back.")
+        else:
+            still_pending.append((pending, success, failure))
+    st.session_state['pending_writes'] = still_pending
@@ -0,0 +1,259 @@
+"""
+Complex Queries: analytical queries, salary drill-downs and the skill salary benchmark.
+Each query is a function rendering its inputs and results and returning
+its (name, query, params) export, or None. A connection is only checked
+out once a query actually runs: salary statistics that are still cached
+in memory need none.
+"""
+
+import pymysql
+import streamlit as st
+
+import frames
+import queries
+import query_metrics
+import salary_analytics
+import skill_salary
+import skills as skill_index
+from views.common import analytics_connection, cached_fetch_all
+from views.downloads import export_controls
+from views.tables import show_frame
+
+
+def _fetch(query, params, tables):
+    """Run a query on the analytics store through the query cache; rows are dicts.
+
+    Returns None when no connection could be made (the error is shown).
+    """
+    with analytics_connection() as connection:
+        if connection is None:
+            return None
+        cursor = connection.cursor(pymysql.cursors.DictCursor)
+        try:
+            return cached_fetch_all(cursor, query, params, tables=tables)
+        finally:
+            cursor.close()
+
+
+def _fetch_frame(query, params):
+    """Stream a query's result from the analytics store into a compact frame (None without a connection)."""
+    with analytics_connection() as connection:
+        if connection is None:
+            return None
+        return frames.fetch_frame(connection, query, params)
+
+
+def _salary_analytics():
+    """Return the cached salary statistics, connecting only to recompute stale ones."""
+    analytics = salary_analytics.get_cache().current()
+    if analytics is None:
+        with analytics_connection() as connection:
+            if connection:
+                analytics = salary_analytics.get_analytics(connection)
+    return analytics
+
+
+# Salary statistics of one group, served from the in-memory salary analytics
+def salary_drilldown(analytics, dimension, value, label):
+    """Render the statistics and histogram of one group, or a note when it has no salaries."""
+    stats = analytics.group(dimension, value)
+    if stats is None:
+        st.info(f"No {label} candidates with a salary found in the database.")
+        return
+    with query_metrics.phase('render'):
+        columns = st.columns(len(salary_analytics.STATISTICS))
+        columns[0].metric("Candidates", f"{stats['count']:,}")
+        for column, name in zip(columns[1:], salary_analytics.STATISTICS[1:]):
+            column.metric(name.title(), f"${stats[name]:,.0f}")
+        st.bar_chart(analytics.histogram(dimension, value))
+
+
+def top_skills():
+    st.subheader("Top 3 Most In-Demand Skills")
+    location = st.text_input("Filter by Location (optional)")
+    query, params = queries.top_skills(limit=3, location=location.strip() or None)
+    try:
+        results = _fetch(query, params, tables=('Job',))
+        if results is not None:
+            with query_metrics.phase('dataframe'):
+                df = frames.to_frame(results)
+            if not show_frame("top_skills", df, params):
+                st.info("No data found for this query.")
+    except Exception as e:
+        st.error(f"Error: {e}")
+    return ("top_skills", query, params)
+
+
+def recruiters_by_location():
+    st.subheader("Recruiters Posting Jobs in a Specific Location")
+    location = st.text_input("Enter Location (e.g., Amsterdam)")
+    query, params = queries.recruiters_by_location(location)
+    results = None
+    if location and st.button("Run Query"):
+        try:
+            results = _fetch_frame(query, params)
+            if results is not None and results.empty:
+                st.info(f"No jobs found in {location}.")
+        except Exception as e:
+            st.error(f"Error: {e}")
+    show_frame("recruiters_by_location", results, params)
+    return ("recruiters_by_location", query, params) if location else None
+
+
+def top_paying_jobs_for_skill():
+    st.subheader("Jobs with Salary for a Skill")
+    skill = st.text_input("Enter Skill (e.g., Python)")
+    export_spec = None
+    if skill_index.normalize_skills(skill):
+        export_spec = ("top_paying_jobs_for_skill", *queries.top_paying_jobs_for_skill(skill))
+    results = None
+    if st.button("Run Query"):
+        try:
+            if export_spec is None:
+                raise ValueError("Please enter a skill.")
+            results = _fetch_frame(*export_spec[1:])
+            if results is not None and results.empty:
+                st.info(f"No jobs with a salary found for '{skill}'.")
+        except Exception as e:
+            st.error(f"Error: {e}")
+    show_frame("top_paying_jobs_for_skill", results, export_spec and export_spec[2])
+    return export_spec
+
+
+def jobs_by_min_experience():
+    st.subheader("Jobs by Recruiter with Minimum Experience")
+    min_experience = st.number_input("Enter Minimum Experience (in years)", min_value=0, step=1)
+    query, params = queries.jobs_by_min_experience(min_experience)
+    results = None
+    if st.button("Run Query"):
+        try:
+            results = _fetch_frame(query, params)
+            if results is not None and results.empty:
+                st.info("No jobs found with this minimum experience.")
+        except Exception as e:
+            st.error(f"Error: {e}")
+    show_frame("jobs_by_min_experience", results, params)
+    return ("jobs_by_min_experience", query, params)
+
+
+def mean_salary_by_education():
+    st.subheader("Mean Salary of Candidates by Education Level")
+    export_spec = None
+    try:
+        analytics = _salary_analytics()
+        if analytics is None:
+            return None
+        # Dropdown for selecting the education level
+        ed_level = st.selectbox("Select Education Level", analytics.groups('EdLevel'))
+        if ed_level:
+            export_spec = ("mean_salary_by_education", *queries.mean_salary_by_education(ed_level))
+            salary_drilldown(analytics, 'EdLevel', ed_level, ed_level)
+            with query_metrics.phase('render'):
+                st.dataframe(analytics.summary('EdLevel'))
+        else:
+            st.info("No candidates with a salary found in the database.")
+    except Exception as e:
+        st.error(f"Error: {e}")
+    return export_spec
+
+
+def mean_salary_by_skill():
+    st.subheader("Mean Salary of Candidates by Skill")
+
+    # Input field for skill
+    skill = st.text_input("Enter Skill (e.g., Python, SQL, Java)")
+    if not skill_index.normalize_skills(skill):
+        return None
+    try:
+        analytics = _salary_analytics()
+        if analytics is not None:
+            salary_drilldown(analytics, 'Skill', skill_index.normalize_skill(skill), f"'{skill}'")
+    except Exception as e:
+        st.error(f"Error: {e}")
+    return ("mean_salary_by_skill", *queries.mean_salary_by_skill(skill))
+
+
+def salary_distribution():
+    st.subheader("Candidate Salary Distribution by Group")
+    dimension = st.selectbox("Group By", list(salary_analytics.DIMENSIONS),
+                             format_func=salary_analytics.DIMENSIONS.get)
+    try:
+        analytics = _salary_analytics()
+        if analytics is None:
+            return None
+        with query_metrics.phase('render'):
+            st.dataframe(analytics.summary(dimension))
+        groups = analytics.groups(dimension)
+        if groups:
+            value = st.selectbox(f"Drill Down into {salary_analytics.DIMENSIONS[dimension]}", groups)
+            salary_drilldown(analytics, dimension, value, value)
+        else:
+            st.info("No candidates with a salary found in the database.")
+    except Exception as e:
+        st.error(f"Error: {e}")
+    return None
+
+
+def skill_salary_benchmark():
+    st.subheader("In-Demand Skills with Salary Benchmark")
+    sort_col, size_col = st.columns(2)
+    sort_by = sort_col.selectbox("Sort By", ["Demand Rank", "Avg Salary Max", "Median Salary Max"])
+    page_size = size_col.selectbox("Skills per Page", [10, 25, 50])
+    try:
+        rows = _fetch(*queries.skill_salary_buckets(), tables=('Job',))
+        if rows is None:
+            return None
+        with query_metrics.phase('dataframe'):
+            df = skill_salary.benchmark(rows)
+            if sort_by != "Demand Rank":
+                df = df.sort_values(sort_by, ascending=False, kind='stable')
+
+        # Only the current page is rendered; a new sort or page size starts over
+        view = (sort_by, page_size)
+        if st.session_state.get('benchmark_view') != view:
+            st.session_state['benchmark_view'] = view
+            st.session_state['benchmark_page'] = 0
+        page = st.session_state['benchmark_page']
+        if len(df):
+            with query_metrics.phase('render'):
+                st.dataframe(df.iloc[page * page_size:(page + 1) * page_size],
+                             use_container_width=True, hide_index=True)
+            st.caption(f"Page {page + 1} of {-(-len(df) // page_size)} ({len(df):,} skills)")
+            prev_col, next_col = st.columns(2)
+            prev_col.button("Previous Page", disabled=page == 0, key="benchmark_prev",
+                            on_click=lambda: st.session_state.update(benchmark_page=page - 1))
+            next_col.button("Next Page", disabled=(page + 1) * page_size >= len(df), key="benchmark_next",
+                            on_click=lambda: st.session_state.update(benchmark_page=page + 1))
+        else:
+            st.info("No data found for this query.")
+    except Exception as e:
+        st.error(f"Error executing query: {e}")
+    return ("skill_salary_benchmark", *queries.skill_salary_benchmark())
+
+
+# Note: "Top Recruiters by Candidate Success" query removed
+# Reason: Candidate table has no JobID foreign key relationship in the actual schema
+# This feature was proposed in Phase 1 but couldn't be implemented due to data constraints
+
+# Complex query options, in menu order: label -> (name timings and exports are recorded under, renderer)
+COMPLEX_QUERIES = {
+    "Top 3 Most In-Demand Skills Across All Jobs": ("top_skills", top_skills),
+    "Find Recruiters Posting Jobs in a Specific Location": ("recruiters_by_location", recruiters_by_location),
+    "Find Jobs Offering Salary for a Specific Skill": ("top_paying_jobs_for_skill", top_paying_jobs_for_skill),
+    "Jobs Available by Recruiter with a Minimum Experience Requirement": ("jobs_by_min_experience",
+                                                                          jobs_by_min_experience),
+    "Compute Mean Salary by Education Level": ("mean_salary_by_education", mean_salary_by_education),
+    "Compute Mean Salary by Skill": ("mean_salary_by_skill", mean_salary_by_skill),
+    "Salary Distribution by Group": ("salary_distribution", salary_distribution),
+    "In-Demand Skills with Salary Benchmark": ("skill_salary_benchmark", skill_salary_benchmark),
+}
+
+
+def render():
+    st.header("Run Complex Queries")
+    query_option = st.selectbox("Select a Query", list(COMPLEX_QUERIES))
+    name, run = COMPLEX_QUERIES[query_option]
+    with query_metrics.track(name):
+        export_spec = run()
+    if export_spec:
+        export_controls(*export_spec)
@@ -0,0 +1,85 @@
+"""
+Bulk Import: resumable CSV import of candidates or jobs.
+"""
+
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+import streamlit as st
+
+import bulk_import
+import dedup
+import query_cache
+import storage
+from views.common import create_connection, mark_write
+
+
+def _check_duplicates(connection):
+    """Check the imported candidates against the dedup index and report pairs found."""
+    if not dedup.get_index().loaded:
+        # Scanned once the index has loaded in the background
+        dedup.load_in_background(storage.get_backend())
+        return
+    try:
+        found = dedup.scan(connection)
+    except Exception as e:
+        st.warning(f"Imported candidates could not be checked for duplicates: {e}")
+        return
+    if found:
+        st.warning(f"Found {found:,} likely duplicate pairs involving the imported candidates; "
+                   "review them on the Duplicate Candidates page.")
+
+
+def render():
+    st.header("Bulk Import")
+    st.subheader("Import Candidates or Jobs from a CSV File")
+    entity = st.radio("Import", ["candidate", "job"], horizontal=True, format_func=lambda e: e.title() + "s")
+    required = ", ".join(bulk_import.ENTITIES[entity]['required'])
+    st.caption(f"Columns: {', '.join(bulk_import.ENTITIES[entity]['columns'][:7])}. Required: {required}. "
+               "Re-uploading a file whose import was interrupted resumes it.")
+    uploaded = st.file_uploader("CSV File", type=["csv"])
+    batch_size = st.number_input("Rows per Batch", min_value=100, value=bulk_import.DEFAULT_BATCH_SIZE, step=500)
+
+    if uploaded and st.button("Start Import"):
+        work_dir = tempfile.mkdtemp(prefix="talent_import_")
+        source_path = os.path.join(work_dir, "source.csv")
+        rejects_path = os.path.join(work_dir, "rejects.csv")
+        with open(source_path, "wb") as handle:
+            shutil.copyfileobj(uploaded, handle)
+        with open(source_path, "rb") as handle:
+            total_rows = max(sum(1 for _ in handle) - 1, 1)
+
+        progress_bar = st.progress(0.0)
+        status = st.empty()
+
+        def show_progress(report):
+            progress_bar.progress(min(report['rows_read'] / total_rows, 1.0))
+            status.text(f"Read {report['rows_read']:,} rows: {report['inserted']:,} inserted, "
+                        f"{report['rejected']:,} rejected")
+
+        with create_connection() as connection:
+            if connection:
+                try:
+                    report = bulk_import.import_csv(
+                        connection, entity, source_path, source_name=uploaded.name,
+                        batch_size=int(batch_size), rejects_path=rejects_path, progress=show_progress,
+                    )
+                    query_cache.invalidate(bulk_import.ENTITIES[entity]['table'])
+                    mark_write()
+                    if report['resumed_at']:
+                        st.info(f"Resumed a previous import after row {report['resumed_at']:,}.")
+                    st.success(f"Import finished: {report['inserted']:,} rows inserted, "
+                               f"{report['rejected']:,} rejected.")
+                    if entity == 'candidate' and report['inserted']:
+                        _check_duplicates(connection)
+                    if report['rejected']:
+                        st.dataframe(pd.DataFrame(report['rejects'], columns=["Line", "Error"]),
+                                     hide_index=True)
+                        with open(rejects_path, "rb") as handle:
+                            st.download_button("Download All Rejects", handle,
+                                               file_name="rejects.csv", mime="text/csv")
+                except Exception as e:
+                    st.error(f"Import failed: {e}. Upload the same file again to resume.")
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,44 @@
+"""
+Export controls for the pages offering a CSV/Parquet download of their
+query. Separate from views.common because export loads pyarrow.
+"""
+
+import os
+
+import streamlit as st
+
+import export
+from views.common import read_connection
+
+
+# Streamed export of a query's full result as a download
+def export_controls(name, query, params=()):
+    """Render controls that stream a query's result to a CSV/Parquet download."""
+    format_col, button_col = st.columns(2)
+    fmt = format_col.selectbox("Export Format", export.available_formats(),
+                               format_func=str.upper, key=f"export_format_{name}")
+    if button_col.button("Prepare Export", key=f"export_{name}"):
+        status = st.empty()
+        with read_connection() as connection:
+            if connection:
+                try:
+                    path, rows = export.export_query(
+                        connection, query, params, fmt=fmt,
+                        progress=lambda done: status.text(f"Exported {done:,} rows..."),
+                        max_bytes=export.EXPORT_CONFIG['max_download_mb'] * 1_000_000,
+                    )
+                    status.text(f"Exported {rows:,} rows.")
+                    mime, extension = export.FORMATS[fmt]
+                    # The download is held in memory, hence the size limit above
+                    with open(path, "rb") as handle:
+                        data = handle.read()
+                    os.remove(path)
+                    st.download_button(f"Download {fmt.upper()}", data,
+                                       file_name=f"{name}{extension}", mime=mime)
+                except export.ExportTooLargeError as e:
+                    status.empty()
+                    st.error(f"{e} Downloads are limited to {export.EXPORT_CONFIG['max_download_mb']:,} MB; "
+                             "narrow the query, try Parquet, or export whole tables with "
+                             "`python manage.py export`.")
+                except Exception as e:
+                    st.error(f"Export failed: {e}")
@@ -0,0 +1,93 @@
+"""
+Duplicate Candidates: review likely duplicate candidates and merge or dismiss them (admins only).
+"""
+
+import streamlit as st
+
+import dedup
+import query_metrics
+from views.common import create_connection, mark_write
+
+# Pairs shown per page load, highest score first
+PAIRS_SHOWN = 10
+
+
+def _compare(pair):
+    """Show a pair's two candidates side by side, the kept (older) one first."""
+    left, right = st.columns(2)
+    for column, title, row in ((left, f"Keep: Candidate {pair['DuplicateOf']}", pair['duplicate_of']),
+                               (right, f"Merge: Candidate {pair['CandidateId']}", pair['candidate'])):
+        column.markdown(f"**{title}**")
+        if row is None:
+            column.caption("No longer exists.")
+        else:
+            column.dataframe([{"Field": name, "Value": "" if value is None else str(value)}
+                              for name, value in row.items() if name != 'CandidateId'],
+                             use_container_width=True, hide_index=True)
+
+
+def _review(action, pair):
+    with create_connection() as connection:
+        if connection is None:
+            return
+        try:
+            if action == "merge":
+                dedup.merge(connection, pair['CandidateId'], pair['DuplicateOf'])
+                st.session_state['dedup_merged'] = True
+            else:
+                dedup.dismiss(connection, pair['CandidateId'], pair['DuplicateOf'])
+        except Exception as e:
+            st.session_state['dedup_error'] = str(e)
+            return
+    mark_write()
+
+
+def render():
+    st.header("Duplicate Candidates")
+    if st.session_state['role'] != 'admin':
+        st.error("The Duplicate Candidates page is only available to admins.")
+        return
+    st.caption("Candidates with similar skills and attributes, found by MinHash/LSH and scored on skill "
+               "overlap, country, education, gender, experience and salary. Merging keeps the older "
+               "candidate, fills its missing fields from the newer one and combines their skills.")
+
+    index = dedup.get_index()
+    with query_metrics.track("dedup_refresh"), create_connection() as connection:
+        if connection is None:
+            return
+        try:
+            # Checks only candidates added since the last refresh against the index
+            dedup.record_pairs(connection, index.refresh_if_stale(connection))
+            if st.button("Scan All Candidates"):
+                found = dedup.scan(connection, full=True)
+                st.success(f"Scan finished: {found:,} likely duplicate pairs "
+                           "(pairs already reviewed keep their decision).")
+            cursor = connection.cursor()
+            try:
+                with query_metrics.track("dedup_pending"):
+                    pending = dedup.count_pending(cursor)
+                    pairs = dedup.pending_pairs(cursor, PAIRS_SHOWN)
+            finally:
+                cursor.close()
+        except Exception as e:
+            st.error(f"Error loading duplicate candidates: {e}")
+            return
+
+    if 'dedup_error' in st.session_state:
+        st.error(f"Review failed: {st.session_state.pop('dedup_error')}")
+    if st.session_state.get('dedup_merged'):
+        st.info("Candidate Facets and Candidate Matching show merged-away candidates until "
+                "their indexes are reloaded in full.")
+    st.metric("Pairs Awaiting Review", f"{pending:,}")
+    if not pairs:
+        st.success("No likely duplicates awaiting review.")
+    for pair in pairs:
+        key = f"{pair['CandidateId']}_{pair['DuplicateOf']}"
+        st.subheader(f"Candidate {pair['CandidateId']} / {pair['DuplicateOf']}: score {float(pair['Score']):.3f}")
+        _compare(pair)
+        merge_col, dismiss_col = st.columns(2)
+        merge_col.button("Merge", key=f"dedup_merge_{key}", on_click=_review, args=("merge", pair),
+                         disabled=pair['candidate'] is None or pair['duplicate_of'] is None)
+        dismiss_col.button("Not a Duplicate", key=f"dedup_dismiss_{key}", on_click=_review, args=("dismiss", pair))
+        st.divider()
+    st.caption(f"Dedup index: {index.stats()}")
@@ -0,0 +1,63 @@
+"""
+Performance: query latency, slow queries and metric downloads (admins only).
+"""
+
+import pandas as pd
+import streamlit as st
+
+import query_metrics
+
+
+def render():
+    st.header("Performance")
+    if st.session_state['role'] != 'admin':
+        st.error("The Performance page is only available to admins.")
+    else:
+        metrics = query_metrics.get_metrics()
+        snapshot = metrics.snapshot()
+        st.subheader("Query Latency")
+        st.caption(f"Rolling window of the last {metrics.window} runs per query and phase; "
+                   f"queries over {metrics.slow_query_ms} ms are logged below.")
+        if snapshot:
+            summary = []
+            for name, stats in sorted(snapshot.items()):
+                total = stats['phases'].get('total') or stats['phases'].get('execute') or {}
+                row = {
+                    "Query": name, "Calls": stats['calls'], "Errors": stats['errors'],
+                    "Cache Hits": stats['cache_hits'], "Rows": stats['rows'], "Bytes": stats['bytes'],
+                    "p50 ms": total.get('p50_ms'), "p95 ms": total.get('p95_ms'),
+                    "p99 ms": total.get('p99_ms'), "Max ms": total.get('max_ms'),
+                }
+                for phase_name in query_metrics.PHASES[:-1]:
+                    row[f"{phase_name.title()} ms"] = stats['phases'].get(phase_name, {}).get('mean_ms')
+                summary.append(row)
+            st.dataframe(pd.DataFrame(summary).round(1), use_container_width=True, hide_index=True)
+
+            selected = st.selectbox("Latency Histogram", sorted(snapshot))
+            phases = snapshot[selected]['phases']
+            phase_name = st.radio("Phase", list(phases), horizontal=True)
+            buckets = phases[phase_name]['buckets'] + [phases[phase_name]['count']]
+            labels = [f"≤{bound * 1000:g} ms" for bound in query_metrics.BUCKETS] + ["slower"]
+            counts = [later - earlier for earlier, later in zip([0] + buckets[:-1], buckets)]
+            st.bar_chart(pd.DataFrame({"Runs": counts}, index=pd.Index(labels, name="Latency")))
+        else:
+            st.info("No queries recorded yet.")
+
+        st.subheader("Slow Queries")
+        slow = metrics.slow_queries()
+        if not slow:
+            st.info("No slow queries recorded.")
+        for entry in slow:
+            with st.expander(f"{entry['at']}  {entry['name']}  {entry['ms']:.0f} ms"):
+                st.code(entry['query'], language="sql")
+                st.text(f"Parameters: {entry['params']}")
+                st.write(entry['plan'])
+
+        json_col, prom_col, reset_col = st.columns(3)
+        json_col.download_button("Download JSON", metrics.to_json(),
+                                 file_name="query_metrics.json", mime="application/json")
+        prom_col.download_button("Download Prometheus", metrics.to_prometheus(),
+                                 file_name="query_metrics.prom", mime="text/plain")
+        if reset_col.button("Reset Metrics"):
+            metrics.reset()
+            st.rerun()
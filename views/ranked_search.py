@@ -0,0 +1,83 @@
+"""
+Search: relevance-ranked search over candidate skills, jobs and company profiles.
+"""
+
+import pandas as pd
+import pymysql
+import streamlit as st
+
+import browser
+import query_metrics
+import search
+from views.common import read_connection
+
+
+SEARCH_MODE_LABELS = {
+    'natural': "Ranked (any term)",
+    'all': "All terms",
+    'boolean': "Boolean expression",
+}
+
+
+def render():
+    st.header("Search")
+    st.subheader("Ranked Search over Candidate Skills, Jobs and Company Profiles")
+
+    target = st.radio("Search In", list(search.TARGETS), horizontal=True,
+                      format_func=lambda t: search.TARGETS[t]['label'])
+    text = st.text_input("Search Terms (e.g., python django aws)")
+    mode = st.radio("Mode", search.MODES, horizontal=True, format_func=SEARCH_MODE_LABELS.get)
+    if mode == 'boolean':
+        st.caption('+word must match, -word must not, "a phrase", prefix* matches word starts.')
+    filters = {}
+    if target == 'candidate':
+        ed_col, exp_col = st.columns(2)
+        ed_level = ed_col.selectbox("Education Level", ["Any", "Undergraduate", "Master", "PhD"])
+        filters['ed_level'] = None if ed_level == "Any" else ed_level
+        filters['min_experience'] = exp_col.number_input("Minimum Years of Coding Experience",
+                                                         min_value=0, step=1) or None
+    elif target == 'job':
+        filters['location'] = st.text_input("Location (optional)").strip() or None
+    page_size = st.selectbox("Results per Page", [size for size in browser.PAGE_SIZES
+                                                  if size <= search.MAX_PAGE_SIZE])
+
+    # Each entry is the (score, key) cursor a page starts after; reset when the search changes
+    view = (target, text, mode, repr(sorted(filters.items())), page_size)
+    if st.session_state.get('search_view') != view:
+        st.session_state['search_view'] = view
+        st.session_state['search_pages'] = [None]
+        st.session_state['search_next'] = None
+    pages = st.session_state['search_pages']
+
+    if search.terms(text):
+        with query_metrics.track(f"search_{target}"), read_connection() as connection:
+            if connection:
+                cursor = connection.cursor(pymysql.cursors.DictCursor)
+                try:
+                    rows, next_after = search.search(cursor, target, text, mode, filters,
+                                                     after=pages[-1], page_size=page_size)
+                    st.session_state['search_next'] = next_after
+                    st.caption(f"Page {len(pages)}")
+                    if rows:
+                        with query_metrics.phase('dataframe'):
+                            df = pd.DataFrame(rows)
+                            df['Score'] = df['Score'].astype(float).round(3)
+                        with query_metrics.phase('render'):
+                            st.dataframe(df, use_container_width=True, hide_index=True)
+                    else:
+                        st.info("No matches found.")
+                except Exception as e:
+                    st.error(f"Error executing query: {e}")
+                finally:
+                    cursor.close()
+            else:
+                st.error("Failed to connect to the database.")
+
+        prev_col, next_col = st.columns(2)
+        prev_col.button("Previous Page", disabled=len(pages) == 1,
+                        on_click=lambda: st.session_state['search_pages'].pop())
+        at_limit = len(pages) * page_size >= search.MAX_RESULTS
+        if at_limit and st.session_state['search_next'] is not None:
+            st.caption(f"Only the best {search.MAX_RESULTS:,} matches are ranked; refine the search to see others.")
+        next_col.button("Next Page", disabled=st.session_state['search_next'] is None or at_limit,
+                        on_click=lambda: st.session_state['search_pages'].append(st.session_state['search_next']))
@@ -0,0 +1,58 @@
+"""
+Recruiter Analysis: jobs posted and average salaries per recruiter.
+"""
+
+import pandas as pd
+import streamlit as st
+
+import frames
+import queries
+import query_metrics
+import recruiter_stats
+from views.common import analytics_connection, cached_fetch_all
+from views.tables import show_frame
+
+
+def render():
+    st.header("Recruiter Performance Analytics")
+    window = st.radio("Period", [*recruiter_stats.WINDOWS, None], horizontal=True,
+                      format_func=lambda days: f"Last {days} days" if days else "All time")
+    st.subheader("Jobs Posted by Each Recruiter" + (f" in the Last {window} Days" if window else ""))
+
+    # Fetch Data (summary rows from RecruiterStats, not a scan of Job)
+    name = f"recruiter_activity_{window}d" if window else "recruiter_job_counts"
+    with query_metrics.track(name), analytics_connection() as connection:
+        if connection:
+            try:
+                if window:
+                    query, params = queries.recruiter_activity(window)
+                    columns = ['ContactPerson', 'JobsPosted', 'AvgSalaryMin', 'AvgSalaryMax']
+                    labels = ["Recruiter", "Jobs Posted", "Avg Salary Min", "Avg Salary Max"]
+                else:
+                    query, params = queries.recruiter_job_counts()
+                    columns, labels = ['ContactPerson', 'TotalJobsPosted'], ["Recruiter", "Total Jobs Posted"]
+                cursor = connection.cursor()
+                results = cached_fetch_all(cursor, query, params, tables=('Recruiter', 'Job'))
+
+                if results:
+                    # Convert results to a compact frame, shown a page at a time
+                    with query_metrics.phase('dataframe'):
+                        df = frames.to_frame(results, columns, labels)
+                    show_frame("recruiter_analysis", df, window)
+                else:
+                    st.info("No data available.")
+
+                # Postings across all recruiters: daily for short windows, weekly otherwise
+                since = recruiter_stats.window_start(window) if window else None
+                query, params = queries.posting_trend('day' if window and window <= 30 else 'week', since)
+                trend = cached_fetch_all(cursor, query, params, tables=('Recruiter', 'Job'))
+                if trend:
+                    st.subheader("Jobs Posted Over Time")
+                    st.bar_chart(pd.DataFrame(trend, columns=["Period", "Jobs Posted"]).set_index("Period"))
+
+            except Exception as e:
+                st.error(f"Error executing query: {e}")
+            finally:
+                cursor.close()
+        else:
+            st.error("Failed to connect to the database.")
@@ -0,0 +1,125 @@
+"""
+Update Job Salary: change one job's salary range, found with a typeahead
+lookup, or many from a CSV file, and show the audit entries.
+"""
+
+import io
+
+import pymysql
+import streamlit as st
+
+import audit
+import job_lookup
+import query_cache
+import query_metrics
+import salary_updates
+from views.common import create_connection, mark_write
+
+
+def _find_jobs(text):
+    """Return the jobs matching the search text, looking up only a term this session has not just run."""
+    term = job_lookup.normalize(text)
+    last = st.session_state.get('salary_job_lookup')
+    if last is not None and last[0] == term:
+        return last[1]
+    jobs = ()
+    with create_connection() as connection:
+        if connection is None:
+            return jobs
+        cursor = connection.cursor()
+        try:
+            jobs = job_lookup.lookup(cursor, term)
+        finally:
+            cursor.close()
+    st.session_state['salary_job_lookup'] = (term, jobs)
+    return jobs
+
+
+def _written():
+    query_cache.invalidate('Job', 'Job_Audit')
+    mark_write()
+    st.session_state.pop('salary_job_lookup', None)  # Labels show the old ranges
+
+
+def _single_update():
+    # Streamlit sends the text once it is committed (Enter or leaving the field)
+    text = st.text_input("Find a Job", placeholder="JobId, title, location or recruiter",
+                         help=f"Type at least {job_lookup.LOOKUP_CONFIG['min_chars']} characters "
+                              "(or a JobId) and press Enter.")
+    if not job_lookup.normalize(text):
+        return
+    try:
+        jobs = _find_jobs(text)
+    except Exception as e:
+        st.error(f"Error: {e}")
+        return
+    if not jobs:
+        st.info("No matching jobs. Type more of a title, location, recruiter or JobId.")
+        return
+    if len(jobs) == job_lookup.LOOKUP_CONFIG['max_results']:
+        st.caption(f"Showing the first {len(jobs)} matches; type more to narrow them down.")
+    job = st.selectbox("Select a Job to Update", jobs, format_func=job_lookup.label)
+    new_salary = st.text_input("Enter New Salary Range (e.g., 120000-150000)")
+
+    if st.button("Update Salary Range"):
+        job_id = job[0]
+        with create_connection() as connection:
+            if connection is None:
+                return
+            try:
+                report = salary_updates.update_salary(connection, job_id, new_salary)
+                if report['rejected']:
+                    st.error(f"Please enter valid Salary Range. {report['rejects'][0][1]}.")
+                    return
+                if not report['updated']:
+                    st.info(f"Job {job_id} already has this salary range.")
+                    return
+                _written()
+                st.success(f"Job {job_id} updated successfully!")
+
+                # Display this job's latest audit entries (an index range read)
+                st.subheader("Audit Log (Job_Audit)")
+                audit_cursor = connection.cursor(pymysql.cursors.DictCursor)
+                try:
+                    with query_metrics.track("salary_update_audit"):
+                        audit_log, _ = audit.fetch_page(audit_cursor, {'job_id': job_id}, page_size=10)
+                finally:
+                    audit_cursor.close()
+                st.dataframe(audit_log, use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.error(f"Error: {e}")
+
+
+def _bulk_update():
+    st.caption("CSV with JobId and SalaryRange columns (a header row is optional). All rows are "
+               "applied in one transaction; each changed range is logged in Job_Audit.")
+    uploaded = st.file_uploader("Salary Ranges CSV", type=["csv"])
+    if not (uploaded and st.button("Apply Updates")):
+        return
+    with create_connection() as connection:
+        if connection is None:
+            return
+        try:
+            with query_metrics.track("salary_bulk_update"):
+                report = salary_updates.update_from_csv(
+                    connection, io.TextIOWrapper(uploaded, encoding='utf-8-sig', newline='')
+                )
+        except Exception as e:
+            st.error(f"Update failed, no salary range was changed: {e}")
+            return
+    if report['updated']:
+        _written()
+    st.success(f"{len(report['updated']):,} of {report['rows']:,} jobs updated, "
+               f"{report['unchanged']:,} unchanged, {report['rejected']:,} rejected.")
+    if report['rejects']:
+        st.dataframe([{"Line": line, "Error": error} for line, error in report['rejects']],
+                     use_container_width=True, hide_index=True)
+
+
+def render():
+    st.header("Update Job Salary Range")
+    mode = st.radio("Update", ["Single Job", "Bulk (CSV)"], horizontal=True)
+    if mode == "Single Job":
+        _single_update()
+    else:
+        _bulk_update()
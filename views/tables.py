@@ -0,0 +1,52 @@
+"""
+Paged rendering of result frames (see frames.py). Only one page of a
+result goes to the browser, as an Arrow table that st.dataframe scrolls
+virtually; the full frame stays on the server in the session, so paging
+through a result that a button produced needs no new query.
+"""
+
+import time
+
+import streamlit as st
+
+import frames
+import query_metrics
+
+
+def show_frame(key, frame=None, view=None, name=None, page_rows=None):
+    """Render a result frame a page at a time, with its memory use and render time.
+
+    A new `frame` is kept in the session under `key` together with the
+    `view` it answers (e.g. the query's parameters); a new view starts at
+    the first page. Without a frame, the kept one is shown again if its
+    view is still `view`, so paging a result a button produced needs no
+    new query. Returns whether rows were shown.
+    """
+    page_rows = page_rows or frames.FRAME_CONFIG['page_rows']
+    if frame is not None:
+        if st.session_state.get(f"{key}_view") != view:
+            st.session_state[f"{key}_page"] = 0
+        st.session_state[f"{key}_view"] = view
+        st.session_state[f"{key}_frame"] = frame
+    elif st.session_state.get(f"{key}_view") != view:
+        return False
+    frame = st.session_state.get(f"{key}_frame")
+    if frame is None or frame.empty:
+        return False
+
+    pages = -(-len(frame) // page_rows)
+    page = min(st.session_state.get(f"{key}_page", 0), pages - 1)
+    start = time.perf_counter()
+    with query_metrics.phase('render', name):
+        st.dataframe(frame.iloc[page * page_rows:(page + 1) * page_rows], use_container_width=True, hide_index=True)
+    rendered = time.perf_counter() - start
+    shown = f"Rows {page * page_rows + 1:,}-{min((page + 1) * page_rows, len(frame)):,} of " if pages > 1 else ""
+    st.caption(f"{shown}{len(frame):,} rows, {frames.memory_bytes(frame) / 1e6:,.1f} MB in memory, "
+               f"page rendered in {rendered * 1000:,.0f} ms")
+    if pages > 1:
+        prev_col, next_col = st.columns(2)
+        prev_col.button("Previous Page", disabled=page == 0, key=f"{key}_previous",
+                        on_click=lambda: st.session_state.update({f"{key}_page": page - 1}))
+        next_col.button("Next Page", disabled=page + 1 >= pages, key=f"{key}_next",
+                        on_click=lambda: st.session_state.update({f"{key}_page": page + 1}))
+    return True
@@ -0,0 +1,96 @@
+"""
+View Data: keyset-paginated browsing of recruiters, jobs and candidates.
+"""
+
+import pymysql
+import streamlit as st
+
+import browser
+import frames
+import query_metrics
+from views.common import read_connection
+from views.downloads import export_controls
+
+
+# Approximate row counts change slowly, so reuse them across reruns for a minute
+@st.cache_data(ttl=60, show_spinner=False)
+@query_metrics.track("estimate_row_count")
+def estimate_row_count(table, filters):
+    """Return the approximate number of rows matching the View Data filters."""
+    with read_connection() as connection:
+        if connection:
+            cursor = connection.cursor(pymysql.cursors.DictCursor)
+            try:
+                return browser.estimate_count(cursor, table, filters)
+            finally:
+                cursor.close()
+    return 0
+
+
+def render():
+    st.header("Data")
+    table = st.selectbox("Table", list(browser.BROWSABLE_TABLES))
+    spec = browser.BROWSABLE_TABLES[table]
+    columns = st.multiselect("Columns", spec['columns'], default=spec['columns'])
+    sort_col, order_col, size_col = st.columns(3)
+    sort = sort_col.selectbox("Sort By", spec['sort_columns'])
+    descending = order_col.checkbox("Descending")
+    page_size = size_col.selectbox("Rows per Page", browser.PAGE_SIZES, index=1)
+
+    # Server-side filters on indexed columns
+    filters = {}
+    with st.expander("Filters"):
+        for column, kind in spec['filters'].items():
+            if kind == 'range':
+                low_col, high_col = st.columns(2)
+                low = low_col.text_input(f"Min {column}", key=f"browse_{table}_{column}_min").strip()
+                high = high_col.text_input(f"Max {column}", key=f"browse_{table}_{column}_max").strip()
+                filters[column] = (int(low) if low.isdigit() else None, int(high) if high.isdigit() else None)
+            elif kind == 'skills':
+                filters[column] = st.text_input("Skills (all of, comma-separated)", key=f"browse_{table}_{column}").strip()
+            else:
+                filters[column] = st.text_input(column, key=f"browse_{table}_{column}").strip()
+    if sort != spec['key']:
+        st.caption(f"Rows without a {sort} value are hidden while sorting by it.")
+
+    # Each entry is the keyset cursor a page starts after; reset when the view changes
+    view = (table, sort, descending, page_size, repr(sorted(filters.items())))
+    if st.session_state.get('browse_view') != view:
+        st.session_state['browse_view'] = view
+        st.session_state['browse_pages'] = [None]
+        st.session_state['browse_next'] = None
+    pages = st.session_state['browse_pages']
+
+    with query_metrics.track(f"browse_{table.lower()}"), read_connection() as connection:
+        if connection:
+            cursor = connection.cursor(pymysql.cursors.DictCursor)  # Use DictCursor
+            try:
+                rows, next_after = browser.fetch_page(
+                    cursor, table, columns, filters, sort, descending, after=pages[-1], page_size=page_size
+                )
+                st.session_state['browse_next'] = next_after
+                total = estimate_row_count(table, filters)
+                st.caption(f"Page {len(pages)} of about {max(1, -(-total // page_size)):,} (≈{total:,} rows)")
+                if rows:
+                    with query_metrics.phase('dataframe'):
+                        df = frames.to_frame(rows)
+                    with query_metrics.phase('render'):
+                        st.dataframe(df, use_container_width=True, hide_index=True)
+                else:
+                    st.info("No rows found.")
+            except Exception as e:
+                st.error(f"Error: {e}")
+            finally:
+                cursor.close()
+
+    prev_col, next_col = st.columns(2)
+    prev_col.button("Previous Page", disabled=len(pages) == 1,
+                    on_click=lambda: st.session_state['browse_pages'].pop())
+    next_col.button("Next Page", disabled=st.session_state['browse_next'] is None,
+                    on_click=lambda: st.session_state['browse_pages'].append(st.session_state['browse_next']))
+
+    st.subheader("Export")
+    try:
+        export_controls(table.lower(), *browser.export_query(table, columns, filters, sort, descending))
+    except ValueError as e:
+        st.error(f"Error: {e}")
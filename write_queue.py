@@ -0,0 +1,333 @@
+"""
+Write Queue
+Background writer for the dashboard's form submissions. Recruiters, jobs,
+candidates and users are queued by the Streamlit script thread and
+written by one worker thread that gathers whatever arrives within
+max_wait_ms (up to max_batch operations) into multi-row INSERTs committed
+as a single transaction. Deadlocks, lock waits and lost connections are
+retried with backoff; if the database stays unavailable the operations
+are appended to an on-disk spill file (fsynced) and replayed once it is
+back, including after a restart. Each submission returns a PendingWrite
+the page can wait on briefly to report the outcome.
+
+Delivery from the spill file is at-least-once: a crash between a commit
+and the spill file rewrite replays those operations again.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+import pymysql
+
+import bulk_import
+import db
+import job_fields
+import query_cache
+import query_metrics
+import storage
+
+
+DEFAULT_WRITE_QUEUE_CONFIG = {
+    'max_batch': 200,       # Operations committed together at most
+    'max_wait_ms': 50,      # How long the writer gathers operations before committing
+    'max_retries': 3,       # Retries of a transient failure before spilling to disk
+    'retry_backoff': 0.2,   # Seconds before the first retry, doubling after each
+    'retry_interval': 10,   # Seconds between attempts to replay spilled operations
+    'spill_path': 'write_spill.jsonl',
+}
+WRITE_QUEUE_CONFIG = db.get_config('WRITE_QUEUE_CONFIG', DEFAULT_WRITE_QUEUE_CONFIG)
+
+# Operation states
+PENDING = 'pending'
+COMMITTED = 'committed'
+FAILED = 'failed'
+SPILLED = 'spilled'  # Saved on disk, written once the database is back
+
+# MySQL errors worth retrying (1205: lock wait timeout, 1213: deadlock,
+# 2003: cannot connect) besides the lost-connection ones in db
+TRANSIENT_ERRORS = {1205, 1213, 2003, *db.CONNECTION_LOST_ERRORS}
+
+logger = logging.getLogger(__name__)
+
+
+def _insert_rows(table, columns):
+    placeholders = ", ".join(["%s"] * len(columns))
+
+    def write(cursor, rows):
+        cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+    return write
+
+
+def _insert_entities(entity):
+    def write(cursor, rows):
+        bulk_import.write_batch(cursor, entity, rows, {})
+    return write
+
+
+# kind -> (row writer, tables whose cached results a commit invalidates), in commit order
+# so a job is written after a recruiter queued before it
+KINDS = {
+    'user': (_insert_rows('Users', ['Username', 'Password', 'Role']), ()),
+    'recruiter': (_insert_rows('Recruiter', ['ContactPerson', 'Contact', 'Company', 'CompanyProfile']),
+                  ('Recruiter',)),
+    'candidate': (_insert_entities('candidate'), ('Candidate',)),
+    'job': (_insert_entities('job'), ('Job',)),
+}
+
+
+def job_row(location, date, experience, skills, title, contact_person, salary_range):
+    """Return a Job row in bulk_import's column order, with the parsed fields filled in."""
+    salary_min, salary_max, min_years = job_fields.parsed_job_fields(salary_range, experience)
+    posted = job_fields.parse_date(date)
+    return [location, date, experience, skills, title, contact_person, salary_range,
+            salary_min, salary_max, min_years, posted and posted.isoformat()]
+
+
+def is_transient(error):
+    """True for failures that are expected to go away: lock conflicts and an unreachable database."""
+    if isinstance(error, db.PoolTimeoutError):
+        return True
+    if isinstance(error, pymysql.err.OperationalError):
+        return bool(error.args) and error.args[0] in TRANSIENT_ERRORS
+    if isinstance(error, sqlite3.OperationalError):
+        return "locked" in str(error) or "busy" in str(error)
+    return False
+
+
+class PendingWrite:
+    """One queued operation; `wait()` returns once it is committed, failed or spilled."""
+
+    def __init__(self, kind, row, op_id=None):
+        self.id = op_id or uuid.uuid4().hex
+        self.kind = kind
+        self.row = row
+        self.status = PENDING
+        self.error = None
+        self.submitted_at = time.time()
+        self._done = threading.Event()
+
+    def _finish(self, status, error=None):
+        self.status = status
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout=None):
+        """Wait up to `timeout` seconds for an outcome and return the status."""
+        self._done.wait(timeout)
+        return self.status
+
+    def to_json(self):
+        return json.dumps({'id': self.id, 'kind': self.kind, 'row': self.row})
+
+
+class WriteQueue:
+    """Group-committing background writer with retries and a durable spill file."""
+
+    def __init__(self, backend=None, max_batch=200, max_wait_ms=50, max_retries=3,
+                 retry_backoff=0.2, retry_interval=10, spill_path='write_spill.jsonl'):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_interval = retry_interval
+        self.spill_path = spill_path
+        self._queue = queue.Queue()
+        self._spilled = self._load_spill()  # id -> PendingWrite, in spill order
+        self._next_replay = 0.0
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'committed': 0, 'failed': 0, 'spilled': 0, 'retries': 0,
+                       'groups': 0, 'group_rows': 0, 'commit_time': 0.0}
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind, row):
+        """Queue one row of `kind` for writing and return its PendingWrite."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown write kind: {kind}")
+        pending = PendingWrite(kind, list(row))
+        with self._lock:
+            self._stats['submitted'] += 1
+        self._queue.put(pending)
+        return pending
+
+    # Worker thread
+
+    def _run(self):
+        while not self._stopping.is_set() or not self._queue.empty():
+            batch = self._collect()
+            if self._spilled and (batch or time.monotonic() >= self._next_replay):
+                # Spilled operations go first so they keep their original order
+                batch = [*self._spilled.values(), *batch]
+            if batch:
+                self._flush(batch)
+
+    def _collect(self):
+        """Block for the first operation, then gather more until max_wait or max_batch."""
+        try:
+            first = self._queue.get(timeout=self.retry_interval if self._spilled else 0.5)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit(self, batch):
+        """Write a batch in one transaction; raises on failure after rolling back."""
+        rows = {}
+        for pending in batch:
+            rows.setdefault(pending.kind, []).append(pending.row)
+        backend = self.backend or storage.get_backend()
+        with query_metrics.track("write_queue_commit"), backend.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                for kind, (write, _) in KINDS.items():
+                    if kind in rows:
+                        write(cursor, rows[kind])
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+            query_metrics.get_metrics().count("write_queue_commit", rows=len(batch))
+        return rows.keys()
+
+    def _flush(self, batch):
+        """Commit a batch, retrying transient errors and isolating rows that fail on their own."""
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                kinds = self._commit(batch)
+            except Exception as e:
+                if is_transient(e) and attempt < self.max_retries:
+                    with self._lock:
+                        self._stats['retries'] += 1
+                    time.sleep(self.retry_backoff * 2 ** attempt)
+                    continue
+                if is_transient(e):
+                    self._spill(batch, e)
+                elif len(batch) > 1:
+                    # One bad row (e.g. a duplicate key) fails the whole group: split it to find the row
+                    middle = len(batch) // 2
+                    self._flush(batch[:middle])
+                    self._flush(batch[middle:])
+                else:
+                    self._finish(batch, FAILED, e)
+                return
+            query_cache.invalidate(*{table for kind in kinds for table in KINDS[kind][1]})
+            with self._lock:
+                self._stats['groups'] += 1
+                self._stats['group_rows'] += len(batch)
+                self._stats['commit_time'] += time.perf_counter() - start
+            self._finish(batch, COMMITTED)
+            return
+
+    def _finish(self, batch, status, error=None):
+        replayed = [pending for pending in batch if pending.id in self._spilled]
+        for pending in replayed:
+            del self._spilled[pending.id]
+            if status == FAILED:
+                logger.error("Dropping spilled %s write %s: %s", pending.kind, pending.row, error)
+        if replayed:
+            self._rewrite_spill()
+        for pending in batch:
+            pending._finish(status, str(error) if error else None)
+        with self._lock:
+            self._stats[status] += len(batch)
+
+    # Spill file
+
+    def _spill(self, batch, error):
+        """Append operations to the spill file so they survive until the database is back."""
+        logger.warning("Database unavailable (%s); spilling %d writes to %s", error, len(batch), self.spill_path)
+        new = [pending for pending in batch if pending.id not in self._spilled]
+        if new:
+            with open(self.spill_path, 'a', encoding='utf-8') as handle:
+                for pending in new:
+                    handle.write(pending.to_json() + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+        for pending in new:
+            self._spilled[pending.id] = pending
+            pending._finish(SPILLED, str(error))
+        with self._lock:
+            self._stats['spilled'] += len(new)
+        self._next_replay = time.monotonic() + self.retry_interval
+
+    def _load_spill(self):
+        spilled = {}
+        if self.spill_path and os.path.exists(self.spill_path):
+            with open(self.spill_path, encoding='utf-8') as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        pending = PendingWrite(entry['kind'], entry['row'], entry['id'])
+                        pending._finish(SPILLED)
+                        spilled[pending.id] = pending
+            if spilled:
+                logger.info("Replaying %d spilled writes from %s", len(spilled), self.spill_path)
+        return spilled
+
+    def _rewrite_spill(self):
+        """Replace the spill file with the operations still waiting, atomically."""
+        if not self._spilled:
+            os.remove(self.spill_path)
+            return
+        temp_path = f"{self.spill_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            for pending in self._spilled.values():
+                handle.write(pending.to_json() + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.spill_path)
+
+    def stop(self, timeout=10):
+        """Write everything still queued, then stop the worker."""
+        self._stopping.set()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        stats['waiting_on_disk'] = len(self._spilled)
+        stats['avg_group_size'] = stats['group_rows'] / stats['groups'] if stats['groups'] else 0.0
+        stats['avg_commit_time'] = stats['commit_time'] / stats['groups'] if stats['groups'] else 0.0
+        return stats
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """Return the process-wide write queue, starting its worker on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = WriteQueue(**WRITE_QUEUE_CONFIG)
+                atexit.register(_queue.stop)
+    return _queue
+
+
+def submit(kind, row):
+    """Queue one row on the process-wide write queue."""
+    return get_queue().submit(kind, row)